@@ -0,0 +1,59 @@
+"""Per-step cost of invalidating large graphs of lazily evaluated variables
+
+Builds `--numberOfExpressions` expressions, each `2 * --depth` operations
+deep, of a single field (as, e.g., a phase field appears in mobilities, driving
+forces, and their face values), and reports the time taken by
+`setValue()` and `updateOld()` to mark all of them stale::
+
+    $ python examples/benchmarking/stale.py --numberOfExpressions=1000 --depth=10
+
+Only bookkeeping is timed; none of the expressions is evaluated.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+import time
+
+from fipy import CellVariable, Grid1D
+from fipy.tools.parser import parse
+
+expressions = parse('--numberOfExpressions', action='store',
+                    type='int', default=1000)
+depth = parse('--depth', action='store',
+              type='int', default=10)
+steps = parse('--numberOfSteps', action='store',
+              type='int', default=20)
+
+mesh = Grid1D(nx=10)
+phase = CellVariable(mesh=mesh, value=0., hasOld=True)
+
+graph = []
+for i in range(expressions):
+    var = phase - phase.old
+    graph.append(var)
+    var = var + i
+    graph.append(var)
+    for j in range(depth):
+        var = var * (j + 2)
+        graph.append(var)
+        var = var + phase
+        graph.append(var)
+
+def freshen():
+    # as if every expression had just been evaluated
+    for var in graph:
+        var.stale = 0
+
+def timeit(fn):
+    elapsed = 0.
+    for step in range(steps):
+        freshen()
+        start = time.time()
+        fn(step)
+        elapsed += time.time() - start
+    return elapsed / steps
+
+print("variables: %d" % len(graph))
+print("setValue: %g s / step" % timeit(lambda step: phase.setValue(step)))
+print("updateOld: %g s / step" % timeit(lambda step: phase.updateOld()))
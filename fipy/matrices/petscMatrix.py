@@ -24,6 +24,38 @@ class _PETScMatrix(_SparseMatrix):
         """
         self.matrix = matrix
 
+    @property
+    def matrix(self):
+        """The internal PETSc `Mat`, with any pending contributions from
+        `addAt` inserted into it.
+        """
+        if self._pending:
+            self._insertPending()
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self._pending = []
+        self._matrix = matrix
+
+    @matrix.deleter
+    def matrix(self):
+        self._pending = []
+        self._matrix = None
+
+    def _insertPending(self):
+        """Add all pending `addAt` triplets with a single `setValuesCSR`
+        """
+        pending, self._pending = self._pending, []
+
+        vector = numerix.concatenate([v for v, id1, id2 in pending])
+        id1 = numerix.concatenate([id1 for v, id1, id2 in pending])
+        id2 = numerix.concatenate([id2 for v, id1, id2 in pending])
+
+        self._matrix.assemble(self._matrix.AssemblyType.FLUSH)
+        self._matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector),
+                                  addv=True)
+
     def copy(self):
         return _PETScMatrix(matrix=self.matrix.copy())
 
@@ -172,7 +204,7 @@ class _PETScMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.sizes[0][0], self.matrix.sizes[1][1]
+        return self._matrix.sizes[0][0], self._matrix.sizes[1][1]
 
     @property
     def _range(self):
@@ -283,10 +315,13 @@ class _PETScMatrix(_SparseMatrix):
             12.300000  10.000000   3.000000  
                 ---     3.141593   2.960000  
              2.500000      ---     2.200000  
+
+        Values are not inserted until the matrix is next used, so that
+        all contributions of a `Term` are added in a single pass.
         """
-        self.matrix.assemble(self.matrix.AssemblyType.FLUSH)
-        self.matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector),
-                                 addv=True)
+        self._pending.append((numerix.asarray(vector).ravel(),
+                              numerix.asarray(id1).ravel(),
+                              numerix.asarray(id2).ravel()))
 
     def addAtDiagonal(self, vector):
         if isinstance(vector, (int, float)):
@@ -477,7 +512,8 @@ class _PETScMatrix(_SparseMatrix):
 
 class _PETScMatrixFromShape(_PETScMatrix):
 
-    def __init__(self, rows, cols, bandwidth=0, sizeHint=None, matrix=None, comm=PETSc.COMM_SELF):
+    def __init__(self, rows, cols, bandwidth=0, sizeHint=None, matrix=None,
+                 comm=PETSc.COMM_SELF, nonZerosPerRow=None):
         """Instantiates and wraps a PETSc `Mat` matrix
 
         Parameters
@@ -494,6 +530,9 @@ class _PETScMatrixFromShape(_PETScMatrix):
             Pre-assembled PETSc matrix to use for storage.
         comm : ~PETSc.Comm
             The MPI communicator to use.
+        nonZerosPerRow : tuple of array_like of int
+            Number of nonzeros in the diagonal and off-diagonal blocks of
+            each local row, used to preallocate storage.
         """
         if (bandwidth == 0) and (sizeHint is not None):
             bandwidth = sizeHint // max(rows, cols)
@@ -504,14 +543,19 @@ class _PETScMatrixFromShape(_PETScMatrix):
             # cols are owned by everyone
             matrix.setSizes([[rows, None], [cols, None]])
             matrix.setType('aij') # sparse
-            matrix.setUp()
-#             matrix.setPreallocationNNZ(bandwidth) # FIXME: ??? None, bandwidth
-#             matrix.setOption(matrix.Option.NEW_NONZERO_ALLOCATION_ERR, False)
+            if nonZerosPerRow is None:
+                matrix.setUp()
+            else:
+                matrix.setPreallocationNNZ(nonZerosPerRow)
+                # the preallocation is only an estimate for terms that
+                # reach beyond nearest neighbors, so allow it to grow
+                matrix.setOption(matrix.Option.NEW_NONZERO_ALLOCATION_ERR, False)
 
         super(_PETScMatrixFromShape, self).__init__(matrix=matrix)
 
 class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
-    def __init__(self, mesh, rows, cols, m2m, bandwidth=0, sizeHint=None, matrix=None):
+    def __init__(self, mesh, rows, cols, m2m, bandwidth=0, sizeHint=None,
+                 matrix=None, nonZerosPerRow=None):
         """Creates a `_PETScMatrixFromShape` associated with a `Mesh`.
 
         Parameters
@@ -530,6 +574,9 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
             Estimate of the number of non-zeros.
         matrix : ~petsc4py.PETSc.Mat
             Pre-assembled PETSc matrix to use for storage.
+        nonZerosPerRow : tuple of array_like of int
+            Number of nonzeros in the diagonal and off-diagonal blocks of
+            each local row, used to preallocate storage.
         """
         self.mesh = mesh
         self._m2m = m2m
@@ -539,7 +586,8 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
                                                    bandwidth=bandwidth,
                                                    sizeHint=sizeHint,
                                                    matrix=matrix,
-                                                   comm=mesh.communicator.petsc4py_comm)
+                                                   comm=mesh.communicator.petsc4py_comm,
+                                                   nonZerosPerRow=nonZerosPerRow)
 
     def copy(self):
         tmp = super(_PETScBaseMeshMatrix, self).copy()
@@ -719,7 +767,7 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
 
 class _PETScRowMeshMatrix(_PETScBaseMeshMatrix):
     def __init__(self, mesh, cols, numberOfEquations=1, bandwidth=0,
-                 sizeHint=None, matrix=None, m2m=None):
+                 sizeHint=None, matrix=None, m2m=None, nonZerosPerRow=None):
         """Creates a `_PETScMatrixFromShape` with rows associated with equations.
 
         Parameters
@@ -739,6 +787,9 @@ class _PETScRowMeshMatrix(_PETScBaseMeshMatrix):
             Pre-assembled PETSc matrix to use for storage.
         m2m : ~fipy.matrices.sparseMatrix._RowMesh2Matrix
             Object to convert between mesh coordinates and matrix coordinates.
+        nonZerosPerRow : tuple of array_like of int
+            Number of nonzeros in the diagonal and off-diagonal blocks of
+            each local row, used to preallocate storage.
         """
         if m2m is None:
             m2m = _RowMesh2Matrix(mesh=mesh, matrix=self,
@@ -750,7 +801,8 @@ class _PETScRowMeshMatrix(_PETScBaseMeshMatrix):
                                                   m2m=m2m,
                                                   bandwidth=bandwidth,
                                                   sizeHint=sizeHint,
-                                                  matrix=matrix)
+                                                  matrix=matrix,
+                                                  nonZerosPerRow=nonZerosPerRow)
 
 class _PETScColMeshMatrix(_PETScBaseMeshMatrix):
     def __init__(self, mesh, rows, numberOfVariables=1, bandwidth=0, sizeHint=None, matrix=None):
@@ -809,13 +861,78 @@ class _PETScMeshMatrix(_PETScRowMeshMatrix):
                                  numberOfVariables=numberOfVariables,
                                  numberOfEquations=numberOfEquations)
 
+        if matrix is None:
+            nonZerosPerRow = self._nonZerosPerRow(mesh=mesh,
+                                                  numberOfVariables=numberOfVariables,
+                                                  numberOfEquations=numberOfEquations)
+        else:
+            nonZerosPerRow = None
+
         super(_PETScMeshMatrix, self).__init__(mesh=mesh,
                                                cols=numberOfVariables * len(mesh._localNonOverlappingCellIDs),
                                                numberOfEquations=numberOfEquations,
                                                bandwidth=bandwidth,
                                                sizeHint=sizeHint,
                                                matrix=matrix,
-                                               m2m=m2m)
+                                               m2m=m2m,
+                                               nonZerosPerRow=nonZerosPerRow)
+
+    @staticmethod
+    def _nonZerosPerRow(mesh, numberOfVariables=1, numberOfEquations=1):
+        """Count the nonzeros of each local row from the cell connectivity
+
+        A row couples a cell to itself and to each of its distinct
+        neighbors, for every solution variable.  Neighbors owned by this
+        process fall in the diagonal block; ghost neighbors fall in the
+        off-diagonal block.
+
+        Parameters
+        ----------
+        mesh : ~fipy.meshes.mesh.Mesh
+            The `Mesh` to assemble the matrix for.
+        numberOfVariables : int
+            Number of solution variables coupled in each row.
+        numberOfEquations : int
+            Number of equations (blocks of rows) per cell.
+
+        Returns
+        -------
+        diagonal, offDiagonal : ndarray of int
+            Nonzeros of each local row in the diagonal and off-diagonal
+            blocks, in PETSc row order.
+
+        >>> from fipy import Grid1D
+        >>> from fipy.tools import serialComm
+        >>> mesh = Grid1D(nx=4, communicator=serialComm)
+        >>> d, o = _PETScMeshMatrix._nonZerosPerRow(mesh, numberOfVariables=2,
+        ...                                         numberOfEquations=2)
+        >>> print(d)
+        [4 6 6 4 4 6 6 4]
+        >>> print(o)
+        [0 0 0 0 0 0 0 0]
+        """
+        local = mesh._localNonOverlappingCellIDs
+
+        neighbors = numerix.array(mesh._cellToCellIDsFilled)[..., local]
+        neighbors = numerix.sort(neighbors, axis=0)
+
+        distinct = numerix.ones(neighbors.shape, dtype=bool)
+        distinct[1:] = neighbors[1:] != neighbors[:-1]
+        # `_cellToCellIDsFilled` marks missing neighbors with the cell itself
+        distinct &= neighbors != local[numerix.newaxis, ...]
+
+        owned = numerix.zeros((mesh.numberOfCells,), dtype=bool)
+        owned[local] = True
+        owned = owned[neighbors]
+
+        diagonal = 1 + (distinct & owned).sum(axis=0)
+        offDiagonal = (distinct & ~owned).sum(axis=0)
+
+        # PETSc rows are ordered one equation at a time
+        diagonal = numerix.tile(diagonal * numberOfVariables, numberOfEquations)
+        offDiagonal = numerix.tile(offDiagonal * numberOfVariables, numberOfEquations)
+
+        return diagonal.astype('int32'), offDiagonal.astype('int32')
 
     def __mul__(self, other):
         """Multiply a sparse matrix by another sparse matrix
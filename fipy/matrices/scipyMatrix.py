@@ -4,11 +4,106 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+from collections import OrderedDict
+import hashlib
+
 import scipy.sparse as sp
 from fipy.tools import numerix
 
 from fipy.matrices.sparseMatrix import _SparseMatrix
 
+class _CSRPattern(object):
+    """Symbolic part of a COO to CSR conversion.
+
+    Holds the sparsity pattern obtained from a set of (`id1`, `id2`)
+    triplet coordinates, together with the map that scatters each
+    triplet into its slot of the CSR `data` array.  Numeric assembly of
+    any values given at the same coordinates is then a single
+    :func:`~numpy.bincount`.
+
+    Patterns are cached, keyed on the matrix shape and a digest of the
+    coordinates, so that a `Term` that is rebuilt on every sweep (with
+    the same mesh and the same structure) only pays for the sort once.
+    """
+
+    _cache = OrderedDict()
+    _cacheSize = 16
+
+    def __init__(self, indptr, indices, scatter):
+        self.indptr = indptr
+        self.indices = indices
+        self.scatter = scatter
+
+    @classmethod
+    def fromTriplets(cls, id1, id2, shape):
+        """Obtain the (possibly cached) pattern for the given coordinates
+
+        Parameters
+        ----------
+        id1 : array_like of int
+            The row indices.
+        id2 : array_like of int
+            The column indices.
+        shape : tuple of int
+            The shape of the matrix.
+
+        Returns
+        -------
+        ~fipy.matrices.scipyMatrix._CSRPattern
+        """
+        rows, cols = shape
+        key = (numerix.asarray(id1, dtype=numerix.int64) * cols
+               + numerix.asarray(id2, dtype=numerix.int64))
+        key = numerix.ascontiguousarray(key)
+        digest = (shape, len(key), hashlib.sha1(key).hexdigest())
+
+        pattern = cls._cache.get(digest, None)
+        if pattern is None:
+            unique, scatter = numerix.unique(key, return_inverse=True)
+
+            if max(rows, cols, len(unique)) < 2**31:
+                indexType = numerix.int32
+            else:
+                indexType = numerix.int64
+
+            indptr = numerix.zeros((rows + 1,), dtype=indexType)
+            numerix.cumsum(numerix.bincount(unique // cols, minlength=rows),
+                           out=indptr[1:])
+
+            pattern = cls(indptr=indptr,
+                          indices=(unique % cols).astype(indexType),
+                          scatter=scatter.astype(indexType))
+
+            cls._cache[digest] = pattern
+            if len(cls._cache) > cls._cacheSize:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(digest)
+
+        return pattern
+
+    def assemble(self, vector, shape):
+        """Accumulate `vector` into a new matrix with this pattern
+
+        Parameters
+        ----------
+        vector : array_like
+            The values at each of the triplet coordinates.
+        shape : tuple of int
+            The shape of the matrix.
+
+        Returns
+        -------
+        ~scipy.sparse.csr_matrix
+        """
+        data = numerix.bincount(self.scatter, weights=vector,
+                                minlength=len(self.indices))
+
+        # the matrix may be modified in place later on,
+        # so don't let it share its structure with the cache
+        return sp.csr_matrix((data, self.indices.copy(), self.indptr.copy()),
+                             shape=shape)
+
 class _ScipyMatrix(_SparseMatrix):
 
     """class wrapper for a scipy sparse matrix.
@@ -30,6 +125,43 @@ class _ScipyMatrix(_SparseMatrix):
 
         super(_ScipyMatrix, self).__init__()
 
+    @property
+    def matrix(self):
+        """The internal SciPy matrix, with any pending contributions from
+        `addAt` accumulated into it.
+        """
+        if self._pending:
+            self._assemblePending()
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self._pending = []
+        self._matrix = matrix
+
+    @matrix.deleter
+    def matrix(self):
+        self._pending = []
+        self._matrix = None
+
+    def _assemblePending(self):
+        """Accumulate all pending `addAt` triplets in a single pass
+        """
+        pending, self._pending = self._pending, []
+
+        vector = numerix.concatenate([v for v, id1, id2 in pending])
+        id1 = numerix.concatenate([id1 for v, id1, id2 in pending])
+        id2 = numerix.concatenate([id2 for v, id1, id2 in pending])
+
+        shape = self._matrix.shape
+        pattern = _CSRPattern.fromTriplets(id1, id2, shape)
+        temp = pattern.assemble(vector, shape)
+
+        if self._matrix.nnz == 0:
+            self._matrix = temp
+        else:
+            self._matrix = self._matrix + temp
+
     def copy(self):
         return _ScipyMatrix(matrix=self.matrix.copy())
 
@@ -44,7 +176,14 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if (isinstance(other, _ScipyMatrix)
+            and other._matrix is not None
+            and other._matrix.nnz == 0
+            and other._matrix.shape == self._shape):
+            # `other` only holds unassembled triplets, so
+            # defer them to be assembled along with our own
+            self._pending.extend((sign * v, id1, id2) for v, id1, id2 in other._pending)
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif isinstance(other, (float, int)):
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -57,6 +196,38 @@ class _ScipyMatrix(_SparseMatrix):
 
         return self
 
+    def _addBlocks(self, blocks):
+        """Gather the triplets of all `blocks` and assemble them in one pass
+
+        Rather than forming a full-size intermediate matrix for every
+        addition, assembled blocks contribute their coordinates and
+        unassembled blocks their pending `addAt` triplets.
+
+            >>> L = _ScipyMatrixFromShape(rows=3, cols=3)
+            >>> A = _ScipyMatrixFromShape(rows=3, cols=3)
+            >>> A.addAt([1., 2.], [0, 1], [2, 1])
+            >>> print(L._addBlocks([A, _ScipyIdentityMatrix(size=3), A]))
+             1.000000      ---     2.000000  
+                ---     5.000000      ---    
+                ---        ---     1.000000  
+            >>> print(A)
+                ---        ---     1.000000  
+                ---     2.000000      ---    
+                ---        ---        ---    
+        """
+        for block in blocks:
+            if (isinstance(block, _ScipyMatrix)
+                and block._matrix is not None
+                and block._matrix.shape == self._shape):
+                if block._matrix.nnz > 0:
+                    coo = block._matrix.tocoo()
+                    self._pending.append((coo.data, coo.row, coo.col))
+                self._pending.extend(block._pending)
+            else:
+                self += block
+
+        return self
+
     def __add__(self, other):
         """
         Add two sparse matrices
@@ -157,7 +328,7 @@ class _ScipyMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.shape
+        return self._matrix.shape
 
     @property
     def _range(self):
@@ -246,12 +417,29 @@ class _ScipyMatrix(_SparseMatrix):
             12.300000  10.000000   3.000000  
                 ---     3.141593   2.960000  
              2.500000      ---     2.200000  
+
+        Values are not accumulated until the matrix is next used, at
+        which point all pending triplets are assembled at once. The
+        sparsity pattern of a given set of triplets is only computed the
+        first time it is seen.
+
+            >>> _CSRPattern._cache.clear()
+            >>> for sweep in range(3):
+            ...     L = _ScipyMatrixFromShape(rows=3, cols=3)
+            ...     L.addAt([1., 2., 3.], [0, 1, 0], [0, 1, 0])
+            ...     L.addAt([sweep], [2], [1])
+            ...     print(L.matrix.data)
+            [ 4.  2.  0.]
+            [ 4.  2.  1.]
+            [ 4.  2.  2.]
+            >>> print(len(_CSRPattern._cache))
+            1
         """
         assert len(id1) == len(id2) == len(vector)
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._pending.append((numerix.asarray(vector).ravel(),
+                              numerix.asarray(id1).ravel(),
+                              numerix.asarray(id2).ravel()))
 
     def addAtDiagonal(self, vector):
         if isinstance(vector, (int, float)):
@@ -548,6 +736,42 @@ class _ScipyMeshMatrix(_ScipyRowMeshMatrix):
         else:
             return _ScipyMatrixFromShape.__mul__(self, other)
 
+    @property
+    def bsr(self):
+        """The matrix with the unknowns of each cell gathered into dense blocks
+
+        Coupled systems are assembled with all the cells of one equation,
+        followed by all the cells of the next.  This reorders rows and
+        columns so that the `numberOfEquations` by `numberOfVariables`
+        coefficients that couple two cells are adjacent, and returns a
+        :class:`~scipy.sparse.bsr_matrix` with that block size.  The
+        field-major ordering of the assembled matrix is itself suited to
+        field-split preconditioning, e.g., with a
+        :class:`~fipy.solvers.scipy.preconditioners.blockJacobiPreconditioner.BlockJacobiPreconditioner`
+        of `blockSize=mesh.numberOfCells`.
+
+            >>> from fipy.meshes import Grid1D
+            >>> L = _ScipyMeshMatrix(mesh=Grid1D(nx=2), numberOfVariables=2, numberOfEquations=2)
+            >>> L.addAt([1., 2., 3., 4.], [0, 1, 2, 3], [0, 1, 1, 2])
+            >>> print(L)
+             1.000000      ---        ---        ---    
+                ---     2.000000      ---        ---    
+                ---     3.000000      ---        ---    
+                ---        ---     4.000000      ---    
+            >>> print(L.bsr.blocksize)
+            (2, 2)
+            >>> print(L.bsr.toarray())
+            [[ 1.  0.  0.  0.]
+             [ 0.  0.  3.  0.]
+             [ 0.  0.  2.  0.]
+             [ 0.  4.  0.  0.]]
+        """
+        N = self.mesh.numberOfCells
+        rows = numerix.arange(self.numberOfEquations * N).reshape((self.numberOfEquations, N))
+        cols = numerix.arange(self.numberOfVariables * N).reshape((self.numberOfVariables, N))
+        matrix = self.matrix.tocsr()[rows.swapaxes(0, 1).ravel()][:, cols.swapaxes(0, 1).ravel()]
+        return matrix.tobsr(blocksize=(self.numberOfEquations, self.numberOfVariables))
+
     def asTrilinosMeshMatrix(self):
         """Transforms a scipy matrix into a trilinos matrix and maintains the
         trilinos matrix as an attribute.
@@ -117,6 +117,16 @@ class _SparseMatrix(object):
     def addAtDiagonal(self, vector):
         raise NotImplementedError
 
+    def _addBlocks(self, blocks):
+        """Add several matrices of the same shape into this one
+
+        Backends that can gather the contributions of all `blocks` and
+        assemble them in a single pass should override this.
+        """
+        for block in blocks:
+            self += block
+        return self
+
     def exportMmf(self, filename):
         raise NotImplementedError
 
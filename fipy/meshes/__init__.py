@@ -6,6 +6,9 @@ from fipy.meshes.periodicGrid3D import *
 from fipy.meshes.skewedGrid2D import *
 from fipy.meshes.tri2D import *
 from fipy.meshes.gmshMesh import *
+from fipy.meshes.pointInterpolator import *
+from fipy.meshes.meshInterpolator import *
+from fipy.meshes.partitionedMesh import *
 
 __all__ = []
 __all__.extend(factoryMeshes.__all__)
@@ -15,3 +18,6 @@ __all__.extend(periodicGrid3D.__all__)
 __all__.extend(skewedGrid2D.__all__)
 __all__.extend(tri2D.__all__)
 __all__.extend(gmshMesh.__all__)
+__all__.extend(pointInterpolator.__all__)
+__all__.extend(meshInterpolator.__all__)
+__all__.extend(partitionedMesh.__all__)
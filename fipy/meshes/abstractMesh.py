@@ -12,6 +12,8 @@ from fipy.tools import serialComm
 from fipy.tools import numerix
 from fipy.tools.decorators import deprecate
 from fipy.tools.numerix import MA
+from fipy.tools.spatialIndex import _spatialIndex
+from fipy.tools.vector import _uniqueRows
 from fipy.tools.dimensions.physicalField import PhysicalField
 
 from fipy.meshes.representations.abstractRepresentation import _AbstractRepresentation
@@ -61,8 +63,22 @@ class AbstractMesh(object):
         tmp = self.cellCenters - PhysicalField(point)
         return numerix.sqrtDot(tmp, tmp)
 
+    def _locateCells(self, points):
+        """Return the IDs of the cells that contain `points`
+
+        Points outside the mesh are assigned to the cell with the nearest
+        center, which, for uniform grids, is always the containing cell.
+        """
+        return self._getNearestCellID(points)
+
     def getNearestCell(self, point):
-        return self._getCellsByID([self._getNearestCellID(point)])[0]
+        """Return the ID of the cell whose center is closest to `point`
+
+            >>> from fipy import Tri2D
+            >>> print(Tri2D(nx=2, ny=1).getNearestCell((1.6, 0.5)))
+            1
+        """
+        return self._getNearestCellID(point)
 
     def _getCellFaceIDsInternal(self):
         return self._cellFaceIDs
@@ -344,17 +360,20 @@ class AbstractMesh(object):
         self_XvertexCoords = selfc.vertexCoords[..., self_Xvertices]
         other_XvertexCoords = otherc.vertexCoords[..., other_Xvertices]
 
-        closest = numerix.nearest(self_XvertexCoords, other_XvertexCoords)
-
-        # just because they're closest, doesn't mean they're close
-        tmp = self_XvertexCoords[..., closest] - other_XvertexCoords
-        distance = numerix.sqrtDot(tmp, tmp)
-        # only want vertex pairs that are 100x closer than the smallest
-        # cell-to-cell distance
-        close = distance < resolution * min(selfc._cellToCellDistances.min(),
-                                            otherc._cellToCellDistances.min())
-        vertexCorrelates = numerix.array((self_Xvertices[closest[close]],
-                                          other_Xvertices[close]))
+        if len(self_Xvertices) > 0 and len(other_Xvertices) > 0:
+            closest = _spatialIndex(self_XvertexCoords).nearest(other_XvertexCoords)
+
+            # just because they're closest, doesn't mean they're close
+            tmp = self_XvertexCoords[..., closest] - other_XvertexCoords
+            distance = numerix.sqrtDot(tmp, tmp)
+            # only want vertex pairs that are 100x closer than the smallest
+            # cell-to-cell distance
+            close = distance < resolution * min(selfc._cellToCellDistances.min(),
+                                                otherc._cellToCellDistances.min())
+            vertexCorrelates = numerix.array((self_Xvertices[closest[close]],
+                                              other_Xvertices[close]))
+        else:
+            vertexCorrelates = numerix.zeros((2, 0), dtype=numerix.INT_DTYPE)
 
         # warn if meshes don't touch, but allow it
         if (selfc._numberOfVertices > 0
@@ -398,38 +417,24 @@ class AbstractMesh(object):
         vertex_map[verticesToAdd] = numerix.arange(otherNumVertices - len(vertexCorrelates[1])) + selfNumVertices
         vertex_map[vertexCorrelates[1]] = vertexCorrelates[0]
 
-        # calculate hashes of faceVertexIDs for comparing Faces
-
-        if self_matchingFaces.shape[-1] == 0:
-            self_faceHash = numerix.empty(self_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # sort each of self's Face's vertexIDs for canonical comparison
-            self_faceHash = numerix.sort(self_faceVertexIDs[..., self_matchingFaces], axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            self_faceHash = numerix.apply_along_axis(str, axis=0, arr=self_faceHash)
-
-        face_sort = numerix.argsort(self_faceHash)
-        self_faceHash = self_faceHash[face_sort]
-        self_matchingFaces = self_matchingFaces[face_sort]
-
-        if other_matchingFaces.shape[-1] == 0:
-            other_faceHash = numerix.empty(other_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # convert each of other's Face's vertexIDs to new IDs
-            other_faceHash = vertex_map[other_faceVertexIDs[..., other_matchingFaces]]
-            # sort each of other's Face's vertexIDs for canonical comparison
-            other_faceHash = numerix.sort(other_faceHash, axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            other_faceHash = numerix.apply_along_axis(str, axis=0, arr=other_faceHash)
-
-        face_sort = numerix.argsort(other_faceHash)
-        other_faceHash = other_faceHash[face_sort]
-        other_matchingFaces = other_matchingFaces[face_sort]
-
-        self_matchingFaces = self_matchingFaces[numerix.in1d(self_faceHash,
-                                                             other_faceHash)]
-        other_matchingFaces = other_matchingFaces[numerix.in1d(other_faceHash,
-                                                               self_faceHash)]
+        # label each Face by its sorted vertexIDs for canonical comparison,
+        # after converting other's vertexIDs to new IDs
+        self_faceKeys = numerix.sort(MA.filled(self_faceVertexIDs[..., self_matchingFaces], -1),
+                                     axis=0)
+        other_faceKeys = MA.filled(other_faceVertexIDs[..., other_matchingFaces], -1)
+        other_faceKeys = numerix.sort(numerix.where(other_faceKeys >= 0,
+                                                    vertex_map[other_faceKeys], -1),
+                                      axis=0)
+        _, labels = _uniqueRows(numerix.concatenate((self_faceKeys,
+                                                     other_faceKeys), axis=1).swapaxes(0, 1))
+
+        # Faces are distinct, so each label occurs at most once in each mesh
+        _, self_matches, other_matches = numerix.intersect1d(labels[:len(self_matchingFaces)],
+                                                             labels[len(self_matchingFaces):],
+                                                             assume_unique=True,
+                                                             return_indices=True)
+        self_matchingFaces = self_matchingFaces[self_matches]
+        other_matchingFaces = other_matchingFaces[other_matches]
 
         faceCorrelates = numerix.array((self_matchingFaces,
                                         other_matchingFaces))
@@ -45,6 +45,9 @@ class CylindricalNonUniformGrid2D(NonUniformGrid2D):
     def _calcFaceCenters(self):
         return super(CylindricalNonUniformGrid2D, self)._calcFaceCenters() + self.origin
 
+    def _calcCellCenters(self):
+        return super(CylindricalNonUniformGrid2D, self)._calcCellCenters() + self.origin
+
     def _calcCellVolumes(self):
         return super(CylindricalNonUniformGrid2D, self)._calcCellVolumes() \
           * self._calcCellCenters()[0]
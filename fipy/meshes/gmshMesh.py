@@ -7,6 +7,10 @@ from builtins import range
 from builtins import str
 __docformat__ = 'restructuredtext'
 
+import hashlib
+import io
+import json
+import mmap
 import os
 from subprocess import Popen, PIPE
 import sys
@@ -18,6 +22,7 @@ from distutils.version import StrictVersion
 from fipy.tools import numerix as nx
 from fipy.tools import parallelComm
 from fipy.tools import serialComm
+from fipy.tools.vector import _uniqueRows
 from fipy.tests.doctestPlus import register_skipper
 
 from fipy.meshes.mesh import Mesh
@@ -102,7 +107,7 @@ def _gmshVersion(communicator=parallelComm):
 
     return version
 
-def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, overlap=1, mode='r', background=None):
+def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, overlap=1, mode='r', background=None, cache=None):
     """Open a Gmsh `MSH` file
 
     Parameters
@@ -126,6 +131,14 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         Add a `b` to the mode for binary files.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to keep the meshes that Gmsh generates from
+        geometry scripts.  If the same script has already been meshed
+        with the same Gmsh version, dimensions and partitioning, the
+        mesh is loaded from the cache instead of running Gmsh again.
+        Files that the script `Include`\ s are not taken into account.
+        Ignored when reading an `MSH` file or when a `background` is
+        given.
     """
 
     if overlap > 1:
@@ -141,6 +154,7 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
     # or (ii) a gmsh script passed as a string.
 
     fileIsTemporary = False
+    cacheFile = None
 
     if mode.startswith('r'):
         if not os.path.exists(name):
@@ -157,8 +171,9 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         else:
             # Gmsh isn't picky about file extensions,
             # so we peek at the start of the file to deduce the type
-            f = open(name, 'r')
-            filetype = f.readline().strip()
+            # (in binary, as the rest of a binary `MSH` file won't decode)
+            f = open(name, 'rb')
+            filetype = f.readline().strip().decode('ascii', 'replace')
             f.close()
             if filetype == "$MeshFormat":
                 geoFile = None
@@ -194,7 +209,22 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
                         # https://gitlab.onelab.info/gmsh/gmsh/issues/733
                         gmshFlags += ["-part_ghosts"]
 
-            gmshFlags += ["-format", "msh2"]
+            # binary is much quicker to write and to read
+            gmshFlags += ["-format", "msh2", "-bin"]
+
+            if cache is not None and background is None:
+                cacheFile = _meshCacheFile(cache=cache, script=name,
+                                           version=version, dimensions=dimensions,
+                                           coordDimensions=coordDimensions,
+                                           communicator=communicator, overlap=overlap)
+                f = _openCachedMSHFile(cacheFile=cacheFile,
+                                       dimensions=dimensions,
+                                       coordDimensions=coordDimensions,
+                                       communicator=communicator)
+                if f is not None:
+                    if communicator.procID == 0 and not os.path.exists(name):
+                        os.unlink(geoFile)
+                    return f
 
             if background is not None:
                 if communicator.procID == 0:
@@ -248,13 +278,48 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
     else:
         raise ValueError("mode string must begin with one of 'r' or 'w', not '%s'" % mode[0])
 
-    return MSHFile(filename=mshFile,
-                   dimensions=dimensions,
-                   coordDimensions=coordDimensions,
-                   communicator=communicator,
-                   gmshOutput=gmshOutput,
-                   mode=mode,
-                   fileIsTemporary=fileIsTemporary)
+    f = MSHFile(filename=mshFile,
+                dimensions=dimensions,
+                coordDimensions=coordDimensions,
+                communicator=communicator,
+                gmshOutput=gmshOutput,
+                mode=mode,
+                fileIsTemporary=fileIsTemporary)
+    f._cacheFile = cacheFile
+
+    return f
+
+def _meshCacheFile(cache, script, version, dimensions, coordDimensions, communicator, overlap):
+    """Path of the cached mesh of this processor for a Gmsh geometry
+
+    `script` is either a Gmsh geometry script or the path to one.
+
+    >>> from fipy.tools import serialComm
+    >>> name = _meshCacheFile(cache="cache", script="Point(1) = {0, 0, 0, 1};",
+    ...                       version="4.8.4", dimensions=2, coordDimensions=2,
+    ...                       communicator=serialComm, overlap=1)
+    >>> print(os.path.dirname(name))
+    cache
+    >>> name == _meshCacheFile(cache="cache", script="Point(1) = {0, 0, 0, 1};",
+    ...                        version="4.8.4", dimensions=2, coordDimensions=2,
+    ...                        communicator=serialComm, overlap=1)
+    True
+    >>> name == _meshCacheFile(cache="cache", script="Point(1) = {0, 0, 0, 1};",
+    ...                        version="4.8.4", dimensions=3, coordDimensions=3,
+    ...                        communicator=serialComm, overlap=1)
+    False
+    """
+    if os.path.exists(script):
+        with open(script, 'r') as f:
+            script = f.read()
+
+    digest = hashlib.sha1()
+    digest.update(script.encode('utf-8'))
+    digest.update(json.dumps([str(version), dimensions, coordDimensions,
+                              communicator.Nproc, overlap]).encode('utf-8'))
+
+    return os.path.join(cache, "%s-%d.npz" % (digest.hexdigest(), communicator.procID))
+
 
 def openPOSFile(name, communicator=parallelComm, mode='w'):
     """Open a Gmsh `POS` post-processing file
@@ -536,171 +601,321 @@ class MSHFile(GmshFile):
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
-    def _getMetaData(self):
+    # path to store the parsed mesh in, if any
+    _cacheFile = None
+
+    # number of nodes of each Gmsh element type
+    _nodesPerElement = { 1: 2,  2: 3,  3: 4,  4: 4,  5: 8,  6: 6,  7: 5,  8: 3,
+                         9: 6, 10: 9, 11: 10, 12: 27, 13: 18, 14: 14, 15: 1,
+                        16: 8, 17: 20, 18: 15, 19: 13, 20: 9, 21: 10, 22: 12,
+                        23: 15, 24: 15, 25: 21, 26: 4, 27: 5, 28: 6, 29: 20,
+                        30: 35, 31: 56, 92: 64, 93: 125}
+
+    def _mapData(self):
+        """
+        Returns the contents of the file, memory-mapped if it is a real file.
+        """
+        try:
+            return mmap.mmap(self.fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, io.UnsupportedOperation, ValueError, EnvironmentError):
+            self.fileobj.seek(0)
+            data = self.fileobj.read()
+            if not isinstance(data, bytes):
+                data = data.encode('ascii')
+            return data
+
+    def _findSection(self, data, title):
+        """
+        Returns the offset of the line following the `$[title]` header.
+        """
+        start = data.find(("$%s" % title).encode('ascii'))
+        if start == -1:
+            raise EOFError("No `%s' header found!" % title)
+        return data.find(b"\n", start) + 1
+
+    def _asciiSection(self, data, title):
+        """
+        Returns all text between `$[title]` and `$End[title]`.
+        """
+        start = self._findSection(data, title)
+        return data[start:data.find(("$End%s" % title).encode('ascii'), start)]
+
+    def _getMetaData(self, data):
         """
         Extracts `gmshVersion`, file-type, and data-size in that
         order.
         """
-        self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
-        self.fileobj.seek(0)
-        return [float(x) for x in metaData]
+        return [float(x) for x in self._asciiSection(data, "MeshFormat").split()[:3]]
 
-    def _isolateData(self, title):
+    def _binaryReader(self, data, title):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Returns a `_BinaryReader` positioned at the start of section `title`.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception as e:
-            newF.close()
-            os.unlink(newPath)
-            raise
+        return _BinaryReader(data=data,
+                             offset=self._findSection(data, title),
+                             byteOrder=self.byteOrder,
+                             dataSize=int(self.dataSize))
 
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+    def _readNodes(self, data):
+        """
+        Returns the Gmsh IDs and the coordinates of all nodes.
+        """
+        if self.version < 4:
+            if self.fileType == 0:
+                count, body = self._asciiSection(data, "Nodes").split(b"\n", 1)
+                nodes = nx.fromstring(body, dtype=float, sep=" ").reshape((-1, 4))
+                return nodes[:, 0].astype(nx.INT_DTYPE), nodes[:, 1:]
+            else:
+                reader = self._binaryReader(data, "Nodes")
+                count = int(reader.readline())
+                nodes = reader.read([('id', 'i4'), ('coords', 'f8', (3,))], count)
+                return nodes['id'].astype(nx.INT_DTYPE), nodes['coords']
+
+        if self.fileType == 0:
+            reader = _AsciiReader(self._asciiSection(data, "Nodes"), dtype=float)
+        else:
+            reader = self._binaryReader(data, "Nodes")
+
+        numBlocks, numNodes, minTag, maxTag = reader.read("size_t", 4)
+        nodeIDs = []
+        nodeCoords = []
+        for block in range(int(numBlocks)):
+            entityDim, entityTag, parametric = reader.read("i4", 3)
+            numNodesInBlock = int(reader.read("size_t", 1)[0])
+            nodeIDs.append(reader.read("size_t", numNodesInBlock))
+            width = 3 + (int(entityDim) if parametric else 0)
+            coords = reader.read("f8", numNodesInBlock * width)
+            nodeCoords.append(coords.reshape((numNodesInBlock, width))[:, :3])
+
+        return (nx.concatenate(nodeIDs).astype(nx.INT_DTYPE),
+                nx.concatenate(nodeCoords))
+
+    def _readEntities(self, data):
+        """
+        Returns the physical entity of each `(dimension, geometrical
+        entity)` of an `MSH` 4 file.  Entities without a physical entity
+        are assigned 0.
+        """
+        physicalEntities = {}
+        try:
+            if self.fileType == 0:
+                reader = _AsciiReader(self._asciiSection(data, "Entities"), dtype=float)
+            else:
+                reader = self._binaryReader(data, "Entities")
+        except EOFError:
+            return physicalEntities
+
+        counts = reader.read("size_t", 4)
+        for dim, count in enumerate(counts):
+            for entity in range(int(count)):
+                tag = int(reader.read("i4", 1)[0])
+                # point coordinates or bounding box
+                reader.read("f8", 3 if dim == 0 else 6)
+                numPhysicalTags = int(reader.read("size_t", 1)[0])
+                physicalTags = reader.read("i4", numPhysicalTags)
+                if dim > 0:
+                    numBounding = int(reader.read("size_t", 1)[0])
+                    reader.read("i4", numBounding)
+                if numPhysicalTags > 0:
+                    physicalEntities[(dim, tag)] = int(physicalTags[0])
+                else:
+                    physicalEntities[(dim, tag)] = 0
 
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+        return physicalEntities
 
-    def _seekForHeader(self, title):
+    def _readElements(self, data):
         """
-        Iterate through a file until we end up at the section header
-        for `title`. Function has obvious side-effects on `self.fileobj`.
+        Returns blocks of elements of one type, as tuples of their
+        position in the file, their type, their Gmsh IDs, their tags, and
+        their nodes.
+
+        Tags are the physical entity, the geometrical entity and, for
+        partitioned meshes, the number of partitions followed by the
+        partitions.
         """
-        while True:
-            line = self.fileobj.readline()
-            if len(line) == 0:
-                raise EOFError("No `%s' header found!" % title)
-                break
-            elif (("$%s" % title) not in line):
-                continue
+        blocks = []
+        if self.version < 4:
+            if self.fileType == 0:
+                count, body = self._asciiSection(data, "Elements").split(b"\n", 1)
+
+                # MSH 2 elements have varying numbers of tags, so find
+                # where each line starts from the number of values on it
+                text = nx.frombuffer(body, dtype=nx.uint8)
+                blank = nx.in1d(text, nx.frombuffer(b" \t\r\n", dtype=nx.uint8))
+                starts = nx.nonzero(~blank & nx.concatenate(([True], blank[:-1])))[0]
+                lines = nx.searchsorted(nx.nonzero(text == ord("\n"))[0], starts)
+                counts = nx.bincount(lines)
+                counts = counts[counts > 0]
+                offsets = nx.cumsum(counts) - counts
+
+                values = nx.fromstring(body, dtype=nx.INT_DTYPE, sep=" ")
+                layouts = nx.array([values[offsets + 1], values[offsets + 2], counts]).swapaxes(0, 1)
+                first, inverse = _uniqueRows(layouts)
+                for i, (elType, numTags, count) in enumerate(layouts[first]):
+                    order = nx.nonzero(inverse == i)[0]
+                    elements = values[offsets[order][..., nx.newaxis] + nx.arange(count)]
+                    blocks.append((order, elType, elements[:, 0],
+                                   elements[:, 3:3 + numTags], elements[:, 3 + numTags:]))
             else:
-                break # found header
+                reader = self._binaryReader(data, "Elements")
+                numElements = int(reader.readline())
+                index = 0
+                while index < numElements:
+                    elType, count, numTags = [int(x) for x in reader.read("i4", 3)]
+                    width = 1 + numTags + self._nodesPerElement[elType]
+                    elements = reader.read("i4", count * width).reshape((count, width)).astype(nx.INT_DTYPE)
+                    blocks.append((nx.arange(index, index + count), elType, elements[:, 0],
+                                   elements[:, 1:1 + numTags], elements[:, 1 + numTags:]))
+                    index += count
+        else:
+            physicalEntities = self._readEntities(data)
+
+            if self.fileType == 0:
+                reader = _AsciiReader(self._asciiSection(data, "Elements"), dtype=nx.INT_DTYPE)
+            else:
+                reader = self._binaryReader(data, "Elements")
+
+            numBlocks, numElements, minTag, maxTag = reader.read("size_t", 4)
+            index = 0
+            for block in range(int(numBlocks)):
+                entityDim, entityTag, elType = [int(x) for x in reader.read("i4", 3)]
+                count = int(reader.read("size_t", 1)[0])
+                width = 1 + self._nodesPerElement[elType]
+                elements = reader.read("size_t", count * width).reshape((count, width)).astype(nx.INT_DTYPE)
+                tags = nx.zeros((count, 2), dtype=nx.INT_DTYPE)
+                tags[:, 0] = physicalEntities.get((entityDim, entityTag), 0)
+                tags[:, 1] = entityTag
+                blocks.append((nx.arange(index, index + count), elType, elements[:, 0],
+                               tags, elements[:, 1:]))
+                index += count
+
+        return blocks
+
+    # ordering of vertices gleaned from a one-cube Grid3D example
+    _hexahedronFaces = [[0, 1, 2, 3],
+                        [4, 5, 6, 7],
+                        [0, 1, 5, 4],
+                        [3, 2, 6, 7],
+                        [0, 3, 7, 4],
+                        [1, 2, 6, 5]]
+    _prismFaces = [[0, 1, 2],
+                   [5, 4, 3],
+                   [3, 4, 1, 0],
+                   [4, 5, 2, 1],
+                   [5, 3, 0, 2]]
+    _pyramidFaces = [[0, 1, 2, 3],
+                     [0, 1, 4],
+                     [1, 2, 4],
+                     [2, 3, 4],
+                     [3, 0, 4]]
+
+    def _faceOrderings(self, shapeType, numNodes):
+        """Vertices of each face of a `shapeType` cell with `numNodes` nodes
+        """
+        if shapeType in [5, 12, 17]: # hexahedron
+            return self._hexahedronFaces
+        elif shapeType in [6, 13, 18]: # prism
+            return self._prismFaces
+        elif shapeType in [7, 14, 19]: # pyramid
+            return self._pyramidFaces
+        else:
+            if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+                faceLength = 2 # triangle
+            elif shapeType in [3, 10, 16]:
+                faceLength = 2 # quadrangle
+            elif shapeType in [4, 11, 29, 30, 31]:
+                faceLength = 3 # tetrahedron
+
+            # we may wrap
+            return [[(i + j) % numNodes for j in range(faceLength)]
+                    for i in range(self.numFacesPerCell[shapeType])]
 
     def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
         """
-        Uses element information obtained from `_parseElementFile` to deliver
+        Uses element information obtained from `_parseElements` to deliver
         `facesToVertices` and `cellsToFaces`.
+
+        Faces are gathered for all cells of a shape type at once and
+        duplicates are found by sorting their vertices.  Faces are numbered
+        in the order they are first encountered, cell by cell.
+
+        >>> f = MSHFile(filename=os.devnull, dimensions=2, communicator=serialComm)
+        >>> f.numFacesPerCell = {2: 3, 3: 4}
+        >>> facesToV, cellsToF, faceKeys = f._deriveCellsAndFaces(
+        ...     nx.array([[0, 1, 2, -1], [1, 3, 4, 2]]),
+        ...     nx.array([2, 3]), 2)
+        >>> print(facesToV)
+        [[1 2 0 3 4 2]
+         [0 1 2 1 3 4]]
+        >>> print(cellsToF)
+        [[ 0  3]
+         [ 1  4]
+         [ 2  5]
+         [-1  1]]
+        >>> print(faceKeys[1])
+        [1 2]
+        >>> f.close()
         """
+        faceCells = []
+        faceSlots = []
+        faceVertices = []
+        maxFaces = 0
+        maxFaceLen = 0
 
-        allShapes  = nx.unique(shapeTypes).tolist()
-        maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
+        for shapeType in nx.unique(shapeTypes).tolist():
+            cellIDs = nx.nonzero(shapeTypes == shapeType)[0]
+            cells = cellsToVertIDs[cellIDs, :self._nodesPerElement[shapeType]]
+            orderings = self._faceOrderings(shapeType, cells.shape[-1])
 
-        # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
-        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
+            maxFaces = max(maxFaces, len(orderings))
+            maxFaceLen = max([maxFaceLen] + [len(o) for o in orderings])
+
+            for slot, ordering in enumerate(orderings):
+                faceCells.append(cellIDs)
+                faceSlots.append(nx.zeros(len(cellIDs), dtype=nx.INT_DTYPE) + slot)
+                faceVertices.append(cells[:, ordering])
 
         # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
+        faceVertices = [nx.concatenate((-nx.ones((len(v), maxFaceLen - v.shape[-1]), dtype=nx.INT_DTYPE), v), axis=1)
+                        for v in faceVertices]
+
+        # visit faces in the same order as a loop over cells would
+        faceCells = nx.concatenate(faceCells)
+        faceSlots = nx.concatenate(faceSlots)
+        order = nx.lexsort((faceSlots, faceCells))
+        faceCells = faceCells[order]
+        faceSlots = faceSlots[order]
+        faceVertices = nx.concatenate(faceVertices)[order]
+
+        # NB: vertices are sorted to spot duplicates
+        keys = nx.sort(faceVertices, axis=1)
+        first, inverse = _uniqueRows(keys)
+
+        # number unique faces by their first appearance
+        firstOrder = nx.argsort(first)
+        faceIDs = nx.empty(len(first), dtype=nx.INT_DTYPE)
+        faceIDs[firstOrder] = nx.arange(len(first))
 
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
+        # `cellsToFaces` must be padded with -1; see mesh.py
+        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
+        cellsToFaces[faceCells, faceSlots] = faceIDs[inverse]
 
-        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), facesDict
+        facesToVertices = faceVertices[first[firstOrder]]
+
+        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), keys[first[firstOrder]]
 
     def _translateNodesToVertices(self, entitiesNodes, vertexMap):
         """Translates e`ntitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
-        """
-        entitiesVertices = []
-
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
-
-        return entitiesVertices
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
-
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
-        """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
+        `entitiesNodes` is padded with -1, which is preserved.
         """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        known = (entitiesNodes < len(vertexMap))
+        vertIndices = nx.where(entitiesNodes >= 0,
+                               vertexMap[nx.where(known, entitiesNodes, 0)], -1)
+        # an entity with any node beyond the map is entirely unknown
+        vertIndices[~nx.logical_and.reduce(known, axis=-1)] = -1
 
-        return [orderingToFace(o) for o in faceOrderings]
+        return vertIndices
 
     def read(self):
         """
@@ -711,164 +926,191 @@ class MSHFile(GmshFile):
         3. Build faces
         4. Build `cellsToFaces`
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for `$Nodes`,
-        `self.elemsPath` for `$Elements`.
-        `self.namesFile` for `$PhysicalNames`.
+        The `$Nodes` and `$Elements` sections are parsed in bulk, straight
+        from the (memory-mapped) file, in either the ASCII or the binary
+        encoding of `MSH` format 2 or 4.1.
 
         Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
                 `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
         """
-        self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
-        try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError as e:
-            self.namesPath = None
-
-        try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
-
-                # We assume we have a 2D file unless we find a node
-                # with a non-zero Z coordinate
+        data = self._mapData()
+
+        self.version, self.fileType, self.dataSize = self._getMetaData(data)
+        self.byteOrder = "<"
+        if self.fileType == 1:
+            # binary files record an integer 1 to reveal their byte order
+            reader = _BinaryReader(data=data,
+                                   offset=self._findSection(data, "MeshFormat"),
+                                   byteOrder=self.byteOrder,
+                                   dataSize=int(self.dataSize))
+            reader.readline()
+            if reader.read("i4", 1)[0] != 1:
+                self.byteOrder = ">"
+
+        if 3 <= self.version < 4.1:
+            raise GmshException("Gmsh MSH file format version %g is not supported" % self.version)
+        elif self.version >= 4 and self.communicator.Nproc > 1:
+            raise GmshException("Partitioned meshes must be in Gmsh MSH file format version 2")
+
+        nodeIDs, nodeCoords = self._readNodes(data)
+
+        if self.dimensions is None:
+            # We assume we have a 2D file unless we find a node
+            # with a non-zero Z coordinate
+            if nx.any(nodeCoords[:, 2] != 0.0):
+                self.dimensions = 3
+            else:
                 self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
 
-                    newVert = [float(x) for x in line]
-
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
-
-                nodesFile.close()
-
-            self.coordDimensions = self.coordDimensions or self.dimensions
-
-            # we need a conditional here so we don't pick up 2D shapes in 3D
-            if self.dimensions == 2:
-                self.numVertsPerFace = {1: 2, # 2-node line
-                                        8: 2} # 3-node line
-                self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 faces)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-            elif self.dimensions == 3:
-                self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 vertices)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-                self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
-                                        11: 4, # 10-node tetrahedron (we only read 1st 4)
-                                        29: 4, # 20-node tetrahedron (we only read 1st 4)
-                                        30: 4, # 35-node tetrahedron (we only read 1st 4)
-                                        31: 4, # 56-node tetrahedron (we only read 1st 4)
-                                         5: 6, # 8-node hexahedron (6 faces)
-                                        12: 6, # 27-node tetrahedron (we only read 1st 6)
-                                        17: 6, # 20-node tetrahedron (we only read 1st 6)
-                                         6: 5, # 6-node prism (5 faces)
-                                        13: 5, # 18-node prism (we only read 1st 6)
-                                        18: 5, # 15-node prism (we only read 1st 6)
-                                         7: 5, # 5-node pyramid (5 faces)
-                                        14: 5, # 14-node pyramid (we only read 1st 5)
-                                        19: 5} # 13-node pyramid (we only read 1st 5)
-            else:
-                raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
-
-            parprint("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            parprint("Recovering coords.")
-            parprint("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            parprint("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in list(facesDict.keys()):
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
-
-        finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
+        self.coordDimensions = self.coordDimensions or self.dimensions
+
+        # we need a conditional here so we don't pick up 2D shapes in 3D
+        if self.dimensions == 2:
+            self.numVertsPerFace = {1: 2, # 2-node line
+                                    8: 2} # 3-node line
+            self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 faces)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+        elif self.dimensions == 3:
+            self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 vertices)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+            self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
+                                    11: 4, # 10-node tetrahedron (we only read 1st 4)
+                                    29: 4, # 20-node tetrahedron (we only read 1st 4)
+                                    30: 4, # 35-node tetrahedron (we only read 1st 4)
+                                    31: 4, # 56-node tetrahedron (we only read 1st 4)
+                                     5: 6, # 8-node hexahedron (6 faces)
+                                    12: 6, # 27-node tetrahedron (we only read 1st 6)
+                                    17: 6, # 20-node tetrahedron (we only read 1st 6)
+                                     6: 5, # 6-node prism (5 faces)
+                                    13: 5, # 18-node prism (we only read 1st 6)
+                                    18: 5, # 15-node prism (we only read 1st 6)
+                                     7: 5, # 5-node pyramid (5 faces)
+                                    14: 5, # 14-node pyramid (we only read 1st 5)
+                                    19: 5} # 13-node pyramid (we only read 1st 5)
+        else:
+            raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+
+        parprint("Parsing elements.")
+        (cellsData,
+         ghostsData,
+         facesData) = self._parseElements(self._readElements(data))
+
+        cellsToGmshVerts = _padRows([cellsData.nodes, ghostsData.nodes])
+        numCellsTotal    = len(cellsToGmshVerts)
+        allShapeTypes    = cellsData.shapes + ghostsData.shapes
+        allShapeTypes    = nx.array(allShapeTypes)
+        allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
+        self.physicalCellMap = nx.array(cellsData.physicalEntities
+                                        + ghostsData.physicalEntities)
+        self.geometricalCellMap = nx.array(cellsData.geometricalEntities
+                                           + ghostsData.geometricalEntities)
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        parprint("Recovering coords.")
+        parprint("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts,
+                                                             nodeIDs, nodeCoords)
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
+                                                        vertIDtoIdx)
+
+        parprint("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                               allShapeTypes,
+                                               numCellsTotal)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
+                                                        vertIDtoIdx)
+
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        if len(facesData.idmap) > 0:
+            # not all faces are necessarily tagged
+            fipyFaces, gmshFaces = _matchRows(faceKeys, facesToVertIDs)
+            self.physicalFaceMap[fipyFaces] = nx.array(facesData.physicalEntities)[gmshFaces]
+            self.geometricalFaceMap[fipyFaces] = nx.array(facesData.geometricalEntities)[gmshFaces]
+
+        self.physicalNames = self._parseNames(data)
+
+        # convert cell vertices to a properly oriented masked array
         cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0, 1)
 
+        if self._cacheFile is not None:
+            self._writeCache(vertexCoords, facesToV, cellsToF,
+                             cellsData.idmap, ghostsData.idmap,
+                             cellsToVertIDs)
+
         parprint("Done with cells and faces.")
         return (vertexCoords, facesToV, cellsToF,
                 cellsData.idmap, ghostsData.idmap,
                 cellsToVertIDs)
 
+    def _writeCache(self, vertexCoords, facesToV, cellsToF,
+                    cellGlobalIDs, gCellGlobalIDs, cellsToVertIDs):
+        """Store the parsed mesh in the cache for `_CachedMSHFile` to read
+        """
+        directory = os.path.dirname(self._cacheFile)
+        if directory and not os.path.exists(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # another processor got there first
+                pass
+
+        # write to a scratch file and rename it, so that an interrupted
+        # or concurrent run never leaves a partial mesh in the cache
+        (f, scratch) = tempfile.mkstemp(suffix='.npz', dir=directory or None)
+        with os.fdopen(f, 'wb') as fileobj:
+            nx.savez(fileobj,
+                     vertexCoords=vertexCoords,
+                     facesToV=facesToV,
+                     cellsToF=cellsToF,
+                     cellGlobalIDs=nx.array(cellGlobalIDs, dtype=nx.INT_DTYPE),
+                     gCellGlobalIDs=nx.array(gCellGlobalIDs, dtype=nx.INT_DTYPE),
+                     cellsToVertIDs=nx.MA.filled(cellsToVertIDs, -1),
+                     physicalCellMap=self.physicalCellMap,
+                     geometricalCellMap=self.geometricalCellMap,
+                     physicalFaceMap=self.physicalFaceMap,
+                     geometricalFaceMap=self.geometricalFaceMap,
+                     physicalNames=json.dumps(self.physicalNames),
+                     dimensions=self.dimensions)
+        try:
+            os.rename(scratch, self._cacheFile)
+        except OSError:
+            # Windows won't replace a file that another run just cached
+            os.unlink(scratch)
+
     def write(self, obj, time=0.0, timeindex=0):
         if not self.formatWritten:
             self._writeMeshFormat()
@@ -996,50 +1238,27 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
         indices (same as in `MSHFile`).
-
-        Unlike parent, doesn't use `genfromtxt`
-        because we want to avoid loading the entire `.msh` file into memory.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts >= 0]) # sorted, without dups
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
         vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
-
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
-
-        nodesFile.close()
+        nodeRows = nx.ones(max(maxVertIdx, nodeIDs.max() + 1), 'l') * -1
+        nodeRows[nodeIDs] = nx.arange(len(nodeIDs))
+        vertexCoords = nodeCoords[nodeRows[allVerts], :self.coordDimensions]
 
         # transpose for FiPy
         transCoords = vertexCoords.swapaxes(0, 1)
         return transCoords, vertGIDtoIdx
 
-    def _parseElementFile(self):
+    def _parseElements(self, blocks):
         """
         Return three objects, the first for non-ghost cells, the second for
         ghost cells, and the third for faces.
@@ -1048,121 +1267,101 @@ class MSHFile(GmshFile):
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
         """
-
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
-
-            # the partition tags for don't seem to always be present
-            # and don't always make much sense when they are
-
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
-            else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
         cellsData = _ElementData()
         ghostsData = _ElementData()
         facesData = _ElementData()
 
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
+        cellBlocks = [b for b in blocks if b[1] in self.numFacesPerCell]
+        faceBlocks = [b for b in blocks if b[1] in self.numVertsPerFace]
+
         pid = self.communicator.procID + 1
 
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in list(self.numFacesPerCell.keys()):
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in list(self.numVertsPerFace.keys()):
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
-
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
-
-        elemsFile.close()
+        def _firstID(blocks):
+            # this will be subtracted from gmsh ID to obtain global ID
+            blocks = [b for b in blocks if len(b[0]) > 0]
+            if len(blocks) > 0:
+                first = nx.argmin([b[0][0] for b in blocks])
+                return blocks[first][2][0]
+            else:
+                return 0
 
-        return cellsData, ghostsData, facesData
+        def _splitTags(tags):
+            # the partition tags for don't seem to always be present
+            # and don't always make much sense when they are
+            if tags.shape[-1] >= 2:
+                return tags[:, 0], tags[:, 1], tags[:, 2:]
+            else:
+                unknown = -nx.ones(len(tags), dtype=nx.INT_DTYPE)
+                return unknown, unknown, tags
+
+        cellOffset = _firstID(cellBlocks)
+        for order, elType, ids, tags, nodes in cellBlocks:
+            physicalEntities, geometricalEntities, partitions = _splitTags(tags)
+
+            if partitions.shape[-1] > 0:
+                # next item is a count
+                if nx.any(partitions[:, 0] != partitions.shape[-1] - 1):
+                    warnings.warn("Partition count does not agree with number of remaining tags.",
+                                  SyntaxWarning, stacklevel=2)
+                partitions = partitions[:, 1:]
+
+            if self.communicator.Nproc > 1:
+                # if we're collecting ghost cells and this is our ghost cell
+                ghosts = nx.logical_or.reduce(partitions == -pid, axis=1)
+                # el is in this processor's partition
+                cells = nx.logical_or.reduce(partitions == pid, axis=1)
+            else:
+                # we collect all cells
+                ghosts = nx.zeros(len(ids), dtype=bool)
+                cells = nx.ones(len(ids), dtype=bool)
+
+            for data, selection in ((ghostsData, ghosts), (cellsData, cells)):
+                if nx.any(selection):
+                    data.add(order=order[selection], elType=elType,
+                             ids=ids[selection] - cellOffset, nodes=nodes[selection],
+                             physicalEntities=physicalEntities[selection],
+                             geometricalEntities=geometricalEntities[selection])
+
+        faceOffset = _firstID(faceBlocks)
+        for order, elType, ids, tags, nodes in faceBlocks:
+            physicalEntities, geometricalEntities, partitions = _splitTags(tags)
+            facesData.add(order=order, elType=elType,
+                          ids=ids - faceOffset, nodes=nodes,
+                          physicalEntities=physicalEntities,
+                          geometricalEntities=geometricalEntities)
+
+        for data in (cellsData, ghostsData, facesData):
+            data.sort()
 
+        return cellsData, ghostsData, facesData
 
-    def _parseNamesFile(self):
+    def _parseNames(self, data):
         physicalNames = {
             0: dict(),
             1: dict(),
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
-
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
-                nm = nm.split()
-                if self.version > 2.0:
-                    dim = [int(nm.pop(0))]
-                else:
-                    # Gmsh format prior to 2.1 did not unambiguously tie
-                    # physical names to physical entities of different dimensions
-                    # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
-                    dim = [0, 1, 2, 3]
-                num = int(nm.pop(0))
-                name = " ".join(nm)[1:-1]
-                for d in dim:
-                    physicalNames[d][name] = int(num)
+        try:
+            names = self._asciiSection(data, "PhysicalNames").decode('utf-8')
+        except EOFError:
+            return physicalNames
 
-            namesFile.close()
+        for nm in names.splitlines()[1:]: # skip number of elements
+            nm = nm.split()
+            if len(nm) == 0:
+                continue
+            if self.version > 2.0:
+                dim = [int(nm.pop(0))]
+            else:
+                # Gmsh format prior to 2.1 did not unambiguously tie
+                # physical names to physical entities of different dimensions
+                # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
+                dim = [0, 1, 2, 3]
+            num = int(nm.pop(0))
+            name = " ".join(nm)[1:-1]
+            for d in dim:
+                physicalNames[d][name] = int(num)
 
         return physicalNames
 
@@ -1268,31 +1467,253 @@ class MSHFile(GmshFile):
         """
         pass
 
+def _openCachedMSHFile(cacheFile, dimensions, coordDimensions=None, communicator=parallelComm):
+    """Open the mesh cached at `cacheFile`, if every processor has its part
+
+    A mesh read from an `MSH` file is stored in the cache, and read back
+    without Gmsh.
+
+    >>> import tempfile, shutil
+    >>> from fipy.tools import serialComm
+    >>> dir = tempfile.mkdtemp()
+    >>> mshFile = os.path.join(dir, "square.msh")
+    >>> with open(mshFile, "w") as f:
+    ...     _ = f.write('''$MeshFormat
+    ... 2.2 0 8
+    ... $EndMeshFormat
+    ... $PhysicalNames
+    ... 2
+    ... 1 1 "edge"
+    ... 2 2 "inside"
+    ... $EndPhysicalNames
+    ... $Nodes
+    ... 4
+    ... 1 0 0 0
+    ... 2 1 0 0
+    ... 3 1 1 0
+    ... 4 0 1 0
+    ... $EndNodes
+    ... $Elements
+    ... 3
+    ... 1 1 2 1 1 1 2
+    ... 2 2 2 2 1 1 2 3
+    ... 3 2 2 2 1 1 3 4
+    ... $EndElements
+    ... ''')
+    >>> cacheFile = os.path.join(dir, "cache", "square.npz")
+    >>> print(_openCachedMSHFile(cacheFile, dimensions=2, communicator=serialComm))
+    None
+
+    >>> f = MSHFile(mshFile, dimensions=2, communicator=serialComm)
+    >>> f._cacheFile = cacheFile
+    >>> parsed = f.read()
+    >>> f.close()
+
+    >>> f = _openCachedMSHFile(cacheFile, dimensions=2, communicator=serialComm)
+    >>> cached = f.read()
+    >>> for a, b in zip(parsed, cached):
+    ...     print(nx.allequal(nx.MA.filled(a, -1), nx.MA.filled(b, -1)))
+    True
+    True
+    True
+    True
+    True
+    True
+    >>> print(f.physicalNames[1] == {"edge": 1}, f.physicalNames[2] == {"inside": 2})
+    True True
+    >>> print(f.physicalCellMap, f.physicalFaceMap)
+    [2 2] [1 0 0 0 0]
+    >>> f.close()
+
+    >>> shutil.rmtree(dir)
+    """
+    # `all` reduces arrays
+    if communicator.all(nx.array(os.path.exists(cacheFile))):
+        return _CachedMSHFile(filename=cacheFile,
+                              dimensions=dimensions,
+                              coordDimensions=coordDimensions,
+                              communicator=communicator)
+    else:
+        return None
+
+class _CachedMSHFile(MSHFile):
+    """Stands in for the `MSHFile` of a mesh found in the cache of `openMSHFile`
+    """
+    def __init__(self, filename, dimensions, coordDimensions=None, communicator=parallelComm):
+        self.filename = filename
+        self.dimensions = dimensions
+        self.coordDimensions = coordDimensions
+        self.communicator = communicator
+        self.gmshOutput = ""
+        self.mode = 'r'
+        self.fileIsTemporary = False
+
+    def read(self):
+        with nx.load(self.filename, allow_pickle=False) as data:
+            self.physicalCellMap = data["physicalCellMap"]
+            self.geometricalCellMap = data["geometricalCellMap"]
+            self.physicalFaceMap = data["physicalFaceMap"]
+            self.geometricalFaceMap = data["geometricalFaceMap"]
+            self.physicalNames = dict((int(dim), names) for dim, names
+                                      in json.loads(str(data["physicalNames"])).items())
+            self.dimensions = int(data["dimensions"])
+
+            return (data["vertexCoords"],
+                    data["facesToV"],
+                    data["cellsToF"],
+                    data["cellGlobalIDs"].tolist(),
+                    data["gCellGlobalIDs"].tolist(),
+                    nx.MA.masked_equal(data["cellsToVertIDs"], value=-1))
+
+    def close(self):
+        pass
+
+def _matchRows(keys, rows):
+    """Find the `rows` that are permutations of the sorted `keys`
+
+    `keys` is an array of sorted vertex IDs, padded on the left with -1,
+    and `rows` is an array of vertex IDs, padded with -1.  Where several
+    of the `rows` match the same key, the last one is taken.
+
+    >>> keys = nx.array([[-1, 0, 1], [0, 1, 2], [-1, 2, 3]])
+    >>> keyIDs, rowIDs = _matchRows(keys, nx.array([[1, 0, -1], [3, 4, -1], [2, 0, 1], [0, 1, -1]]))
+    >>> print(keyIDs)
+    [0 1]
+    >>> print(rowIDs)
+    [3 2]
+
+    Returns
+    -------
+    keyIDs, rowIDs : ndarray
+        Indices of the matching `keys` and `rows`.
+    """
+    width = max(keys.shape[-1], rows.shape[-1])
+    keys = nx.concatenate((-nx.ones((len(keys), width - keys.shape[-1]), dtype=keys.dtype), keys), axis=1)
+    rows = nx.concatenate((-nx.ones((len(rows), width - rows.shape[-1]), dtype=rows.dtype), rows), axis=1)
+    rows = nx.sort(rows, axis=1)
+
+    _, labels = _uniqueRows(nx.concatenate((keys, rows)))
+    keyLabels = labels[:len(keys)]
+    rowLabels = labels[len(keys):]
+
+    # index of the last row with each label
+    rowLabels, last = nx.unique(rowLabels[::-1], return_index=True)
+    lastRow = -nx.ones(len(keys) + len(rows), dtype=nx.INT_DTYPE)
+    lastRow[rowLabels] = len(rows) - 1 - last
+
+    rowIDs = lastRow[keyLabels]
+    keyIDs = nx.nonzero(rowIDs >= 0)[0]
+
+    return keyIDs, rowIDs[keyIDs]
+
+class _AsciiReader(object):
+    """
+    Reads consecutive values from the text of an `MSH` section.
+    """
+    def __init__(self, text, dtype):
+        self.values = nx.fromstring(text, dtype=dtype, sep=" ")
+        self.offset = 0
+
+    def read(self, dtype, count):
+        values = self.values[self.offset:self.offset + count]
+        self.offset += count
+        if dtype == "f8":
+            return values.astype(float)
+        else:
+            return values.astype(nx.INT_DTYPE)
+
+class _BinaryReader(object):
+    """
+    Reads consecutive arrays from a binary `MSH` section, without copying.
+
+    >>> data = b"2\\n" + nx.array([7, 8], dtype='<i4').tobytes() + nx.array([3], dtype='<u8').tobytes()
+    >>> reader = _BinaryReader(data=data, offset=0, byteOrder='<', dataSize=8)
+    >>> print(int(reader.readline()))
+    2
+    >>> print(reader.read("i4", 2))
+    [7 8]
+    >>> print(reader.read("size_t", 1))
+    [3]
+    """
+    def __init__(self, data, offset, byteOrder, dataSize):
+        self.data = data
+        self.offset = offset
+        self.byteOrder = byteOrder
+        self.dataSize = dataSize
+
+    def readline(self):
+        end = self.data.find(b"\n", self.offset)
+        line = self.data[self.offset:end]
+        self.offset = end + 1
+        return line
+
+    def read(self, dtype, count):
+        if dtype == "size_t":
+            dtype = "u%d" % self.dataSize
+        dtype = nx.dtype(dtype).newbyteorder(self.byteOrder)
+        count = int(count)
+        if count == 0:
+            return nx.zeros((0,), dtype=dtype)
+        values = nx.frombuffer(self.data, dtype=dtype, count=count, offset=self.offset)
+        self.offset += dtype.itemsize * count
+        return values
+
 class _ElementData(object):
     """
     Bookkeeping for cells. Declared as own class for generality.
 
     :Properties:
-    - `nodes`: A Python list of the vertices that make up this element
+    - `nodes`: An array of the vertices that make up each element, padded with -1
     - `shapes`: A `shapeTypes` Python list
     - `idmap`: A Python list which maps `vertexCoords` index to global ID
     - `physicalEntities`: A Python list of the Gmsh physical entities each element is in
     - `geometricalEntities`: A Python list of the Gmsh geometrical entities each element is in
     """
     def __init__(self):
-        self.nodes = []
+        self.nodes = nx.zeros((0, 0), dtype=nx.INT_DTYPE)
         self.shapes = []
         self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
         self.physicalEntities = []
         self.geometricalEntities = []
+        self._order = []
+        self._nodes = []
 
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+    def add(self, order, elType, ids, nodes, physicalEntities, geometricalEntities):
+        """Add a block of elements of type `elType` at positions `order` of the file
+        """
+        self._order.append(order)
+        self._nodes.append(nodes)
+        self.shapes.extend([elType] * len(ids))
+        self.idmap.extend(ids.tolist())
+        self.physicalEntities.extend(physicalEntities.tolist())
+        self.geometricalEntities.extend(geometricalEntities.tolist())
+
+    def sort(self):
+        """Put the elements in the order they appear in the file
+        """
+        self.nodes = _padRows(self._nodes)
+        if len(self._order) > 1:
+            order = nx.argsort(nx.concatenate(self._order), kind='stable')
+            self.nodes = self.nodes[order]
+            for attr in ("shapes", "idmap", "physicalEntities", "geometricalEntities"):
+                values = getattr(self, attr)
+                setattr(self, attr, [values[i] for i in order])
+        self._order = []
+        self._nodes = []
+
+def _padRows(arrays):
+    """Stack 2D arrays of differing widths, padding on the right with -1
+
+    >>> print(_padRows([nx.array([[1, 2]]), nx.array([[3, 4, 5]])]))
+    [[ 1  2 -1]
+     [ 3  4  5]]
+    """
+    arrays = [a for a in arrays if len(a) > 0]
+    if len(arrays) == 0:
+        return nx.zeros((0, 0), dtype=nx.INT_DTYPE)
+    width = max([a.shape[-1] for a in arrays])
+    return nx.concatenate([nx.concatenate((a, -nx.ones((len(a), width - a.shape[-1]), dtype=a.dtype)), axis=1)
+                           for a in arrays])
 
 class _GmshTopology(_MeshTopology):
 
@@ -1583,6 +2004,10 @@ class Gmsh2D(Mesh2D):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to keep meshes generated from geometry
+        scripts, to be loaded instead of running Gmsh again
+        (see :func:`openMSHFile`).
     """
 
     def __init__(self,
@@ -1590,7 +2015,8 @@ class Gmsh2D(Mesh2D):
                  coordDimensions=2,
                  communicator=parallelComm,
                  overlap=1,
-                 background=None):
+                 background=None,
+                 cache=None):
 
         self.mshFile = openMSHFile(arg,
                                    dimensions=2,
@@ -1598,7 +2024,8 @@ class Gmsh2D(Mesh2D):
                                    communicator=communicator,
                                    overlap=overlap,
                                    mode='r',
-                                   background=background)
+                                   background=background,
+                                   cache=cache)
 
         # openMSHFile may have "downgraded" the communicator
         # if, e.g., too many overlaps were requested
@@ -1686,6 +2113,36 @@ class Gmsh2D(Mesh2D):
         >>> print(rect.cellVolumes[0] > 0) # doctest: +GMSH
         True
 
+        A mesh generated with a `cache` directory is loaded from there
+        when the same geometry is meshed again
+
+        >>> import tempfile
+        >>> import shutil
+        >>> cacheDir = tempfile.mkdtemp()
+        >>> rectGeo = '''
+        ... Point(1) = {0, 0, 0, 0.5};
+        ... Point(2) = {1, 0, 0, 0.5};
+        ... Point(3) = {1, 1, 0, 0.5};
+        ... Point(4) = {0, 1, 0, 0.5};
+        ... Line(5) = {1, 2};
+        ... Line(6) = {2, 3};
+        ... Line(7) = {3, 4};
+        ... Line(8) = {4, 1};
+        ... Line Loop(9) = {5, 6, 7, 8};
+        ... Plane Surface(10) = {9};
+        ... Physical Surface("inside") = {10};
+        ... Physical Line("left") = {8};
+        ... '''
+        >>> fresh = Gmsh2D(rectGeo, communicator=serialComm, cache=cacheDir) # doctest: +GMSH
+        >>> print(len(os.listdir(cacheDir))) # doctest: +GMSH
+        1
+        >>> cached = Gmsh2D(rectGeo, communicator=serialComm, cache=cacheDir) # doctest: +GMSH
+        >>> print(nx.allclose(fresh.cellCenters, cached.cellCenters)) # doctest: +GMSH
+        True
+        >>> print((fresh.physicalFaces["left"] == cached.physicalFaces["left"]).all()) # doctest: +GMSH
+        True
+        >>> shutil.rmtree(cacheDir)
+
         Testing multiple shape types within a mesh;
 
         >>> circle = Gmsh2D('''
@@ -1890,14 +2347,19 @@ class Gmsh2DIn3DSpace(Gmsh2D):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to keep meshes generated from geometry
+        scripts, to be loaded instead of running Gmsh again
+        (see :func:`openMSHFile`).
     """
-    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None, cache=None):
         Gmsh2D.__init__(self,
                         arg,
                         coordDimensions=3,
                         communicator=communicator,
                         overlap=overlap,
-                        background=background)
+                        background=background,
+                        cache=cache)
 
     def _test(self):
         """
@@ -1972,14 +2434,19 @@ class Gmsh3D(Mesh):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to keep meshes generated from geometry
+        scripts, to be loaded instead of running Gmsh again
+        (see :func:`openMSHFile`).
     """
-    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None, cache=None):
         self.mshFile  = openMSHFile(arg,
                                     dimensions=3,
                                     communicator=communicator,
                                     overlap=overlap,
                                     mode='r',
-                                    background=background)
+                                    background=background,
+                                    cache=cache)
 
         # openMSHFile may have "downgraded" the communicator
         # if, e.g., too many overlaps were requested
@@ -2206,7 +2673,7 @@ class GmshGrid2D(Gmsh2D):
     """Should serve as a drop-in replacement for `Grid2D`
     """
     def __init__(self, dx=1., dy=1., nx=1, ny=None,
-                 coordDimensions=2, communicator=parallelComm, overlap=1):
+                 coordDimensions=2, communicator=parallelComm, overlap=1, cache=None):
         self.dx = dx
         self.dy = dy or dx
         self.nx = nx
@@ -2214,7 +2681,7 @@ class GmshGrid2D(Gmsh2D):
 
         arg = self._makeGridGeo(self.dx, self.dy, self.nx, self.ny)
 
-        Gmsh2D.__init__(self, arg, coordDimensions, communicator, overlap, background=None)
+        Gmsh2D.__init__(self, arg, coordDimensions, communicator, overlap, background=None, cache=cache)
 
     @property
     def _meshSpacing(self):
@@ -2276,7 +2743,7 @@ class GmshGrid3D(Gmsh3D):
     """Should serve as a drop-in replacement for `Grid3D`
     """
     def __init__(self, dx=1., dy=1., dz=1., nx=1, ny=None, nz=None,
-                 communicator=parallelComm, overlap=1):
+                 communicator=parallelComm, overlap=1, cache=None):
         self.dx = dx
         self.dy = dy or dx
         self.dz = dz or dx
@@ -2288,7 +2755,7 @@ class GmshGrid3D(Gmsh3D):
         arg = self._makeGridGeo(self.dx, self.dy, self.dz,
                                 self.nx, self.ny, self.nz)
 
-        Gmsh3D.__init__(self, arg, communicator=communicator, overlap=overlap)
+        Gmsh3D.__init__(self, arg, communicator=communicator, overlap=overlap, cache=cache)
 
     @property
     def _meshSpacing(self):
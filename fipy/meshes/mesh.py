@@ -11,6 +11,7 @@ from fipy.tools import numerix
 from fipy.tools.numerix import MA
 from fipy.tools.dimensions.physicalField import PhysicalField
 from fipy.tools import serialComm
+from fipy.tools.spatialIndex import _spatialIndex
 
 __all__ = ["MeshAdditionError", "Mesh"]
 from future.utils import text_to_native_str
@@ -35,8 +36,17 @@ class Mesh(AbstractMesh):
         """faceVertexIds and cellFacesIds must be padded with minus ones."""
 
         self.vertexCoords = vertexCoords
-        self.faceVertexIDs = MA.masked_values(faceVertexIDs, -1)
-        self.cellFaceIDs = MA.masked_values(cellFaceIDs, -1)
+
+        # index topology as compactly as the mesh allows
+        self._indexDtype = numerix._indexDtype(max(numerix.shape(vertexCoords)[-1],
+                                                   numerix.shape(faceVertexIDs)[-1],
+                                                   numerix.shape(cellFaceIDs)[-1]))
+        self.faceVertexIDs = MA.masked_values(numerix.array(MA.filled(faceVertexIDs, -1),
+                                                            dtype=self._indexDtype),
+                                              -1, copy=False)
+        self.cellFaceIDs = MA.masked_values(numerix.array(MA.filled(cellFaceIDs, -1),
+                                                          dtype=self._indexDtype),
+                                            -1, copy=False)
 
         self.dim = self.vertexCoords.shape[0]
 
@@ -112,7 +122,7 @@ class Mesh(AbstractMesh):
     def _calcCellToCellIDsFilled(self):
         N = self.numberOfCells
         M = self._maxFacesPerCell
-        cellIDs = numerix.repeat(numerix.arange(N)[numerix.newaxis, ...], M, axis=0)
+        cellIDs = numerix.repeat(numerix.arange(N, dtype=self._indexDtype)[numerix.newaxis, ...], M, axis=0)
         return MA.where(MA.getmaskarray(self._cellToCellIDs), cellIDs,
                         self._cellToCellIDs)
 
@@ -428,9 +438,9 @@ class Mesh(AbstractMesh):
     """calculate Topology methods"""
 
     def _calcFaceCellIDs(self):
-        array = MA.array(MA.indices(self.cellFaceIDs.shape, 'l')[1],
+        array = MA.array(MA.indices(self.cellFaceIDs.shape, self._indexDtype)[1],
                          mask=MA.getmask(self.cellFaceIDs))
-        faceCellIDs = MA.zeros((2, self.numberOfFaces), 'l')
+        faceCellIDs = MA.zeros((2, self.numberOfFaces), self._indexDtype)
 
         ## Nasty bug: MA.put(arr, ids, values) fills its ids and
         ## values arguments when masked!  This was not the behavior
@@ -543,9 +553,108 @@ class Mesh(AbstractMesh):
            >>> m1 = Grid2D(nx=2, ny=2, dx=5., dy=5.)
            >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
            [4 5 7 8]
+           >>> print(m0._getNearestCellID((0.5, 4.)))
+           7
+
+        The spatial index of the cell centers is kept until they move
+
+           >>> index = m0._nearestCellIndex
+           >>> m0._nearestCellIndex is index
+           True
+           >>> m0._setScaledGeometry(1.)
+           >>> m0._nearestCellIndex is index
+           False
+
+        """
+        if isinstance(self._scaledCellCenters, PhysicalField):
+            return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        return self._nearestCellIndex.nearest(points)
+
+    def _locateCells(self, points):
+        """Return the IDs of the cells that contain `points`
+
+        Starting from the cell with the nearest center, each point walks
+        across the face that it lies furthest beyond until it is behind
+        every face of its cell. Points outside the mesh are assigned to
+        the cell with the nearest center. Cells are assumed to be convex.
 
+           >>> from fipy import *
+           >>> m = Grid2D(dx=(.1, 10.), dy=(1.,))
+           >>> print(m._getNearestCellID(((1.,), (0.5,))))
+           [0]
+           >>> print(m._locateCells(((1.,), (0.5,))))
+           [1]
+           >>> print(m._locateCells(((0.05, 5., 20.), (0.5, 0.5, 0.5))))
+           [0 1 1]
+           >>> print(m._locateCells((1., 0.5)))
+           1
+
+        On a triangulated square, the nearest center is often in a
+        neighboring triangle
+
+           >>> m = Tri2D(nx=2, ny=2)
+           >>> x, y = numerix.random.random((2, 1000)) * 2
+           >>> cells = m._locateCells((x, y))
+           >>> X, Y = m.vertexCoords[..., m._orderedCellVertexIDs[..., cells]]
+           >>> sides = numerix.array([(X[(i+1) % 3] - X[i]) * (y - Y[i])
+           ...                        - (Y[(i+1) % 3] - Y[i]) * (x - X[i])
+           ...                        for i in range(3)])
+           >>> print(((sides >= -1e-12).all(axis=0)
+           ...        | (sides <= 1e-12).all(axis=0)).all())
+           True
+        """
+        nearest = numerix.asarray(self._getNearestCellID(points))
+
+        if (self.communicator.Nproc > 1
+            or isinstance(self._scaledCellCenters, PhysicalField)):
+            return nearest
+
+        points = numerix.array(points, dtype=float).reshape((self.dim, -1))
+        cellIDs = nearest.reshape((-1,)).copy()
+
+        faceIDs = MA.filled(self.cellFaceIDs, 0)
+        outward = MA.filled(self._cellToFaceOrientations, 0)
+        faceMask = MA.getmaskarray(self.cellFaceIDs)
+        neighbors = MA.filled(self._cellToCellIDs, -1)
+        faceCenters = numerix.array(self._faceCenters)
+        faceNormals = numerix.array(self.faceNormals)
+        # allow for round-off on faces
+        tolerance = 1e-10 * numerix.array(self._cellVolumes)**(1. / self.dim)
+
+        active = numerix.arange(len(cellIDs))
+        for step in range(2 * int(self.numberOfCells**(1. / self.dim)) + 10):
+            cells = cellIDs[active]
+            faces = faceIDs[..., cells]
+            # (Fmax, A) distances of each point beyond each face of its cell
+            beyond = ((points[:, numerix.newaxis, active] - faceCenters[:, faces])
+                      * faceNormals[:, faces]).sum(axis=0) * outward[..., cells]
+            beyond = numerix.where(faceMask[..., cells], -numerix.inf, beyond)
+            worst = numerix.argmax(beyond, axis=0)
+            located = beyond[worst, numerix.arange(len(active))] <= tolerance[cells]
+
+            following = neighbors[worst, cells]
+            outside = ~located & (following < 0)
+            cellIDs[active[outside]] = nearest.reshape((-1,))[active[outside]]
+
+            walking = ~located & ~outside
+            cellIDs[active[walking]] = following[walking]
+            active = active[walking]
+            if len(active) == 0:
+                break
+        else:
+            # wandering in circles
+            cellIDs[active] = nearest.reshape((-1,))[active]
+
+        return cellIDs.reshape(nearest.shape)
+
+    @property
+    def _nearestCellIndex(self):
+        """Spatial index of the global cell centers, built on first use
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        centers = self._scaledCellCenters
+        if getattr(self, "_nearestCellIndexCache", (None, None))[0] is not centers:
+            self._nearestCellIndexCache = (centers, _spatialIndex(self.cellCenters.globalValue))
+        return self._nearestCellIndexCache[1]
 
     def _test(self):
         """
@@ -0,0 +1,187 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import zip
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+from fipy.meshes.pointInterpolator import PointInterpolator
+
+__all__ = ["MeshInterpolator"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class MeshInterpolator(PointInterpolator):
+    r"""Transfers `CellVariable` objects from one mesh to another
+
+    The transfer is assembled into a sparse matrix once, so that moving
+    any number of variables, at any number of time steps, costs one
+    matrix-vector product each.
+
+    >>> from fipy import *
+    >>> coarse = Grid2D(nx=2, ny=2, dx=1., dy=1.)
+    >>> fine = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
+    >>> x, y = coarse.cellCenters
+    >>> var = CellVariable(mesh=coarse, name="xy", value=x * y)
+    >>> toFine = MeshInterpolator(sourceMesh=coarse, targetMesh=fine)
+    >>> fineVar = toFine(var)
+    >>> print(fineVar.mesh is fine)
+    True
+    >>> print(fineVar.name)
+    xy
+    >>> print(fineVar)
+    [ 0.125  0.25   0.5    0.625  0.25   0.375  0.875  1.     0.5    0.875
+      1.875  2.25   0.625  1.     2.25   2.625]
+
+    which is the same as interpolating to the cell centers of the target
+
+    >>> print(numerix.allclose(fineVar, var(fine.cellCenters.globalValue, order=1)))
+    True
+
+    and can be repeated as `var` changes
+
+    >>> var.value = x + y
+    >>> print(toFine(var))
+    [ 0.75  1.    1.75  2.    1.    1.25  2.    2.25  1.75  2.    2.75  3.
+      2.    2.25  3.    3.25]
+
+    Interpolation does not, in general, conserve the integral of `var`.
+    Between rectilinear grids, a `conservative` transfer averages `var`
+    over the overlap of each target cell with the source cells
+
+    >>> toCoarse = MeshInterpolator(sourceMesh=fine, targetMesh=coarse,
+    ...                             conservative=True)
+    >>> print(toCoarse(fineVar))
+    [ 0.25  0.75  0.75  2.25]
+    >>> print(numerix.allclose((toCoarse(fineVar) * coarse.cellVolumes).sum(),
+    ...                        (fineVar * fine.cellVolumes).sum()))
+    True
+
+    The grids need not be aligned, nor uniform
+
+    >>> other = Grid2D(dx=(.3, .4, .8, .5), dy=(1.5, .5))
+    >>> var = CellVariable(mesh=fine, value=fine.x**2 * fine.y)
+    >>> otherVar = MeshInterpolator(sourceMesh=fine, targetMesh=other,
+    ...                             conservative=True)(var)
+    >>> print(numerix.allclose((otherVar * other.cellVolumes).sum(),
+    ...                        (var * fine.cellVolumes).sum()))
+    True
+
+    but they must be rectilinear
+
+    >>> MeshInterpolator(sourceMesh=Tri2D(nx=2, ny=2), targetMesh=coarse,
+    ...                  conservative=True) # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    ValueError: conservative interpolation requires rectilinear grids
+
+    Parameters
+    ----------
+    sourceMesh : ~fipy.meshes.mesh.Mesh
+        The mesh to interpolate from
+    targetMesh : ~fipy.meshes.mesh.Mesh
+        The mesh to interpolate to
+    order : {`0`, `1`}
+        The order of interpolation to the cell centers of `targetMesh`
+        (see :class:`~fipy.meshes.pointInterpolator.PointInterpolator`)
+    conservative : bool
+        Whether to average over the overlapping volumes of the cells of
+        Cartesian grids, instead.  Any part of a target cell outside of
+        `sourceMesh` contributes nothing to its average.
+    """
+
+    def __init__(self, sourceMesh, targetMesh, order=1, conservative=False):
+        self.targetMesh = targetMesh
+
+        if conservative:
+            if sourceMesh.communicator.Nproc > 1 or targetMesh.communicator.Nproc > 1:
+                raise NotImplementedError("MeshInterpolator does not support partitioned meshes")
+            if sourceMesh.dim != targetMesh.dim:
+                raise ValueError("meshes must have the same dimension")
+
+            self.mesh = sourceMesh
+            self.order = order
+            self.cellIDs = None
+            self.matrix = self._overlapMatrix(sourceMesh, targetMesh)
+        else:
+            PointInterpolator.__init__(self, mesh=sourceMesh,
+                                       points=targetMesh.cellCenters.globalValue,
+                                       order=order)
+
+    @staticmethod
+    def _edges(mesh):
+        """Return the cell boundaries along each axis of a rectilinear grid
+        """
+        vertexCoords = numerix.array(mesh.vertexCoords)
+        edges = [numerix.unique(coords) for coords in vertexCoords]
+
+        widths = numerix.meshgrid(*[numerix.diff(e) for e in edges[::-1]], indexing='ij')
+        centers = numerix.meshgrid(*[(e[:-1] + e[1:]) / 2. for e in edges[::-1]], indexing='ij')
+
+        # cells of FiPy's grids are numbered with x varying fastest
+        volumes = numerix.prod([w.ravel() for w in widths], axis=0)
+        centers = numerix.array([c.ravel() for c in centers[::-1]])
+
+        if (volumes.shape[-1] != mesh.numberOfCells
+            or not numerix.allclose(centers, numerix.array(mesh.cellCenters.globalValue))
+            or not numerix.allclose(volumes, numerix.array(mesh.cellVolumes))):
+            raise ValueError("conservative interpolation requires rectilinear grids")
+
+        return edges
+
+    @staticmethod
+    def _overlapLengths(source, target):
+        """Return the lengths by which the `target` intervals overlap the `source` intervals
+
+        >>> print(MeshInterpolator._overlapLengths(source=numerix.array((0., 1., 2.)),
+        ...                                        target=numerix.array((0.5, 1.5))).toarray())
+        [[ 0.5  0.5]]
+        """
+        from scipy import sparse
+
+        breaks = numerix.unique(numerix.concatenate((source, target)))
+        middles = (breaks[:-1] + breaks[1:]) / 2.
+        sourceIDs = numerix.searchsorted(source, middles) - 1
+        targetIDs = numerix.searchsorted(target, middles) - 1
+        both = ((sourceIDs >= 0) & (sourceIDs < len(source) - 1)
+                & (targetIDs >= 0) & (targetIDs < len(target) - 1))
+
+        return sparse.csr_matrix((numerix.diff(breaks)[both], (targetIDs[both], sourceIDs[both])),
+                                 shape=(len(target) - 1, len(source) - 1))
+
+    def _overlapMatrix(self, sourceMesh, targetMesh):
+        from scipy import sparse
+
+        overlaps = [self._overlapLengths(source, target)
+                    for source, target in zip(self._edges(sourceMesh), self._edges(targetMesh))]
+
+        # x varies fastest, so it is the innermost factor
+        volumes = overlaps[0]
+        for overlap in overlaps[1:]:
+            volumes = sparse.kron(overlap, volumes)
+
+        return sparse.diags(1. / numerix.array(targetMesh.cellVolumes)) * sparse.csr_matrix(volumes)
+
+    def __call__(self, var):
+        """Transfer `var` to `targetMesh`
+
+        Parameters
+        ----------
+        var : ~fipy.variables.cellVariable.CellVariable
+            A variable on `sourceMesh`
+
+        Returns
+        -------
+        ~fipy.variables.cellVariable.CellVariable
+        """
+        from fipy.variables.cellVariable import CellVariable
+
+        value = PointInterpolator.__call__(self, var)
+        return CellVariable(mesh=self.targetMesh, name=var.name, value=value,
+                            elementshape=value.shape[:-1], unit=var.unit)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
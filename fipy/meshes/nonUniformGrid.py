@@ -0,0 +1,234 @@
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+from builtins import zip
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+
+__all__ = ["NonUniformGrid"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class _LazyGeometry(object):
+    """Geometry that is only calculated when it is first used
+
+    `calc` returns the values of all of `names`, which are then stored on
+    the mesh, where they hide this (non-data) descriptor. The stored
+    arrays can be reassigned or modified in place, just as the arrays
+    stored by :meth:`~fipy.meshes.mesh.Mesh._setGeometry`.
+    """
+    def __init__(self, calc, names, name):
+        self.calc = calc
+        self.names = names
+        self.name = name
+
+    def __get__(self, mesh, cls=None):
+        if mesh is None:
+            return self
+
+        values = self.calc(mesh)
+        if len(self.names) == 1:
+            values = (values,)
+        for name, value in zip(self.names, values):
+            # don't overwrite a sibling that has already been assigned
+            mesh.__dict__.setdefault(name, value)
+
+        return mesh.__dict__[self.name]
+
+def _lazy(calc, *names):
+    descriptors = tuple(_LazyGeometry(calc, names, name) for name in names)
+    if len(descriptors) == 1:
+        return descriptors[0]
+    return descriptors
+
+class NonUniformGrid(object):
+    """Geometry of rectilinear grids, calculated when needed
+
+    A :class:`~fipy.meshes.mesh.Mesh` calculates and stores every
+    geometric array as soon as it is created. For a grid, most of those
+    arrays are tensor products of the vertex positions along each axis,
+    so they can be calculated in closed form, and only the arrays that
+    are actually used need ever be calculated at all.
+
+    Faces and cells must be numbered as :class:`~fipy.meshes.nonUniformGrid2D.NonUniformGrid2D`
+    and :class:`~fipy.meshes.nonUniformGrid3D.NonUniformGrid3D` number them.
+
+        >>> from fipy import *
+        >>> mesh = Grid2D(dx=(1., 2., 3.), dy=(1., 0.5))
+        >>> print("_cellVolumes" in mesh.__dict__)
+        False
+        >>> print(mesh.cellVolumes)
+        [ 1.   2.   3.   0.5  1.   1.5]
+        >>> print("_cellVolumes" in mesh.__dict__)
+        True
+    """
+
+    _faceCenters = _lazy(lambda s: s._calcFaceCenters(), "_faceCenters")
+    _faceAreas = _lazy(lambda s: s._calcFaceAreas(), "_faceAreas")
+    _cellCenters = _lazy(lambda s: s._calcCellCenters(), "_cellCenters")
+    (_internalFaceToCellDistances,
+     _cellToFaceDistanceVectors) = _lazy(lambda s: s._calcFaceToCellDistAndVec(),
+                                         "_internalFaceToCellDistances",
+                                         "_cellToFaceDistanceVectors")
+    (_internalCellDistances,
+     _cellDistanceVectors) = _lazy(lambda s: s._calcCellDistAndVec(),
+                                   "_internalCellDistances",
+                                   "_cellDistanceVectors")
+    faceNormals = _lazy(lambda s: s._calcFaceNormals(), "faceNormals")
+    _orientedFaceNormals = _lazy(lambda s: s._calcOrientedFaceNormals(), "_orientedFaceNormals")
+    _cellVolumes = _lazy(lambda s: s._calcCellVolumes(), "_cellVolumes")
+    _faceCellToCellNormals = _lazy(lambda s: s._calcFaceCellToCellNormals(), "_faceCellToCellNormals")
+    (_faceTangents1,
+     _faceTangents2) = _lazy(lambda s: s._calcFaceTangents(),
+                             "_faceTangents1", "_faceTangents2")
+    _cellToCellDistances = _lazy(lambda s: s._calcCellToCellDist(), "_cellToCellDistances")
+    _cellAreas = _lazy(lambda s: s._calcCellAreas(), "_cellAreas")
+    _cellNormals = _lazy(lambda s: s._calcCellNormals(), "_cellNormals")
+
+    _geometryNames = ("_faceCenters", "_faceAreas", "_cellCenters",
+                      "_internalFaceToCellDistances", "_cellToFaceDistanceVectors",
+                      "_internalCellDistances", "_cellDistanceVectors",
+                      "faceNormals", "_orientedFaceNormals", "_cellVolumes",
+                      "_faceCellToCellNormals", "_faceTangents1", "_faceTangents2",
+                      "_cellToCellDistances", "_cellAreas", "_cellNormals")
+
+    # scaled values are calculated with the scale in effect when they
+    # were last set, just as if they had been stored then
+    _scaledFaceAreas = _lazy(lambda s: s._scaledScale['area'] * s._faceAreas, "_scaledFaceAreas")
+    _scaledCellVolumes = _lazy(lambda s: s._scaledScale['volume'] * s._cellVolumes, "_scaledCellVolumes")
+    _scaledCellCenters = _lazy(lambda s: s._scaledScale['length'] * s._cellCenters, "_scaledCellCenters")
+    _scaledFaceToCellDistances = _lazy(lambda s: s._scaledScale['length'] * s._faceToCellDistances,
+                                       "_scaledFaceToCellDistances")
+    _scaledCellDistances = _lazy(lambda s: s._scaledScale['length'] * s._cellDistances, "_scaledCellDistances")
+
+    _scaledNames = ("_scaledFaceAreas", "_scaledCellVolumes", "_scaledCellCenters",
+                    "_scaledFaceToCellDistances", "_scaledCellDistances")
+
+    _scaledCellToCellDistances = _lazy(lambda s: s._faceDependentScale * s._cellToCellDistances,
+                                       "_scaledCellToCellDistances")
+    _areaProjections = _lazy(lambda s: s._calcAreaProjections(), "_areaProjections")
+    _orientedAreaProjections = _lazy(lambda s: s._calcOrientedAreaProjections(), "_orientedAreaProjections")
+    _faceToCellDistanceRatio = _lazy(lambda s: s._calcFaceToCellDistanceRatio(), "_faceToCellDistanceRatio")
+    _faceAspectRatios = _lazy(lambda s: s._calcFaceAspectRatios(), "_faceAspectRatios")
+
+    _faceDependentNames = ("_scaledCellToCellDistances", "_areaProjections",
+                           "_orientedAreaProjections", "_faceToCellDistanceRatio",
+                           "_faceAspectRatios")
+
+    def _discard(self, names):
+        for name in names:
+            self.__dict__.pop(name, None)
+
+    def _materialize(self, names):
+        for name in names:
+            getattr(self, name)
+
+    def _calcEdges(self):
+        """Return the vertex positions along each axis
+        """
+        # vertices are numbered with x varying fastest
+        counts = (self.nx, self.ny)[:self.dim - 1]
+        shape = (-1,) + tuple(n + 1 for n in counts[::-1])
+        vertexCoords = numerix.array(self.vertexCoords).reshape((self.dim,) + shape)
+        if vertexCoords.size == 0:
+            # a partition with no cells
+            return [numerix.zeros((0,), 'd')] * self.dim
+        edges = []
+        for axis in range(self.dim):
+            index = [0] * self.dim
+            index[self.dim - 1 - axis] = slice(None)
+            edges.append(vertexCoords[(axis,) + tuple(index)])
+        return edges
+
+    @staticmethod
+    def _tensor(*axes):
+        """Return the `(D, N)` tensor product of `axes`, with the first axis varying fastest
+
+            >>> print(NonUniformGrid._tensor((1., 2.), (3., 4., 5.)))
+            [[ 1.  2.  1.  2.  1.  2.]
+             [ 3.  3.  4.  4.  5.  5.]]
+        """
+        grids = numerix.meshgrid(*axes[::-1], indexing='ij')
+        return numerix.array([grid.ravel() for grid in grids[::-1]])
+
+    @property
+    def _centers(self):
+        return [(edges[:-1] + edges[1:]) / 2. for edges in self._edges]
+
+    @property
+    def _spacings(self):
+        return [numerix.diff(edges) for edges in self._edges]
+
+    def _faceGroups(self, normal, other):
+        """Return the tensor products for the faces normal to each axis
+
+        Faces are numbered by the axis they are normal to, from last to
+        first, i.e., horizontal faces before vertical faces in 2D.
+        `normal(axis)` and `other(axis)` return the values to take along
+        and across `axis`, respectively.
+        """
+        return [(axis, self._tensor(*[normal(i) if i == axis else other(i)
+                                      for i in range(self.dim)]))
+                for axis in range(self.dim)[::-1]]
+
+    def _calcFaceCenters(self):
+        groups = self._faceGroups(normal=lambda axis: self._edges[axis],
+                                  other=lambda axis: self._centers[axis])
+        return numerix.concatenate([group for axis, group in groups], axis=-1)
+
+    def _calcFaceAreas(self):
+        groups = self._faceGroups(normal=lambda axis: numerix.ones(len(self._edges[axis])),
+                                  other=lambda axis: self._spacings[axis])
+        return numerix.concatenate([numerix.prod(group, axis=0) for axis, group in groups])
+
+    def _calcFaceNormals(self):
+        def normal(axis):
+            # faces at the start of an axis point back along it
+            signs = numerix.ones(len(self._edges[axis]))
+            signs[:1] = -1.
+            return signs
+
+        groups = self._faceGroups(normal=normal,
+                                  other=lambda axis: numerix.ones(len(self._centers[axis])))
+        faceNormals = []
+        for axis, group in groups:
+            faceNormals.append(numerix.zeros(group.shape, 'd'))
+            faceNormals[-1][axis] = group[axis]
+        return numerix.concatenate(faceNormals, axis=-1)
+
+    def _calcCellCenters(self):
+        return self._tensor(*self._centers)
+
+    def _calcCellVolumes(self):
+        return numerix.prod(self._tensor(*self._spacings), axis=0)
+
+    def _setGeometry(self, scaleLength = 1.):
+        self._discard(self._geometryNames)
+        self._edges = self._calcEdges()
+
+        self._setScaledGeometry(self.scale['length'])
+
+    def _setScaledValues(self):
+        self._discard(self._scaledNames)
+        self._scaledScale = self._scale.copy()
+        self._setFaceDependentScaledValues()
+
+    def _setFaceDependentScaledValues(self):
+        self._discard(self._faceDependentNames)
+        self._faceDependentScale = self._scale['length']
+
+    def _connectFaces(self, faces0, faces1):
+        # calculate everything from the unconnected topology, as
+        # `Mesh` would have
+        self._materialize(self._geometryNames
+                          + self._scaledNames
+                          + self._faceDependentNames)
+        super(NonUniformGrid, self)._connectFaces(faces0, faces1)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -7,6 +7,7 @@ __docformat__ = 'restructuredtext'
 from fipy.tools import parallelComm
 
 from fipy.meshes.mesh2D import Mesh2D
+from fipy.meshes.nonUniformGrid import NonUniformGrid
 from fipy.meshes.builders import _NonuniformGrid2DBuilder
 from fipy.meshes.representations.gridRepresentation import _Grid2DRepresentation
 from fipy.meshes.topologies.gridTopology import _Grid2DTopology
@@ -15,7 +16,7 @@ __all__ = ["NonUniformGrid2D"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
-class NonUniformGrid2D(Mesh2D):
+class NonUniformGrid2D(NonUniformGrid, Mesh2D):
     """
     Creates a 2D grid mesh with horizontal faces numbered
     first and then vertical faces.
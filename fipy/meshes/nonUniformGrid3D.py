@@ -5,6 +5,7 @@ from fipy.tools import numerix
 from fipy.tools import parallelComm
 
 from fipy.meshes.mesh import Mesh
+from fipy.meshes.nonUniformGrid import NonUniformGrid
 from fipy.meshes.builders import _NonuniformGrid3DBuilder
 from fipy.meshes.representations.gridRepresentation import _Grid3DRepresentation
 from fipy.meshes.topologies.gridTopology import _Grid3DTopology
@@ -13,7 +14,7 @@ __all__ = ["NonUniformGrid3D"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
-class NonUniformGrid3D(Mesh):
+class NonUniformGrid3D(NonUniformGrid, Mesh):
     """
     3D rectangular-prism Mesh
 
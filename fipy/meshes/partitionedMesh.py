@@ -0,0 +1,367 @@
+"""Partition meshes for parallel solution without Gmsh
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+from fipy.tools import parallelComm, serialComm
+from fipy.meshes.mesh import Mesh
+from fipy.meshes.mesh2D import Mesh2D
+from fipy.meshes.gmshMesh import _GmshTopology
+
+__all__ = ["PartitionedMesh2D", "PartitionedMesh3D"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+def _cellAdjacency(mesh):
+    """Return the `(xadj, adjncy)` compressed graph of cells that share a face
+
+    This is the form of graph that METIS and Scotch partition.
+
+        >>> from fipy import Grid2D
+        >>> xadj, adjncy = _cellAdjacency(Grid2D(nx=3, ny=1))
+        >>> print(xadj)
+        [0 1 3 4]
+        >>> print(adjncy)
+        [1 2 0 1]
+    """
+    cellToCellIDs = MA.filled(mesh._cellToCellIDs, -1).swapaxes(0, 1)
+    neighbors = cellToCellIDs >= 0
+    xadj = numerix.concatenate([[0], numerix.cumsum(neighbors.sum(axis=1))])
+    return (numerix.array(xadj, dtype=numerix.INT_DTYPE),
+            numerix.array(cellToCellIDs[neighbors], dtype=numerix.INT_DTYPE))
+
+def _recursiveCoordinateBisection(xadj, adjncy, cellCenters, nparts):
+    """Partition cells by recursively bisecting their bounding boxes
+
+    Each box is cut across its longest side, in proportion to the number of
+    partitions that will be made on either side of the cut, so that
+    partitions are as nearly equal in size, and as compact, as the cells
+    allow. The graph of cells is not needed.
+
+        >>> from fipy import Grid2D
+        >>> mesh = Grid2D(nx=4, ny=4)
+        >>> print(_recursiveCoordinateBisection(None, None, mesh.cellCenters.value, 4).reshape((4, 4)))
+        [[0 0 2 2]
+         [0 0 2 2]
+         [1 1 3 3]
+         [1 1 3 3]]
+        >>> print(numerix.bincount(_recursiveCoordinateBisection(None, None, mesh.cellCenters.value, 3)))
+        [5 5 6]
+    """
+    cellCenters = numerix.asarray(cellCenters)
+    parts = numerix.zeros(cellCenters.shape[-1], dtype=numerix.INT_DTYPE)
+
+    def bisect(cells, first, nparts):
+        if nparts == 1 or len(cells) == 0:
+            parts[cells] = first
+            return
+
+        centers = cellCenters[..., cells]
+        axis = numerix.argmax(centers.max(axis=1) - centers.min(axis=1))
+        cells = cells[numerix.argsort(centers[axis], kind='mergesort')]
+        lower = nparts // 2
+        cut = len(cells) * lower // nparts
+        bisect(cells[:cut], first, lower)
+        bisect(cells[cut:], first + lower, nparts - lower)
+
+    bisect(numerix.arange(len(parts)), 0, nparts)
+
+    return parts
+
+def _metisPartition(xadj, adjncy, cellCenters, nparts):
+    """Partition the graph of cells with :term:`METIS`
+    """
+    import pymetis
+    cuts, membership = pymetis.part_graph(nparts, xadj=xadj, adjncy=adjncy)
+    return numerix.array(membership, dtype=numerix.INT_DTYPE)
+
+_partitioners = {
+    "rcb": _recursiveCoordinateBisection,
+    "metis": _metisPartition
+}
+
+def _partition(mesh, nparts, partitioner=None):
+    """Return the partition that each cell of `mesh` belongs to
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.abstractMesh.AbstractMesh
+        The complete, serial mesh to partition.
+    nparts : int
+        The number of partitions.
+    partitioner : str or callable, optional
+        "rcb" for recursive coordinate bisection, "metis" for
+        :term:`METIS` (requires `pymetis`), or a function taking
+        `(xadj, adjncy, cellCenters, nparts)` and returning the
+        partition of each cell, e.g., to use Scotch. By default,
+        :term:`METIS` is used if it is available and recursive coordinate
+        bisection is used otherwise.
+
+        >>> from fipy import Grid2D
+        >>> print(_partition(Grid2D(nx=4, ny=1), 2, partitioner="rcb"))
+        [0 0 1 1]
+        >>> print(_partition(Grid2D(nx=4, ny=1), 2, partitioner="ncut"))
+        Traceback (most recent call last):
+        ...
+        ValueError: Unknown partitioner: ncut
+    """
+    if nparts == 1:
+        return numerix.zeros(mesh.numberOfCells, dtype=numerix.INT_DTYPE)
+
+    if partitioner is None:
+        try:
+            import pymetis
+            partitioner = "metis"
+        except ImportError:
+            partitioner = "rcb"
+
+    if not callable(partitioner):
+        try:
+            partitioner = _partitioners[partitioner]
+        except KeyError:
+            raise ValueError("Unknown partitioner: %s" % partitioner)
+
+    xadj, adjncy = _cellAdjacency(mesh)
+    return numerix.asarray(partitioner(xadj, adjncy, mesh.cellCenters.value, nparts))
+
+def _localCells(mesh, parts, part, overlap):
+    """Return the cells of `part` and the `overlap` layers of cells around them
+
+    Cells that share a face are neighbors.
+
+        >>> from fipy import Grid2D
+        >>> mesh = Grid2D(nx=4, ny=4)
+        >>> parts = _partition(mesh, 4, partitioner="rcb")
+        >>> cells, ghosts = _localCells(mesh, parts, 3, overlap=1)
+        >>> print(cells)
+        [10 11 14 15]
+        >>> print(ghosts)
+        [ 6  7  9 13]
+        >>> cells, ghosts = _localCells(mesh, parts, 3, overlap=2)
+        >>> print(ghosts)
+        [ 2  3  5  6  7  8  9 12 13]
+    """
+    cellToCellIDs = MA.filled(mesh._cellToCellIDs, -1)
+    owned = parts == part
+    overlapping = owned.copy()
+    frontier = numerix.nonzero(owned)[0]
+    for layer in range(overlap):
+        neighbors = cellToCellIDs[..., frontier].ravel()
+        neighbors = numerix.unique(neighbors[neighbors >= 0])
+        frontier = neighbors[~overlapping[neighbors]]
+        overlapping[frontier] = True
+
+    return (numerix.nonzero(owned)[0],
+            numerix.nonzero(overlapping & ~owned)[0])
+
+def _extractCells(mesh, cells):
+    """Return the vertices, faces, and cells needed to make a mesh of `cells`
+
+    Faces and vertices keep the order they have in `mesh`.
+
+        >>> from fipy import Grid2D
+        >>> vertexCoords, faceVertexIDs, cellFaceIDs = _extractCells(Grid2D(nx=2, ny=2), [3])
+        >>> print(vertexCoords)
+        [[ 1.  2.  1.  2.]
+         [ 1.  1.  2.  2.]]
+        >>> print(faceVertexIDs)
+        [[0 2 0 1]
+         [1 3 2 3]]
+        >>> print(cellFaceIDs)
+        [[0]
+         [3]
+         [1]
+         [2]]
+    """
+    cellFaceIDs = MA.filled(mesh.cellFaceIDs, -1)[..., cells]
+    faces = numerix.unique(cellFaceIDs[cellFaceIDs >= 0])
+    faceVertexIDs = MA.filled(mesh.faceVertexIDs, -1)[..., faces]
+    vertices = numerix.unique(faceVertexIDs[faceVertexIDs >= 0])
+
+    def renumber(IDs, kept):
+        return MA.masked_values(numerix.where(IDs >= 0,
+                                              numerix.searchsorted(kept, IDs),
+                                              -1),
+                                -1)
+
+    return (numerix.array(mesh.vertexCoords)[..., vertices],
+            renumber(faceVertexIDs, vertices),
+            renumber(cellFaceIDs, faces))
+
+def _partitionMesh(mesh, communicator, overlap, partitioner):
+    """Return the local part of `mesh`, in the form that :class:`~fipy.meshes.gmshMesh.MSHFile` reads
+    """
+    if mesh.numberOfCells != mesh.globalNumberOfCells:
+        raise ValueError("Only serial meshes can be partitioned; create the mesh with `communicator=serialComm`")
+
+    # every processor makes the same, deterministic, partition
+    parts = _partition(mesh, communicator.Nproc, partitioner=partitioner)
+
+    cells, ghosts = _localCells(mesh, parts, communicator.procID, overlap=overlap)
+    verts, faces, cellFaces = _extractCells(mesh, numerix.concatenate([cells, ghosts]))
+
+    return verts, faces, cellFaces, cells.tolist(), ghosts.tolist()
+
+class PartitionedMesh2D(Mesh2D):
+    """Partition a 2D mesh among the processors of `communicator`
+
+    The "``...Grid...``" meshes are divided among processors in slabs,
+    regardless of their shape. Any mesh, created with `serialComm`, can
+    instead be divided into compact partitions by :term:`METIS` (if
+    `pymetis` is installed) or by recursive coordinate bisection, with
+    `overlap` layers of ghost cells around each partition.
+
+        >>> from fipy import *
+        >>> mesh = Grid2D(nx=4, ny=4, communicator=serialComm)
+        >>> from fipy.tools.comms.dummyComm import DummyComm
+        >>> class Rank3of4(DummyComm):
+        ...     procID = property(lambda self: 3)
+        ...     Nproc = property(lambda self: 4)
+        >>> part = PartitionedMesh2D(mesh, communicator=Rank3of4(), overlap=1, partitioner="rcb")
+
+    The cells owned by this processor come first, followed by the ghost
+    cells
+
+        >>> print(part._globalNonOverlappingCellIDs)
+        [10 11 14 15]
+        >>> print(part._globalOverlappingCellIDs)
+        [10 11 14 15  6  7  9 13]
+        >>> print(part._localNonOverlappingCellIDs)
+        [0 1 2 3]
+        >>> print(part.globalNumberOfCells)
+        16
+        >>> print(numerix.allclose(part.cellCenters,
+        ...                        mesh.cellCenters[..., part._globalOverlappingCellIDs]))
+        True
+        >>> print(numerix.allclose(part.cellVolumes,
+        ...                        mesh.cellVolumes[part._globalOverlappingCellIDs]))
+        True
+
+    On a single processor, the partitioned mesh solves the same problems
+    as the original mesh
+
+        >>> mesh = Grid2D(nx=5, ny=3, dx=0.5, communicator=serialComm)
+        >>> part = PartitionedMesh2D(mesh, communicator=serialComm)
+        >>> solutions = []
+        >>> for m in (mesh, part):
+        ...     var = CellVariable(mesh=m)
+        ...     var.constrain(0., where=m.facesLeft)
+        ...     var.constrain(1., where=m.facesRight)
+        ...     DiffusionTerm().solve(var=var)
+        ...     solutions.append(var.value)
+        >>> print(numerix.allclose(solutions[0], solutions[1], atol=1e-6))
+        True
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.abstractMesh.AbstractMesh
+        The complete 2D mesh, created with `communicator=serialComm`.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        The processors to partition `mesh` among.
+    overlap : int
+        The number of layers of ghost cells around each partition.
+    partitioner : str or callable, optional
+        "rcb" for recursive coordinate bisection, "metis" for
+        :term:`METIS`, or a function taking `(xadj, adjncy, cellCenters,
+        nparts)` and returning the partition of each cell, e.g., to use
+        Scotch. By default, :term:`METIS` is used if `pymetis` is
+        available and recursive coordinate bisection is used otherwise.
+    """
+    def __init__(self, mesh, communicator=parallelComm, overlap=2, partitioner=None):
+        (verts,
+         faces,
+         cells,
+         self.cellGlobalIDs,
+         self.gCellGlobalIDs) = _partitionMesh(mesh,
+                                               communicator=communicator,
+                                               overlap=overlap,
+                                               partitioner=partitioner)
+
+        self.globalNumberOfCells = mesh.numberOfCells
+        self.globalNumberOfFaces = mesh.numberOfFaces
+
+        Mesh2D.__init__(self, vertexCoords=verts,
+                              faceVertexIDs=faces,
+                              cellFaceIDs=cells,
+                              communicator=communicator,
+                              _TopologyClass=_GmshTopology)
+
+    def __setstate__(self, state):
+        super(PartitionedMesh2D, self).__setstate__(state)
+        self.cellGlobalIDs = list(numerix.arange(self.cellFaceIDs.shape[-1]))
+        self.gCellGlobalIDs = []
+        self.communicator = serialComm
+
+class PartitionedMesh3D(Mesh):
+    """Partition a 3D mesh among the processors of `communicator`
+
+    Compact partitions have less surface, and so fewer ghost cells to
+    communicate, than slabs of the same volume
+
+        >>> from fipy import *
+        >>> mesh = Grid3D(nx=8, ny=8, nz=8, communicator=serialComm)
+        >>> from fipy.tools.comms.dummyComm import DummyComm
+        >>> class Rank0of8(DummyComm):
+        ...     Nproc = property(lambda self: 8)
+        >>> part = PartitionedMesh3D(mesh, communicator=Rank0of8(), overlap=1, partitioner="rcb")
+        >>> print(len(part._globalNonOverlappingCellIDs))
+        64
+        >>> print(len(part.gCellGlobalIDs))
+        48
+        >>> print(numerix.allclose(part.cellCenters,
+        ...                        mesh.cellCenters[..., part._globalOverlappingCellIDs]))
+        True
+
+    whereas a slab of 64 cells would have 64 ghost cells in each layer on
+    each of its two sides.
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.abstractMesh.AbstractMesh
+        The complete 3D mesh, created with `communicator=serialComm`.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        The processors to partition `mesh` among.
+    overlap : int
+        The number of layers of ghost cells around each partition.
+    partitioner : str or callable, optional
+        "rcb" for recursive coordinate bisection, "metis" for
+        :term:`METIS`, or a function taking `(xadj, adjncy, cellCenters,
+        nparts)` and returning the partition of each cell, e.g., to use
+        Scotch. By default, :term:`METIS` is used if `pymetis` is
+        available and recursive coordinate bisection is used otherwise.
+    """
+    def __init__(self, mesh, communicator=parallelComm, overlap=2, partitioner=None):
+        (verts,
+         faces,
+         cells,
+         self.cellGlobalIDs,
+         self.gCellGlobalIDs) = _partitionMesh(mesh,
+                                               communicator=communicator,
+                                               overlap=overlap,
+                                               partitioner=partitioner)
+
+        self.globalNumberOfCells = mesh.numberOfCells
+        self.globalNumberOfFaces = mesh.numberOfFaces
+
+        Mesh.__init__(self, vertexCoords=verts,
+                            faceVertexIDs=faces,
+                            cellFaceIDs=cells,
+                            communicator=communicator,
+                            _TopologyClass=_GmshTopology)
+
+    def __setstate__(self, state):
+        super(PartitionedMesh3D, self).__setstate__(state)
+        self.cellGlobalIDs = list(numerix.arange(self.cellFaceIDs.shape[-1]))
+        self.gCellGlobalIDs = []
+        self.communicator = serialComm
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,154 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+__all__ = ["PointInterpolator"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class PointInterpolator(object):
+    r"""Interpolates `CellVariable` objects to a fixed set of points
+
+    The cells that contain the points are located, and the interpolation
+    weights are assembled into a sparse matrix, once. Each interpolation
+    is then a single matrix-vector product, which makes repeated probing
+    at fixed locations, e.g., at every time step, cheap.
+
+    >>> from fipy import *
+    >>> mesh = Tri2D(nx=2, ny=2)
+    >>> x, y = mesh.cellCenters
+    >>> var = CellVariable(mesh=mesh, value=2 * x + 3 * y)
+    >>> points = ((0.3, 1.2, 1.9),
+    ...           (0.5, 1.1, 0.2))
+    >>> probes = PointInterpolator(mesh=mesh, points=points)
+    >>> print(probes.cellIDs)
+    [ 8 15  1]
+
+    The result is the same as the first-order
+    :meth:`~fipy.variables.cellVariable.CellVariable.__call__`
+
+    >>> print(numerix.allclose(probes(var),
+    ...                        var(points, order=1, nearestCellIDs=probes.cellIDs)))
+    True
+
+    and the weights do not change when the variable does
+
+    >>> var.value = x - y
+    >>> print(numerix.allclose(probes(var),
+    ...                        var(points, order=1, nearestCellIDs=probes.cellIDs)))
+    True
+
+    Away from boundaries, a linear field on a grid is recovered exactly
+
+    >>> mesh = Grid2D(nx=4, ny=4)
+    >>> probes = PointInterpolator(mesh=mesh, points=((1.3, 2.2), (1.7, 2.9)))
+    >>> print(probes(mesh.x - mesh.y))
+    [-0.4 -0.7]
+
+    Vector variables are interpolated component by component
+
+    >>> print(probes(mesh.cellCenters))
+    [[ 1.3  2.2]
+     [ 1.7  2.9]]
+
+    Points are assigned to the cell that contains them, not the cell
+    with the nearest center, which can differ on non-uniform meshes
+
+    >>> mesh = Grid2D(dx=(.1, 10.), dy=(1.,))
+    >>> var = CellVariable(mesh=mesh, value=mesh.cellCenters[0])
+    >>> print(var(((1.,), (0.5,)), order=0))
+    [ 0.05]
+    >>> print(PointInterpolator(mesh=mesh, points=((1.,), (0.5,)), order=0)(var))
+    [ 5.1]
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.mesh.Mesh
+        The mesh to interpolate from
+    points : array_like
+        `(D, M)` coordinates of the points to interpolate to
+    order : {`0`, `1`}
+        The order of interpolation. `0` takes the value of the containing
+        cell. `1` adds the cell gradient, as
+        :meth:`~fipy.variables.cellVariable.CellVariable.__call__` does,
+        but ignores any constraints on the variable.
+    """
+
+    def __init__(self, mesh, points, order=1):
+        if mesh.communicator.Nproc > 1:
+            raise NotImplementedError("PointInterpolator does not support partitioned meshes")
+        if order not in (0, 1):
+            raise ValueError('order should be either 0 or 1')
+
+        self.mesh = mesh
+        self.points = numerix.array(points, dtype=float).reshape((mesh.dim, -1))
+        self.order = order
+        self.cellIDs = numerix.asarray(mesh._locateCells(self.points))
+
+        rows, cols, weights = self._weights()
+
+        from scipy import sparse
+        self.matrix = sparse.csr_matrix((weights, (rows, cols)),
+                                        shape=(self.points.shape[-1], mesh.numberOfCells))
+
+    def _weights(self):
+        """Return the rows, columns and values of the interpolation matrix
+        """
+        M = self.points.shape[-1]
+        rows = numerix.arange(M)
+        cols = self.cellIDs
+        weights = numerix.ones(M)
+
+        if self.order == 1:
+            # value(p) = value[c] + (p - x_c) . grad[c], where the Gauss
+            # gradient sums the arithmetic face values of `c`
+            mesh = self.mesh
+            cells = self.cellIDs
+            faces = MA.filled(mesh.cellFaceIDs, 0)[..., cells]
+            outward = MA.filled(mesh._cellToFaceOrientations, 0)[..., cells]
+
+            offsets = self.points - numerix.array(mesh.cellCenters.globalValue)[..., cells]
+            areaProjections = numerix.array(mesh._areaProjections)[..., faces]
+            contributions = (outward * (areaProjections * offsets[:, numerix.newaxis, :]).sum(axis=0)
+                             / numerix.array(mesh.cellVolumes)[cells])
+
+            alpha = numerix.array(mesh._faceToCellDistanceRatio)[faces]
+            id1, id2 = [numerix.array(ids)[faces] for ids in mesh._adjacentCellIDs]
+            faceRows = numerix.resize(rows, faces.shape)
+
+            rows = numerix.concatenate((rows, faceRows.ravel(), faceRows.ravel()))
+            cols = numerix.concatenate((cols, id1.ravel(), id2.ravel()))
+            weights = numerix.concatenate((weights,
+                                           (contributions * (1 - alpha)).ravel(),
+                                           (contributions * alpha).ravel()))
+
+        return rows, cols, weights
+
+    def __call__(self, var):
+        """Interpolate `var` to the points
+
+        Parameters
+        ----------
+        var : ~fipy.variables.cellVariable.CellVariable
+            A variable on `mesh`
+
+        Returns
+        -------
+        ndarray
+            Values at the points, of shape `var.shape[:-1] + (M,)`
+        """
+        value = numerix.array(var.globalValue)
+        elementshape = value.shape[:-1]
+        value = value.reshape((-1, value.shape[-1]))
+        return (self.matrix * value.swapaxes(0, 1)).swapaxes(0, 1).reshape(elementshape + (-1,))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
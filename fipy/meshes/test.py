@@ -11,6 +11,7 @@ def _suite():
     return _LateImportDocTestSuite(docTestModuleNames = (
         'fipy.meshes.mesh',
         'fipy.meshes.mesh2D',
+        'fipy.meshes.nonUniformGrid',
         'fipy.meshes.nonUniformGrid1D',
         'fipy.meshes.nonUniformGrid2D',
         'fipy.meshes.nonUniformGrid3D',
@@ -30,6 +31,9 @@ def _suite():
         'fipy.meshes.sphericalNonUniformGrid1D',
         'fipy.meshes.factoryMeshes',
         'fipy.meshes.abstractMesh',
+        'fipy.meshes.pointInterpolator',
+        'fipy.meshes.meshInterpolator',
+        'fipy.meshes.partitionedMesh',
         'fipy.meshes.representations.gridRepresentation'))
 
 if __name__ == '__main__':
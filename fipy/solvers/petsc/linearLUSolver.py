@@ -51,6 +51,7 @@ class LinearLUSolver(PETScSolver):
                 tol0 = tol
                 
             if (tol / tol0) <= self.tolerance:
+                self._solvedResidualNorm = tol
                 break
                 
             xError = x.copy()
@@ -5,6 +5,7 @@ import os
 from petsc4py import PETSc
 
 from fipy.solvers.petsc.petscSolver import PETScSolver
+from fipy.tools.instrumentation import _Timer, _count, _instrumenting
 
 __all__ = ["PETScKrylovSolver"]
 
@@ -37,12 +38,27 @@ class PETScKrylovSolver(PETScSolver):
 
     """
       
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None,
+                 reuse=False, rebuildInterval=None, rebuildFactor=None):
         """
         :Parameters:
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
           - `precon`: Preconditioner to use (string). 
+          - `reuse`: Keep the PETSc `KSP` and its preconditioner alive
+            between calls to `solve()` or `sweep()` for as long as the
+            nonzero pattern of the matrix is unchanged.  The
+            preconditioner is then only set up again according to
+            `rebuildInterval` and `rebuildFactor`.  Changes to
+            `tolerance` and `iterations` still apply to the next solve.
+            Turning `reuse` off releases the `KSP`.
+          - `rebuildInterval`: If `reuse`, set up the preconditioner
+            again every `rebuildInterval` solves (`None` means never,
+            until the nonzero pattern changes).
+          - `rebuildFactor`: If `reuse`, set up the preconditioner again
+            once the number of iterations exceeds `rebuildFactor` times
+            the number taken by the first solve with the current
+            preconditioner.
 
         """
         if self.__class__ is PETScKrylovSolver:
@@ -51,18 +67,117 @@ class PETScKrylovSolver(PETScSolver):
         PETScSolver.__init__(self, tolerance=tolerance,
                              iterations=iterations, precon=precon)
 
-    def _solve_(self, L, x, b):
+        self.reuse = reuse
+        self.rebuildInterval = rebuildInterval
+        self.rebuildFactor = rebuildFactor
+
+        self._ksp = None
+        self._pattern = None
+        self._tolerances = None
+        self._solvesSinceRebuild = 0
+        self._referenceIterations = None
+        self._degraded = False
+
+    @property
+    def reuse(self):
+        return self._reuse
+
+    @reuse.setter
+    def reuse(self, reuse):
+        self._reuse = reuse
+        if not reuse:
+            self._destroyKSP()
+
+    def _createKSP(self, L):
         ksp = PETSc.KSP()
         ksp.create(L.comm)
         ksp.setType(self.solver)
         if self.preconditioner is not None:
             ksp.getPC().setType(self.preconditioner)
         ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
-        L.assemble()
         ksp.setOperators(L)
         ksp.setFromOptions()
+
+        return ksp
+
+    @staticmethod
+    def _nonzeroPattern(L):
+        info = L.getInfo(PETSc.Mat.InfoType.GLOBAL_SUM)
+        return (L.getSizes(), info["nz_used"])
+
+    def _destroyKSP(self):
+        if getattr(self, "_ksp", None) is not None:
+            self._ksp.destroy()
+            self._ksp = None
+        self._pattern = None
+        self._tolerances = None
+
+    def _reusedKSP(self, L):
+        """Obtain a `KSP` for `L`, preserving the previous one (and its
+        preconditioner) if the nonzero pattern of `L` has not changed.
+        """
+        pattern = self._nonzeroPattern(L)
+
+        tolerances = (self.tolerance, self.iterations)
+
+        if self._ksp is None or pattern != self._pattern:
+            self._destroyKSP()
+            self._ksp = self._createKSP(L)
+            self._pattern = pattern
+            rebuild = True
+        else:
+            rebuild = (self._degraded
+                       or (self.rebuildInterval is not None
+                           and self._solvesSinceRebuild >= self.rebuildInterval))
+            self._ksp.setOperators(L)
+            if tolerances != self._tolerances:
+                # e.g., the tolerance of each sweep of `Term.sweepUntil()`,
+                # but leave any set by PETSc options alone otherwise
+                self._ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
+
+        self._tolerances = tolerances
+
+        self._ksp.getPC().setReusePreconditioner(not rebuild)
+
+        if rebuild:
+            self._solvesSinceRebuild = 0
+            self._referenceIterations = None
+            self._degraded = False
+
+        return self._ksp
+
+    def _updateReuseStatistics(self, ksp):
+        self._solvesSinceRebuild += 1
+
+        if self._referenceIterations is None:
+            self._referenceIterations = max(ksp.its, 1)
+        elif (self.rebuildFactor is not None
+              and ksp.its > self.rebuildFactor * self._referenceIterations):
+            self._degraded = True
+
+    def _solve_(self, L, x, b):
+        L.assemble()
+
+        if self.reuse:
+            ksp = self._reusedKSP(L)
+        else:
+            ksp = self._createKSP(L)
+
+        ksp.setInitialGuessNonzero(self._warmStart)
+
+        with _Timer(self, 'precondition'):
+            ksp.setUp()
+
         ksp.solve(b, x)
 
+        if ksp.getNormType() == PETSc.KSP.NormType.UNPRECONDITIONED:
+            # only the true residual norm is comparable to `_calcResidual()`
+            self._solvedResidualNorm = ksp.norm
+
+        if _instrumenting():
+            _count(self, 'solve', iterations=ksp.its,
+                   nnz=int(L.getInfo(PETSc.Mat.InfoType.GLOBAL_SUM)['nz_used']))
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
 #             L.view()
@@ -73,3 +188,17 @@ class PETScKrylovSolver(PETScSolver):
             PRINT('iterations: %d / %d' % (ksp.its, self.iterations))
             PRINT('norm:', ksp.norm)
             PRINT('norm_type:', ksp.norm_type)
+            if self.reuse:
+                PRINT('solves since preconditioner setup:', self._solvesSinceRebuild)
+
+        if self.reuse:
+            self._updateReuseStatistics(ksp)
+        else:
+            ksp.destroy()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._destroyKSP()
+
+    def __del__(self):
+        self._destroyKSP()
+        super(PETScKrylovSolver, self).__del__()
@@ -63,6 +63,9 @@ class PETScSolver(Solver):
         value = self.matrix._petsc2fipyGhost(vec=overlappingVector)
         self.var.value = numerix.reshape(value, self.var.shape)
         
+        if self._reportSolvedResidual:
+            self._calcSolvedResidual()
+
         self._deleteGlobalMatrixAndVectors()
         del self.var
         del self.RHSvector
@@ -100,8 +103,24 @@ class PETScSolver(Solver):
             residual.destroy()
             return norm
         
+    def _calcResidualVectorAndNorm(self, residualFn=None):
+        if residualFn is not None:
+            residual = residualFn(self.var, self.matrix, self.RHSvector)
+            return residual, residual
+        else:
+            comm = self.var.mesh.communicator
+            residual = self._calcResidualVector_()
+            norm = comm.Norm2(residual)
+
+            residual.ghostUpdate()
+            with residual.localForm() as lf:
+                arr = numerix.array(lf)
+            residual.destroy()
+            return arr, norm
+
     def _calcRHSNorm(self):
-        return self.nonOverlappingRHSvector.Norm2()
+        globalMatrix, overlappingVector, overlappingRHSvector = self._globalMatrixAndVectors
+        return overlappingRHSvector.norm()
 
     def __del__(self):
         if hasattr(self, "globalVectors"):
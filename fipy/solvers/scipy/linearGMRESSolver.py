@@ -29,3 +29,6 @@ class LinearGMRESSolver(_ScipyKrylovSolver):
 
         super(LinearGMRESSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
         self.solveFnc = gmres
+
+    # count every inner iteration
+    _callbackArguments = {'callback_type': 'pr_norm'}
@@ -3,12 +3,15 @@ from __future__ import unicode_literals
 from builtins import range
 __docformat__ = 'restructuredtext'
 
+from collections import OrderedDict
+import hashlib
 import os
 
 from scipy.sparse.linalg import splu
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
 from fipy.tools import numerix
+from fipy.tools.instrumentation import _Timer, _count
 
 __all__ = ["LinearLUSolver"]
 from future.utils import text_to_native_str
@@ -19,34 +22,146 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` module.
+
+    Factorizations are cached, keyed on a digest of the matrix, so that
+    solving an unchanged matrix again (e.g., a linear problem with
+    constant coefficients and a constant time step) skips straight to
+    the back substitution. The cache is shared by every `LinearLUSolver`
+    in the process, so that a new solver for each step still finds the
+    factorizations of its predecessors. It holds the most recently used
+    factorizations, up to `LinearLUSolver.factorizationCacheSize` bytes
+    in total. This size is a process-wide setting, so assign it on the
+    class, not on an instance. Set it to `0` to disable caching and
+    release any factorizations that are already held.
     """
 
+    factorizationCacheSize = 256 * 2**20
+
+    _factorizations = OrderedDict()
+
+    @staticmethod
+    def _fingerprint(matrix):
+        digest = hashlib.sha1()
+        for arr in (matrix.indptr, matrix.indices, matrix.data):
+            digest.update(numerix.ascontiguousarray(arr))
+        return (matrix.shape, matrix.dtype.str, matrix.nnz, digest.hexdigest())
+
+    @staticmethod
+    def _factorizationSize(LU):
+        return (LU.L.data.nbytes + LU.L.indices.nbytes
+                + LU.U.data.nbytes + LU.U.indices.nbytes
+                + LU.perm_r.nbytes + LU.perm_c.nbytes)
+
+    def _factorize(self, L):
+        return splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
+                                              relax=1,
+                                              panel_size=10,
+                                              permc_spec=3)
+
+    @staticmethod
+    def _evictFactorizations():
+        cache = LinearLUSolver._factorizations
+
+        total = sum(s for _, s in cache.values())
+        while cache and total > LinearLUSolver.factorizationCacheSize:
+            _, (_, s) = cache.popitem(last=False)
+            total -= s
+
+    def _cachedFactorization(self, L, key):
+        cache = LinearLUSolver._factorizations
+
+        if key in cache:
+            cache.move_to_end(key)
+            LU, size = cache[key]
+        else:
+            LU = self._factorize(L)
+            size = self._factorizationSize(LU)
+            cache[key] = (LU, size)
+
+        self._evictFactorizations()
+
+        return LU
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
 
+        if LinearLUSolver.factorizationCacheSize > 0:
+            key = self._fingerprint(L.matrix)
+        else:
+            self._evictFactorizations()
+            key = None
+
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        with _Timer(self, 'precondition'):
+            if key is None:
+                LU = self._factorize(L)
+            else:
+                LU = self._cachedFactorization(L, key)
 
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
         for iteration in range(min(self.iterations, 10)):
             errorVector = L * x - b
+            error = numerix.sqrt(numerix.sum(errorVector**2))
 
-            if (numerix.sqrt(numerix.sum(errorVector**2)) / error0)  <= self.tolerance:
+            if (error / error0)  <= self.tolerance:
+                # undo the scaling of the system
+                self._solvedResidualNorm = error * maxdiag
                 break
 
             xError = LU.solve(errorVector)
             x[:] = x - xError
 
+        _count(self, 'solve', iterations=iteration + 1, nnz=L.matrix.nnz)
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
             PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
             PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
 
         return x
+
+    def _test(self):
+        """
+        An unchanged matrix is only factored once
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> LinearLUSolver._factorizations.clear()
+        >>> mesh = Grid1D(nx=10)
+        >>> var = CellVariable(mesh=mesh, value=mesh.cellCenters[0])
+        >>> eq = TransientTerm() == DiffusionTerm(coeff=1.)
+        >>> for step in range(3):
+        ...     eq.solve(var=var, dt=1., solver=LinearLUSolver())
+        >>> print(len(LinearLUSolver._factorizations))
+        1
+        >>> print(numerix.allclose(var.cellVolumeAverage, 5.))
+        True
+
+        but a changed matrix is factored anew, with the oldest
+        factorizations evicted to keep within the cache size
+
+        >>> eq.solve(var=var, dt=2., solver=LinearLUSolver())
+        >>> print(len(LinearLUSolver._factorizations))
+        2
+        >>> defaultSize = LinearLUSolver.factorizationCacheSize
+        >>> LinearLUSolver.factorizationCacheSize = 1
+        >>> eq.solve(var=var, dt=3., solver=LinearLUSolver())
+        >>> print(len(LinearLUSolver._factorizations))
+        0
+
+        Disabling the cache releases whatever it still holds
+
+        >>> LinearLUSolver.factorizationCacheSize = defaultSize
+        >>> eq.solve(var=var, dt=3., solver=LinearLUSolver())
+        >>> print(len(LinearLUSolver._factorizations))
+        1
+        >>> LinearLUSolver.factorizationCacheSize = 0
+        >>> eq.solve(var=var, dt=4., solver=LinearLUSolver())
+        >>> print(len(LinearLUSolver._factorizations))
+        0
+        >>> LinearLUSolver.factorizationCacheSize = defaultSize
+        """
+        pass
@@ -0,0 +1,75 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["BlockJacobiPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class BlockJacobiPreconditioner(Preconditioner):
+    """
+    Block Jacobi preconditioner for the SciPy solvers.
+
+    The matrix rows are split into contiguous blocks of `blockSize`
+    rows and every coupling between different blocks is dropped. The
+    remaining block diagonal matrix is factored exactly. All blocks are
+    factored together with a single :func:`scipy.sparse.linalg.splu`,
+    because the blocks do not fill in each other.
+
+    For coupled equations, choosing `blockSize` to be the number of
+    cells (or a divisor of it) keeps each block within one solution
+    variable.
+
+    >>> import scipy.sparse as sp
+    >>> A = sp.csr_matrix([[4., 1., 1., 0.],
+    ...                    [1., 4., 0., 1.],
+    ...                    [1., 0., 4., 1.],
+    ...                    [0., 1., 1., 4.]])
+    >>> M = BlockJacobiPreconditioner(blockSize=2)._applyToMatrix(A)
+    >>> print(M * numerix.array([5., 5., 5., 5.]))
+    [ 1.  1.  1.  1.]
+
+    A `blockSize` covering the whole matrix is an exact inverse
+
+    >>> M = BlockJacobiPreconditioner(blockSize=4)._applyToMatrix(A)
+    >>> print(numerix.allclose(M * (A * numerix.arange(4.)), numerix.arange(4.)))
+    True
+    """
+
+    def __init__(self, blockSize=100):
+        """
+        Parameters
+        ----------
+        blockSize : int
+            Number of rows in each diagonal block.
+        """
+        super(BlockJacobiPreconditioner, self).__init__()
+        self.blockSize = blockSize
+
+    def _applyToMatrix(self, A):
+        A = A.tocoo()
+        keep = (A.row // self.blockSize) == (A.col // self.blockSize)
+
+        blocks = sp.csc_matrix((A.data[keep], (A.row[keep], A.col[keep])),
+                               shape=A.shape)
+
+        # rows without any entries would leave a block singular
+        empty = numerix.bincount(A.row[keep], minlength=A.shape[0]) == 0
+        if empty.any():
+            blocks = blocks + sp.diags(empty.astype(A.dtype), format="csc")
+
+        factors = splu(blocks)
+
+        return LinearOperator(A.shape, matvec=factors.solve, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
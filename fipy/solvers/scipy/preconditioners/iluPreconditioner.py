@@ -0,0 +1,108 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+import hashlib
+
+from scipy.sparse.linalg import LinearOperator, spilu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["ILUPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class ILUPreconditioner(Preconditioner):
+    """
+    Incomplete LU preconditioner for the SciPy solvers.
+    Really just a wrapper class for :func:`scipy.sparse.linalg.spilu`.
+
+    The factors can be kept from one solve to the next, e.g., between
+    sweeps of a nonlinear equation, for as long as the sparsity pattern
+    of the matrix is unchanged. A slightly stale preconditioner usually
+    costs a few extra iterations, which is cheaper than factoring again.
+
+    >>> import scipy.sparse as sp
+    >>> A = sp.csr_matrix([[4., 1., 0.],
+    ...                    [1., 4., 1.],
+    ...                    [0., 1., 4.]])
+    >>> precon = ILUPreconditioner(reuse=True, rebuildInterval=2)
+    >>> M = precon._applyToMatrix(A)
+    >>> print(numerix.allclose(M * (A * numerix.ones(3)), 1.))
+    True
+
+    The factors are reused for a matrix with the same sparsity pattern
+
+    >>> M2 = precon._applyToMatrix(A * 2)
+    >>> print(numerix.allclose(M2 * (A * numerix.ones(3)), 1.))
+    True
+
+    until `rebuildInterval` uses have elapsed
+
+    >>> M3 = precon._applyToMatrix(A * 2)
+    >>> print(numerix.allclose(M3 * (A * numerix.ones(3)), 0.5))
+    True
+    """
+
+    def __init__(self, drop_tol=None, fill_factor=None,
+                 reuse=False, rebuildInterval=None):
+        """
+        Parameters
+        ----------
+        drop_tol : float, optional
+            Drop tolerance for the incomplete factorization
+            (see :func:`scipy.sparse.linalg.spilu`).
+        fill_factor : float, optional
+            Specifies the fill ratio upper bound
+            (see :func:`scipy.sparse.linalg.spilu`).
+        reuse : bool
+            Keep the factors between solves while the sparsity pattern of
+            the matrix is unchanged.
+        rebuildInterval : int, optional
+            If `reuse`, factor again after this many solves (`None`
+            means never, until the sparsity pattern changes).
+        """
+        super(ILUPreconditioner, self).__init__()
+        self.drop_tol = drop_tol
+        self.fill_factor = fill_factor
+        self.reuse = reuse
+        self.rebuildInterval = rebuildInterval
+
+        self._factors = None
+        self._pattern = None
+        self._uses = 0
+
+    @staticmethod
+    def _sparsityPattern(A):
+        digest = hashlib.sha1()
+        digest.update(numerix.ascontiguousarray(A.indptr))
+        digest.update(numerix.ascontiguousarray(A.indices))
+        return (A.shape, A.nnz, digest.hexdigest())
+
+    def _factor(self, A):
+        return spilu(A.tocsc(), drop_tol=self.drop_tol,
+                     fill_factor=self.fill_factor)
+
+    def _applyToMatrix(self, A):
+        if self.reuse:
+            pattern = self._sparsityPattern(A)
+            if (self._factors is None
+                or pattern != self._pattern
+                or (self.rebuildInterval is not None
+                    and self._uses >= self.rebuildInterval)):
+                self._factors = self._factor(A)
+                self._pattern = pattern
+                self._uses = 0
+            self._uses += 1
+            factors = self._factors
+        else:
+            factors = self._factor(A)
+
+        return LinearOperator(A.shape, matvec=factors.solve, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,41 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from scipy.sparse.linalg import LinearOperator
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["JacobiPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class JacobiPreconditioner(Preconditioner):
+    """
+    Jacobi (diagonal scaling) preconditioner for the SciPy solvers.
+
+    >>> import scipy.sparse as sp
+    >>> A = sp.csr_matrix([[4., 1., 0.],
+    ...                    [1., 2., 1.],
+    ...                    [0., 1., -5.]])
+    >>> M = JacobiPreconditioner()._applyToMatrix(A)
+    >>> print(M * numerix.array([4., 2., -5.]))
+    [ 1.  1.  1.]
+    """
+
+    def _applyToMatrix(self, A):
+        diag = A.diagonal()
+        diag[diag == 0] = 1.
+        inverse = 1. / diag
+
+        def matvec(x):
+            return inverse * numerix.ravel(x)
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,33 @@
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = ["Preconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class Preconditioner(object):
+    """
+    Base preconditioner class for the SciPy solvers
+
+    .. attention:: This class is abstract. Always create one of its subclasses.
+    """
+
+    def __init__(self):
+        """
+        Create a `Preconditioner` object.
+        """
+        if self.__class__ is Preconditioner:
+            raise NotImplementedError("can't instantiate abstract base class")
+
+    def _applyToMatrix(self, A):
+        """
+        Returns a :class:`~scipy.sparse.linalg.LinearOperator` that
+        approximates the inverse of `A`.
+
+        Parameters
+        ----------
+        A : ~scipy.sparse.csr_matrix
+            The matrix to precondition.
+        """
+        raise NotImplementedError
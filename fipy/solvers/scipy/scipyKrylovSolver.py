@@ -6,6 +6,7 @@ __all__ = []
 import os
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.tools.instrumentation import _Timer, _count, _instrumenting
 
 class _ScipyKrylovSolver(_ScipySolver):
     """
@@ -14,18 +15,31 @@ class _ScipyKrylovSolver(_ScipySolver):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
+    # additional arguments to `solveFnc` when counting iterations
+    _callbackArguments = {}
+
     def _solve_(self, L, x, b):
         A = L.matrix
         if self.preconditioner is None:
             M = None
         else:
-            M = self.preconditioner._applyToMatrix(A)
+            with _Timer(self, 'precondition'):
+                M = self.preconditioner._applyToMatrix(A)
+
+        iterations = []
+        if _instrumenting():
+            kwargs = dict(self._callbackArguments, callback=iterations.append)
+        else:
+            kwargs = {}
 
         x, info = self.solveFnc(A, b, x,
                                 tol=self.tolerance,
                                 maxiter=self.iterations,
                                 M=M,
-                                atol='legacy')
+                                atol='legacy',
+                                **kwargs)
+
+        _count(self, 'solve', iterations=len(iterations), nnz=A.nnz)
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             if info < 0:
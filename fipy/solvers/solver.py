@@ -18,6 +18,7 @@ from builtins import str
 __docformat__ = 'restructuredtext'
 
 from fipy.tools import numerix
+from fipy.tools.instrumentation import _Timer
 
 __all__ = ["SolverConvergenceWarning", "MaximumIterationWarning",
            "PreconditionerWarning", "IllConditionedPreconditionerWarning",
@@ -91,6 +92,46 @@ class Solver(object):
 
         self.preconditioner = precon
 
+    # final residual norm of the last solution, if the solver reports one
+    _solvedResidualNorm = None
+    # whether `_solve()` must find `_solvedResidualNorm` before discarding
+    # the linear system, if the solver does not report it
+    _reportSolvedResidual = False
+    # whether the value of `var` going in is a good initial guess
+    _warmStart = False
+
+    def _reusePreconditioner(self, reuse=True):
+        """Keep the preconditioner between solves, where supported
+
+        Returns
+        -------
+        list
+            The previous settings, to pass to `_restorePreconditioner()`.
+        """
+        previous = []
+        for owner in (self, self.preconditioner):
+            if hasattr(owner, "reuse"):
+                previous.append((owner, owner.reuse))
+                owner.reuse = reuse
+        return previous
+
+    @staticmethod
+    def _restorePreconditioner(previous):
+        for owner, reuse in previous:
+            owner.reuse = reuse
+
+    def _linearTolerance(self, forcing, residual):
+        """The `tolerance` that reduces the residual by `forcing`
+
+        Most solvers measure convergence relative to the norm of the
+        right-hand-side vector, rather than to the residual going in.
+        """
+        RHSNorm = self._calcRHSNorm()
+        if RHSNorm > 0:
+            return forcing * residual / RHSNorm
+        else:
+            return forcing
+
     def _storeMatrix(self, var, matrix, RHSvector):
         self.var = var
         self.matrix = matrix
@@ -108,19 +149,43 @@ class Solver(object):
             self.RHSvector += (1 - underRelaxation) * self.matrix.takeDiagonal() * numerix.array(self.var).flatten()
 
     def _calcResidualVector(self, residualFn=None):
-        if residualFn is not None:
-            return residualFn(self.var, self.matrix, self.RHSvector)
-        else:
-            Lx = self.matrix * numerix.array(self.var).flatten()
+        with _Timer(self, 'residual'):
+            if residualFn is not None:
+                return residualFn(self.var, self.matrix, self.RHSvector)
+            else:
+                Lx = self.matrix * numerix.array(self.var).flatten()
 
-            return Lx - self.RHSvector
+                return Lx - self.RHSvector
 
     def _calcResidual(self, residualFn=None):
         if residualFn is not None:
-            return residualFn(self.var, self.matrix, self.RHSvector)
+            with _Timer(self, 'residual'):
+                return residualFn(self.var, self.matrix, self.RHSvector)
         else:
             return numerix.L2norm(self._calcResidualVector())
 
+    def _calcResidualVectorAndNorm(self, residualFn=None):
+        """Residual vector and its norm, from a single product with the matrix
+        """
+        if residualFn is not None:
+            residual = self._calcResidualVector(residualFn=residualFn)
+            return residual, residual
+        else:
+            vector = self._calcResidualVector()
+            with _Timer(self, 'residual'):
+                return vector, numerix.L2norm(vector)
+
+    def _calcSolvedResidual(self):
+        """Norm of the residual after `_solve()`
+
+        Uses the final residual norm reported by the solver, where
+        available, rather than multiplying by the matrix again.
+        """
+        if self._solvedResidualNorm is None:
+            self._solvedResidualNorm = self._calcResidual()
+
+        return self._solvedResidualNorm
+
     def _calcRHSNorm(self):
         return numerix.L2norm(self.RHSvector)
 
@@ -63,6 +63,7 @@ class LinearLUSolver(TrilinosSolver):
                  tol0 = tol
 
              if (tol / tol0) <= self.tolerance:
+                 self._solvedResidualNorm = errorVector.Norm2()
                  break
 
              xError = Epetra.Vector(L.RowMap())
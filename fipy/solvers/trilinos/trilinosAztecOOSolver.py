@@ -6,6 +6,7 @@ import os
 from PyTrilinos import AztecOO
 
 from fipy.solvers.trilinos.trilinosSolver import TrilinosSolver
+from fipy.tools.instrumentation import _Timer, _count, _instrumenting
 from fipy.solvers.trilinos.preconditioners.jacobiPreconditioner import JacobiPreconditioner
 
 __all__ = ["TrilinosAztecOOSolver"]
@@ -37,6 +38,10 @@ class TrilinosAztecOOSolver(TrilinosSolver):
                                 iterations=iterations, precon=None)
         self.preconditioner = precon
 
+    def _linearTolerance(self, forcing, residual):
+        # AztecOO converges relative to the initial residual (`AZ_r0`)
+        return forcing
+
     def _solve_(self, L, x, b):
 
         Solver = AztecOO.AztecOO(L, x, b)
@@ -46,13 +51,21 @@ class TrilinosAztecOOSolver(TrilinosSolver):
 
         Solver.SetAztecOption(AztecOO.AZ_output, AztecOO.AZ_none)
 
-        if self.preconditioner is not None:
-            self.preconditioner._applyToSolver(solver=Solver, matrix=L)
-        else:
-            Solver.SetAztecOption(AztecOO.AZ_precond, AztecOO.AZ_none)
+        with _Timer(self, 'precondition'):
+            if self.preconditioner is not None:
+                self.preconditioner._applyToSolver(solver=Solver, matrix=L)
+            else:
+                Solver.SetAztecOption(AztecOO.AZ_precond, AztecOO.AZ_none)
 
         output = Solver.Iterate(self.iterations, self.tolerance)
 
+        # AZ_r is the true residual norm of the returned solution
+        self._solvedResidualNorm = Solver.GetAztecStatus()[AztecOO.AZ_r]
+
+        if _instrumenting():
+            _count(self, 'solve', iterations=int(Solver.GetAztecStatus()[AztecOO.AZ_its]),
+                   nnz=L.NumGlobalNonzeros())
+
         if self.preconditioner is not None:
             if hasattr(self.preconditioner, 'Prec'):
                 del self.preconditioner.Prec
@@ -89,6 +89,9 @@ class TrilinosSolver(Solver):
 
         self.var.value = numerix.reshape(numerix.array(overlappingVector), self.var.shape)
 
+        if self._reportSolvedResidual:
+            self._calcSolvedResidual()
+
         self._deleteGlobalMatrixAndVectors()
         del self.var
         del self.RHSvector
@@ -131,5 +134,22 @@ class TrilinosSolver(Solver):
             residual, globalMatrix = self._calcResidualVectorNonOverlapping_()
             return comm.Norm2(residual)
 
+    def _calcResidualVectorAndNorm(self, residualFn=None):
+        if residualFn is not None:
+            residual = residualFn(self.var, self.matrix, self.RHSvector)
+            return residual, residual
+        else:
+            comm = self.var.mesh.communicator
+            residual, globalMatrix = self._calcResidualVectorNonOverlapping_()
+
+            overlappingResidual = Epetra.Vector(globalMatrix.colMap)
+            overlappingResidual.Import(residual,
+                                       Epetra.Import(globalMatrix.colMap,
+                                                     globalMatrix.domainMap),
+                                       Epetra.Insert)
+
+            return overlappingResidual, comm.Norm2(residual)
+
     def _calcRHSNorm(self):
-        return self.nonOverlappingRHSvector.Norm2()
+        globalMatrix, nonOverlappingVector, nonOverlappingRHSvector, overlappingVector = self._globalMatrixAndVectors
+        return nonOverlappingRHSvector.Norm2()
@@ -11,6 +11,7 @@ from fipy.variables.cellVariable import CellVariable
 from fipy.terms import AbstractBaseClassError
 from fipy.terms import VectorCoeffError
 from fipy.tools import numerix
+from fipy.tools.instrumentation import _Timer
 
 class _AbstractConvectionTerm(FaceTerm):
     """
@@ -163,34 +164,35 @@ class _AbstractConvectionTerm(FaceTerm):
 
         mesh = var.mesh
 
-        if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
+        with _Timer(self, 'boundaryConditions'):
+            if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
 
-            weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
+                weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
 
-            if 'implicit' in weight:
-                alpha = weight['implicit']['cell 1 diag']
-            else:
-                alpha = 0.0
+                if 'implicit' in weight:
+                    alpha = weight['implicit']['cell 1 diag']
+                else:
+                    alpha = 0.0
 
-            alpha_constraint = numerix.where(var.faceGrad.constraintMask, 1.0, alpha)
+                alpha_constraint = numerix.where(var.faceGrad.constraintMask, 1.0, alpha)
 
-            def divergence(face_value):
-                return (
-                    face_value * \
-                    (var.faceGrad.constraintMask | var.arithmeticFaceValue.constraintMask) * \
-                    self.coeff * mesh.exteriorFaces
-                ).divergence * mesh.cellVolumes
+                def divergence(face_value):
+                    return (
+                        face_value * \
+                        (var.faceGrad.constraintMask | var.arithmeticFaceValue.constraintMask) * \
+                        self.coeff * mesh.exteriorFaces
+                    ).divergence * mesh.cellVolumes
 
-            self.constraintL = divergence(alpha_constraint)
-            dvar = (var.faceGrad * mesh._cellDistances * mesh.faceNormals).sum(axis=0)
-            self.constraintB = divergence(
-                (alpha_constraint - 1) * var.arithmeticFaceValue + (alpha - 1)  * dvar * var.faceGrad.constraintMask
-            )
+                self.constraintL = divergence(alpha_constraint)
+                dvar = (var.faceGrad * mesh._cellDistances * mesh.faceNormals).sum(axis=0)
+                self.constraintB = divergence(
+                    (alpha_constraint - 1) * var.arithmeticFaceValue + (alpha - 1)  * dvar * var.faceGrad.constraintMask
+                )
 
 
-        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-        L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
-        b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
+            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+            L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
+            b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
 
         return (var, L, b)
 
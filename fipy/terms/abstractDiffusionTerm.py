@@ -12,6 +12,7 @@ from fipy.tools import numerix
 from fipy.terms import TermMultiplyError
 from fipy.terms import AbstractBaseClassError
 from fipy.variables.faceVariable import FaceVariable
+from fipy.tools.instrumentation import _Timer
 
 class _AbstractDiffusionTerm(_UnaryTerm):
 
@@ -236,16 +237,17 @@ class _AbstractDiffusionTerm(_UnaryTerm):
         boundaryB += bb
 
     def __doBCs(self, SparseMatrix, higherOrderBCs, N, M, coeffs, coefficientMatrix, boundaryB):
-        for boundaryCondition in higherOrderBCs:
-            LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffs)
-            if 'FIPY_DISPLAY_MATRIX' in os.environ:
-                self._viewer.title = r"%s %s" % (boundaryCondition.__class__.__name__, self.__class__.__name__)
-                self._viewer.plot(matrix=LL, RHSvector=bb)
-                from fipy import input
-                input()
-            self.__bcAdd(coefficientMatrix, boundaryB, LL, bb)
-
-        return coefficientMatrix, boundaryB
+        with _Timer(self, 'boundaryConditions'):
+            for boundaryCondition in higherOrderBCs:
+                LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffs)
+                if 'FIPY_DISPLAY_MATRIX' in os.environ:
+                    self._viewer.title = r"%s %s" % (boundaryCondition.__class__.__name__, self.__class__.__name__)
+                    self._viewer.plot(matrix=LL, RHSvector=bb)
+                    from fipy import input
+                    input()
+                self.__bcAdd(coefficientMatrix, boundaryB, LL, bb)
+
+            return coefficientMatrix, boundaryB
 
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
         """
@@ -289,38 +291,39 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         if self.order == 2:
 
-            if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
-
-                normals = FaceVariable(mesh=mesh, rank=1, value=mesh._orientedFaceNormals)
+            with _Timer(self, 'boundaryConditions'):
+                if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
 
-                if len(var.shape) == 1 and len(self.nthCoeff.shape) > 1:
-                    nthCoeffFaceGrad = var.faceGrad.dot(self.nthCoeff)
-                    normalsNthCoeff =  normals.dot(self.nthCoeff)
-                else:
+                    normals = FaceVariable(mesh=mesh, rank=1, value=mesh._orientedFaceNormals)
 
-                    if self.nthCoeff.shape != () and not isinstance(self.nthCoeff, FaceVariable):
-                        coeff = self.nthCoeff[..., numerix.newaxis]
+                    if len(var.shape) == 1 and len(self.nthCoeff.shape) > 1:
+                        nthCoeffFaceGrad = var.faceGrad.dot(self.nthCoeff)
+                        normalsNthCoeff =  normals.dot(self.nthCoeff)
                     else:
-                        coeff = self.nthCoeff
 
-                    nthCoeffFaceGrad = coeff[numerix.newaxis] * var.faceGrad[:, numerix.newaxis]
-                    s = (slice(0, None, None),) + (numerix.newaxis,) * (len(coeff.shape) - 1) + (slice(0, None, None),)
-                    normalsNthCoeff = coeff[numerix.newaxis] * normals[s]
+                        if self.nthCoeff.shape != () and not isinstance(self.nthCoeff, FaceVariable):
+                            coeff = self.nthCoeff[..., numerix.newaxis]
+                        else:
+                            coeff = self.nthCoeff
 
-                self.constraintB = -(var.faceGrad.constraintMask * nthCoeffFaceGrad).divergence * mesh.cellVolumes
+                        nthCoeffFaceGrad = coeff[numerix.newaxis] * var.faceGrad[:, numerix.newaxis]
+                        s = (slice(0, None, None),) + (numerix.newaxis,) * (len(coeff.shape) - 1) + (slice(0, None, None),)
+                        normalsNthCoeff = coeff[numerix.newaxis] * normals[s]
 
-                constrainedNormalsDotCoeffOverdAP = var.arithmeticFaceValue.constraintMask * \
-                                                    normalsNthCoeff / mesh._cellDistances
+                    self.constraintB = -(var.faceGrad.constraintMask * nthCoeffFaceGrad).divergence * mesh.cellVolumes
 
-                self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
+                    constrainedNormalsDotCoeffOverdAP = var.arithmeticFaceValue.constraintMask * \
+                                                        normalsNthCoeff / mesh._cellDistances
 
-                ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+                    self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
 
-                self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
+                    ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
 
-            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-            L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
-            b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
+                    self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
+
+                ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+                L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
+                b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
 
         return (var, L, b)
 
@@ -422,6 +425,21 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         return (var, L, b)
 
+    def _cacheDependencies(self, var):
+        if (self.order != 2
+            or not hasattr(self, 'coeffDict')
+            or not hasattr(self, 'constraintL')
+            or hasattr(self, 'anisotropySource')):
+            return None
+
+        # `constraintB` subscribes to `var`, but its value only
+        # depends on the constraints themselves
+        dependencies = list(self.coeffDict.values()) + [self.nthCoeff, self.constraintL]
+        for constraint in getattr(var, 'faceConstraints', []) + var.faceGrad.constraints:
+            dependencies += [constraint.value, constraint.where]
+
+        return dependencies
+
     def _getDiffusionGeomCoeff(self, var):
         if var is self.var or self.var is None:
             return self._getGeomCoeff(var)
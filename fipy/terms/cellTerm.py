@@ -87,6 +87,16 @@ class CellTerm(_NonDiffusionTerm):
 
         return self.coeffVectors
 
+    def _cacheDependencies(self, var):
+        if self.coeffVectors is None or var is not self._var:
+            return None
+
+        dependencies = list(self.coeffVectors.values())
+        if numerix.any(self.coeffVectors['old value'].value):
+            dependencies.append(var.old)
+
+        return dependencies
+
     def _buildMatrixInline_(self, L, oldArray, b, dt, coeffVectors):
         oldArray = oldArray.value.ravel()
         N = len(oldArray)
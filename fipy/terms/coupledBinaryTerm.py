@@ -68,12 +68,13 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
                                            numberOfEquations=len(self._uncoupledTerms))
         matrix = SparseMatrix(mesh=var.mesh)
         RHSvectors = []
+        blocks = []
 
         for equationIndex, uncoupledTerm in enumerate(self._uncoupledTerms):
 
             SparseMatrix.equationIndex = equationIndex
             termRHSvector = 0
-            termMatrix = SparseMatrix(mesh=var.mesh)
+            termBlocks = []
 
             for varIndex, tmpVar in enumerate(var.vars):
 
@@ -87,12 +88,20 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
                                                                                      diffusionGeomCoeff=uncoupledTerm._getDiffusionGeomCoeff(tmpVar),
                                                                                      buildExplicitIfOther=buildExplicitIfOther)
 
-                termMatrix += tmpMatrix
+                termBlocks.append(tmpMatrix)
                 termRHSvector += tmpRHSvector
 
+            if uncoupledTerm._cacheMatrix:
+                termMatrix = SparseMatrix(mesh=var.mesh)._addBlocks(termBlocks)
+            else:
+                termMatrix = None
             uncoupledTerm._buildCache(termMatrix, termRHSvector)
             RHSvectors += [CellVariable(value=termRHSvector, mesh=var.mesh)]
-            matrix += termMatrix
+            blocks += termBlocks
+
+        # gather every block at once, rather than adding
+        # a full-size matrix for each equation and variable
+        matrix._addBlocks(blocks)
 
         return (var, matrix, _CoupledCellVariable(RHSvectors))
 
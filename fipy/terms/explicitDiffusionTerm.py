@@ -33,6 +33,9 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
 
         return (var, SparseMatrix(mesh=var.mesh), b - L * var.value)
 
+    def _cacheDependencies(self, var):
+        return None
+
     def _getNormals(self, mesh):
         return mesh._faceCellToCellNormals
 
@@ -7,6 +7,8 @@ import os
 
 from fipy import input
 from fipy.tools import numerix
+from fipy.tools.instrumentation import _Timer
+from fipy.variables.evaluationEpoch import _evaluationEpoch
 from fipy.terms import AbstractBaseClassError
 from fipy.terms import SolutionVariableRequiredError
 
@@ -39,6 +41,7 @@ class Term(object):
         self._matrix = None
         self._cacheRHSvector = False
         self._RHSvector = None
+        self._incrementalBuild = None
         self.var = var
 
     def _calcVars(self):
@@ -105,6 +108,9 @@ class Term(object):
         return SparseMatrix
 
     def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
+        # release the coefficients cached while building the previous system
+        _evaluationEpoch.bump()
+
         solver = self.getDefaultSolver(var, solver)
 
         var = self._verifyVar(var)
@@ -175,9 +181,10 @@ class Term(object):
 
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
 
-        solver._solve()
+        with _Timer(solver, 'solve'):
+            solver._solve()
 
-    def sweep(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, cacheResidual=False, cacheError=False):
+    def sweep(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, cacheResidual=False, cacheError=False, residualAfterSolve=False):
         r"""
         Builds and solves the `Term`'s linear system once. This method
         also recalculates and returns the residual as well as applying
@@ -210,26 +217,263 @@ class Term(object):
             :math:`\mathsf{L}\vec{e}=\vec{r}` for the error vector
             :math:`\vec{e}` and store it in the `errorVector` member of
             `Term`
+        residualAfterSolve : bool
+            If `True`, return the residual of the new solution, rather
+            than of the solution going in.  Solvers that report their final
+            residual norm spare a product with the matrix; the others
+            calculate it after solving.
+
+        Returns
+        -------
+        float
+            The residual
+
+        The residual of the solution going in is reported together with the
+        cached residual vector, without multiplying by the matrix twice
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=10)
+        >>> v = CellVariable(mesh=m, value=m.cellCenters[0])
+        >>> v.constrain(0., where=m.facesLeft)
+        >>> eq = DiffusionTerm()
+        >>> res = eq.sweep(var=v, cacheResidual=True)
+        >>> print(numerix.allclose(res, numerix.L2norm(eq.residualVector)))
+        True
+
+        The residual after solving is that of the new solution
+
+        >>> v.value = m.cellCenters[0]
+        >>> res = eq.sweep(var=v, solver=LinearLUSolver(), residualAfterSolve=True)
+        >>> print(numerix.allclose(res, eq.residualVectorAndNorm(var=v)[1], atol=1e-10))
+        True
+        >>> print(res < 1e-10)
+        True
         """
         solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
         solver._applyUnderRelaxation(underRelaxation=underRelaxation)
-        residual = solver._calcResidual(residualFn=residualFn)
 
         if cacheResidual or cacheError:
-            self.residualVector = solver._calcResidualVector(residualFn=residualFn)
+            self.residualVector, residual = solver._calcResidualVectorAndNorm(residualFn=residualFn)
+        elif not residualAfterSolve:
+            residual = solver._calcResidual(residualFn=residualFn)
 
         if cacheError:
             self.errorVector = solver.var.copy()
             var_tmp = solver.var
             RHS_tmp = solver.RHSvector
             solver._storeMatrix(var=self.errorVector, matrix=solver.matrix, RHSvector=self.residualVector)
-            solver._solve()
+            with _Timer(solver, 'solve'):
+                solver._solve()
             solver._storeMatrix(var=var_tmp, matrix=solver.matrix, RHSvector=RHS_tmp)
 
         if not cacheResidual:
             self.residualVector = None
 
-        solver._solve()
+        if residualAfterSolve and residualFn is not None:
+            # `_solve()` may discard the linear system it solved
+            var_tmp = solver.var
+            matrix_tmp = solver.matrix
+            RHS_tmp = solver.RHSvector
+
+        solver._solvedResidualNorm = None
+        solver._reportSolvedResidual = residualAfterSolve and residualFn is None
+        with _Timer(solver, 'solve'):
+            solver._solve()
+        solver._reportSolvedResidual = False
+
+        if residualAfterSolve:
+            if residualFn is None:
+                residual = solver._calcSolvedResidual()
+            else:
+                solver._storeMatrix(var=var_tmp, matrix=matrix_tmp, RHSvector=RHS_tmp)
+                residual = solver._calcResidual(residualFn=residualFn)
+
+        return residual
+
+    def sweepUntil(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None,
+                   tolerance=1e-6, maxSweeps=100, inexact=True, maxLinearTolerance=0.9, stagnation=0.99):
+        r"""
+        Sweeps the `Term`'s linear system until its residual falls below
+        `tolerance`, replacing loops like
+
+        .. code-block:: python
+
+           res = 1.
+           while res > tolerance:
+               res = eq.sweep(var=var, dt=dt, solver=solver)
+
+        Each sweep starts the linear solver from the last iterate and
+        keeps the preconditioner of the previous sweep, where the solver
+        supports it.  If `inexact`, the linear tolerance of each sweep
+        follows Eisenstat and Walker [#EisenstatWalker]_, so that early
+        sweeps, far from the solution, are only solved loosely.
+
+        Sweeping stops when the residual is below `tolerance`, after
+        `maxSweeps` sweeps, or when the residual stagnates, i.e., when a
+        sweep solved to the full tolerance of `solver` fails to reduce the
+        residual by at least a factor of `stagnation`.
+
+        .. [#EisenstatWalker] S. C. Eisenstat and H. F. Walker, "Choosing
+           the forcing terms in an inexact Newton method", SIAM J. Sci.
+           Comput. **17** (1996) 16--32.
+
+        Parameters
+        ----------
+        var : ~fipy.variables.cellVariable.CellVariable
+            `Variable` to be solved for.  Provides the initial condition,
+            the old value and holds the solution on completion.
+        solver : ~fipy.solvers.solver.Solver
+            Iterative solver to be used to solve the linear system of
+            equations.  The default sovler depends on the solver package
+            selected.  Its `tolerance` is the tightest linear tolerance
+            used.
+        boundaryConditions : :obj:`tuple` of :obj:`~fipy.boundaryConditions.boundaryCondition.BoundaryCondition`
+        dt : float
+            Timestep size.
+        underRelaxation : float
+            Usually a value between `0` and `1` or `None` in the case of no
+            under-relaxation
+        residualFn : function
+            Takes `var`, `matrix`, and `RHSvector` arguments, used to
+            customize the residual calculation.
+        tolerance : float
+            Residual below which sweeping stops.
+        maxSweeps : int
+            Maximum number of sweeps.
+        inexact : bool
+            Whether to loosen the linear tolerance far from the solution.
+        maxLinearTolerance : float
+            Loosest reduction of the linear residual asked of `solver`.
+        stagnation : float
+            Smallest ratio of successive residuals that counts as stagnation.
+
+        Returns
+        -------
+        float
+            The residual of the last sweep
+
+        The statistics of the sweeps are stored in the `sweepStatistics`
+        member of `Term`
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=20)
+        >>> v = CellVariable(mesh=m, value=1., hasOld=True)
+        >>> v.constrain(1., where=m.facesLeft)
+        >>> v.constrain(2., where=m.facesRight)
+        >>> eq = TransientTerm() == DiffusionTerm(coeff=v**2)
+        >>> res = eq.sweepUntil(var=v, dt=1., tolerance=1e-8, solver=LinearPCGSolver(tolerance=1e-12))
+        >>> print(eq.sweepStatistics["reason"])
+        converged
+        >>> print(res < 1e-8)
+        True
+        >>> print(eq.sweepStatistics["sweeps"] == len(eq.sweepStatistics["residuals"]))
+        True
+        >>> print(max(eq.sweepStatistics["linearTolerances"]) > 1e-12)
+        True
+
+        Those are the tolerances that the linear solver actually used, even
+        while it keeps its preconditioner between sweeps
+
+        >>> solver = LinearPCGSolver(tolerance=1e-12)
+        >>> used = []
+        >>> solve_ = solver._solve_
+        >>> def recordTolerance(L, x, b):
+        ...     x = solve_(L, x, b)
+        ...     ksp = getattr(solver, "_ksp", None)
+        ...     used.append(solver.tolerance if ksp is None else ksp.getTolerances()[0])
+        ...     return x
+        >>> solver._solve_ = recordTolerance
+        >>> v.setValue(1.)
+        >>> res = eq.sweepUntil(var=v, dt=1., tolerance=1e-8, solver=solver)
+        >>> print(used == eq.sweepStatistics["linearTolerances"], len(set(used)) > 1)
+        True True
+
+        The solution agrees with sweeping to full tolerance
+
+        >>> v2 = CellVariable(mesh=m, value=1., hasOld=True)
+        >>> v2.constrain(1., where=m.facesLeft)
+        >>> v2.constrain(2., where=m.facesRight)
+        >>> eq2 = TransientTerm() == DiffusionTerm(coeff=v2**2)
+        >>> res = 1.
+        >>> while res > 1e-8:
+        ...     res = eq2.sweep(var=v2, dt=1., solver=LinearPCGSolver(tolerance=1e-12))
+        >>> print(numerix.allclose(v, v2, atol=1e-6))
+        True
+
+        A residual that cannot be reduced is reported as stagnation
+
+        >>> eq3 = TransientTerm() == DiffusionTerm(coeff=v**2)
+        >>> res = eq3.sweepUntil(var=v, dt=1., tolerance=-1.)
+        >>> print(eq3.sweepStatistics["reason"])
+        stagnated
+        >>> print(eq3.sweepStatistics["sweeps"] < 100)
+        True
+        """
+        solver = self.getDefaultSolver(var, solver)
+
+        statistics = {"sweeps": 0,
+                      "residuals": [],
+                      "linearTolerances": [],
+                      "reason": "maxSweeps"}
+        self.sweepStatistics = statistics
+
+        linearTolerance = solver.tolerance
+        warmStart = solver._warmStart
+        reuse = solver._reusePreconditioner(True)
+        solver._warmStart = True
+
+        forcing = maxLinearTolerance
+        previous = None
+        exact = not inexact
+        try:
+            for sweep in range(maxSweeps):
+                solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
+                solver._applyUnderRelaxation(underRelaxation=underRelaxation)
+                residual = solver._calcResidual(residualFn=residualFn)
+
+                if previous is not None and residual > stagnation * previous:
+                    if exact:
+                        statistics["reason"] = "stagnated"
+                    else:
+                        # a loose linear solve may be to blame
+                        exact = True
+                elif inexact and previous is not None:
+                    # Eisenstat-Walker "choice 2", with their safeguard
+                    # against the forcing term decreasing too quickly
+                    # and Kelley's against oversolving the last sweeps
+                    safeguard = 0.9 * forcing**2
+                    forcing = 0.9 * (residual / previous)**2
+                    if safeguard > 0.1:
+                        forcing = max(forcing, safeguard)
+                    if residual > 0:
+                        forcing = max(forcing, 0.5 * tolerance / residual)
+                    forcing = min(forcing, maxLinearTolerance)
+                    exact = False
+
+                if exact:
+                    solver.tolerance = linearTolerance
+                else:
+                    solver.tolerance = max(linearTolerance,
+                                           solver._linearTolerance(forcing, residual))
+
+                statistics["sweeps"] += 1
+                statistics["residuals"].append(residual)
+                statistics["linearTolerances"].append(solver.tolerance)
+
+                with _Timer(solver, 'solve'):
+                    solver._solve()
+
+                if residual <= tolerance:
+                    statistics["reason"] = "converged"
+                    break
+                elif statistics["reason"] == "stagnated":
+                    break
+
+                previous = residual
+        finally:
+            solver.tolerance = linearTolerance
+            solver._warmStart = warmStart
+            solver._restorePreconditioner(reuse)
 
         return residual
 
@@ -296,10 +540,13 @@ class Term(object):
             Takes `var`, `matrix`, and `RHSvector` arguments, used to
             customize the residual calculation.
         """
-        vector = self.justResidualVector(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt,
-                                         underRelaxation=underRelaxation, residualFn=residualFn)
+        solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
+        solver._applyUnderRelaxation(underRelaxation)
 
-        L2norm = numerix.L2norm(vector)
+        vector, L2norm = solver._calcResidualVectorAndNorm(residualFn=residualFn)
+
+        if residualFn is not None:
+            L2norm = numerix.L2norm(vector)
 
         return vector, L2norm
 
@@ -344,7 +591,8 @@ class Term(object):
 
         errorVector = solver.var.copy()
         solver._storeMatrix(var=errorVector, matrix=solver.matrix, RHSvector=residualVector)
-        solver._solve()
+        with _Timer(solver, 'solve'):
+            solver._solve()
 
         return errorVector
 
@@ -456,7 +704,8 @@ class Term(object):
 
     def _getGeomCoeff(self, var):
         if self.geomCoeff is None:
-            self.geomCoeff = self._calcGeomCoeff(var)
+            with _Timer(self, 'geomCoeff'):
+                self.geomCoeff = self._calcGeomCoeff(var)
             if self.geomCoeff is not None:
                 self.geomCoeff.dontCacheMe()
 
@@ -7,7 +7,24 @@ import os
 
 from fipy import input
 from fipy.tools import numerix
+from fipy.tools.instrumentation import _Timer
 from fipy.terms.term import Term
+from fipy.variables.variable import Variable
+
+class _BuildDependencies(Variable):
+    """Goes stale as soon as any `Variable` a cached build depends on changes
+    """
+    def __init__(self, dependencies):
+        Variable.__init__(self, value=False)
+        for dependency in dependencies:
+            if isinstance(dependency, Variable):
+                self._requires(dependency)
+        # anything the build actually used has just been evaluated,
+        # so it will notify us when it changes
+        self._markFresh()
+
+    def _calcValue(self):
+        return False
 
 class _UnaryTerm(Term):
 
@@ -59,21 +76,23 @@ class _UnaryTerm(Term):
         """
 
         if var is self.var or self.var is None:
-            var, matrix, RHSvector = self._buildMatrix(var,
-                                                       SparseMatrix,
-                                                       boundaryConditions=boundaryConditions,
-                                                       dt=dt,
-                                                       transientGeomCoeff=transientGeomCoeff,
-                                                       diffusionGeomCoeff=diffusionGeomCoeff)
+            with _Timer(self, 'assembly'):
+                var, matrix, RHSvector = self._buildMatrixIncrementally(var,
+                                                                        SparseMatrix,
+                                                                        boundaryConditions=boundaryConditions,
+                                                                        dt=dt,
+                                                                        transientGeomCoeff=transientGeomCoeff,
+                                                                        diffusionGeomCoeff=diffusionGeomCoeff)
         elif buildExplicitIfOther:
-            _, matrix, RHSvector = self._buildMatrix(self.var,
-                                                     SparseMatrix,
-                                                     boundaryConditions=boundaryConditions,
-                                                     dt=dt,
-                                                     transientGeomCoeff=transientGeomCoeff,
-                                                     diffusionGeomCoeff=diffusionGeomCoeff)
-            RHSvector = RHSvector - matrix * self.var.value
-            matrix = SparseMatrix(mesh=var.mesh)
+            with _Timer(self, 'assembly'):
+                _, matrix, RHSvector = self._buildMatrix(self.var,
+                                                         SparseMatrix,
+                                                         boundaryConditions=boundaryConditions,
+                                                         dt=dt,
+                                                         transientGeomCoeff=transientGeomCoeff,
+                                                         diffusionGeomCoeff=diffusionGeomCoeff)
+                RHSvector = RHSvector - matrix * self.var.value
+                matrix = SparseMatrix(mesh=var.mesh)
         else:
             RHSvector = numerix.zeros(len(var.ravel()), 'd')
             matrix = SparseMatrix(mesh=var.mesh)
@@ -86,6 +105,134 @@ class _UnaryTerm(Term):
 
         return (var, matrix, RHSvector)
 
+    def _cacheDependencies(self, var):
+        """`Variable` objects that determine the contribution of this `Term`
+
+        Returns `None` if the contribution can not be reused between builds.
+        """
+        return None
+
+    def _cacheKey(self, var, SparseMatrix, boundaryConditions, dt, dependencies):
+        if dependencies is None or len(boundaryConditions) > 0:
+            return None
+        try:
+            dt = None if dt is None else float(dt)
+        except (TypeError, ValueError):
+            return None
+        return (id(var), id(var.mesh), SparseMatrix, dt,
+                tuple(id(dependency) for dependency in dependencies))
+
+    def _buildMatrixIncrementally(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Reuse the previous contribution of this `Term` if nothing it depends on has changed
+
+        The contribution is only retained once it has been found unchanged
+        between two consecutive builds, so terms whose coefficients change
+        every sweep never pay for the copies.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m, value=1., hasOld=True)
+        >>> D = Variable(1.)
+        >>> diff = DiffusionTerm(coeff=D, var=v)
+        >>> SparseMatrix = DefaultSolver()._matrixClass
+        >>> def build():
+        ...     _, L, b = diff._buildAndAddMatrices(var=v, SparseMatrix=SparseMatrix)
+        ...     return L.numpyArray[1]
+        >>> print(build(), build(), diff._incrementalBuild.L is not None)
+        [ 1. -2.  1.] [ 1. -2.  1.] True
+        >>> print(build())
+        [ 1. -2.  1.]
+
+        Changing the coefficient invalidates the retained contribution
+
+        >>> D.value = 2.
+        >>> print(build())
+        [ 2. -4.  2.]
+        >>> print(diff._incrementalBuild.L is None)
+        True
+
+        Changes to the solution variable do not affect a `DiffusionTerm`,
+        but they do affect a `TransientTerm`
+
+        >>> v.value = 3.
+        >>> print(build(), build(), diff._incrementalBuild.L is not None)
+        [ 2. -4.  2.] [ 2. -4.  2.] True
+        >>> v.updateOld()
+        >>> trans = TransientTerm(var=v)
+        >>> for _ in range(3):
+        ...     _, L, b = trans._buildAndAddMatrices(var=v, SparseMatrix=SparseMatrix, dt=1.)
+        >>> print(b)
+        [ 3.  3.  3.]
+        >>> v.value = 4.
+        >>> v.updateOld()
+        >>> _, L, b = trans._buildAndAddMatrices(var=v, SparseMatrix=SparseMatrix, dt=1.)
+        >>> print(b)
+        [ 4.  4.  4.]
+        >>> _, L, b = trans._buildAndAddMatrices(var=v, SparseMatrix=SparseMatrix, dt=2.)
+        >>> print(b)
+        [ 2.  2.  2.]
+
+        Constraining the solution variable after it has been solved for
+        changes the contribution
+
+        >>> m = Grid2D(nx=3, ny=3)
+        >>> v = CellVariable(mesh=m)
+        >>> v.constrain(1., where=m.facesLeft)
+        >>> diff = DiffusionTerm(var=v)
+        >>> for _ in range(3):
+        ...     diff.solve(solver=DummySolver())
+        >>> c = Constraint(-2., where=m.facesTop)
+        >>> v.constrain(c)
+        >>> def assemble(term):
+        ...     _, L, b = term._buildAndAddMatrices(var=v, SparseMatrix=SparseMatrix)
+        ...     return L.numpyArray, b
+        >>> def same(term1, term2):
+        ...     (L1, b1), (L2, b2) = assemble(term1), assemble(term2)
+        ...     return numerix.allequal(L1, L2) and numerix.allequal(b1, b2)
+        >>> print(same(diff, DiffusionTerm(var=v)), same(diff, DiffusionTerm(var=v)))
+        True True
+        >>> v.release(constraint=c)
+        >>> print(same(diff, DiffusionTerm(var=v)), same(diff, DiffusionTerm(var=v)))
+        True True
+        >>> diff.solve()
+        >>> print(numerix.allclose(v, 1.))
+        True
+        """
+        previous = self._incrementalBuild
+        # check before evaluating anything, as recalculating even an
+        # unchanged `Variable` notifies its subscribers
+        unchanged = previous is not None and not previous.dependencies.stale
+        key = self._cacheKey(var, SparseMatrix, boundaryConditions, dt,
+                             self._cacheDependencies(var))
+
+        if unchanged and previous.key == key and previous.L is not None:
+            L = SparseMatrix(mesh=var.mesh)
+            L += previous.L
+            return (var, L, previous.b.copy())
+
+        var, L, b = self._buildMatrix(var,
+                                      SparseMatrix,
+                                      boundaryConditions=boundaryConditions,
+                                      dt=dt,
+                                      transientGeomCoeff=transientGeomCoeff,
+                                      diffusionGeomCoeff=diffusionGeomCoeff)
+
+        dependencies = self._cacheDependencies(var)
+        key = self._cacheKey(var, SparseMatrix, boundaryConditions, dt, dependencies)
+        if key is None:
+            self._incrementalBuild = None
+        else:
+            self._incrementalBuild = _IncrementalBuild(key=key,
+                                                       dependencies=_BuildDependencies(dependencies))
+            if unchanged and previous.key == key:
+                self._incrementalBuild.L = SparseMatrix(mesh=var.mesh)
+                self._incrementalBuild.L += L
+                # assemble now, rather than on every reuse
+                self._incrementalBuild.L.matrix
+                self._incrementalBuild.b = numerix.array(b, copy=True)
+
+        return (var, L, b)
+
     def _reshapeIDs(self, var, ids):
         shape = (self._vectorSize(var), self._vectorSize(var), ids.shape[-1])
         ids = numerix.resize(ids, shape)
@@ -184,6 +331,13 @@ class _UnaryTerm(Term):
 
         """
 
+class _IncrementalBuild(object):
+    def __init__(self, key, dependencies):
+        self.key = key
+        self.dependencies = dependencies
+        self.L = None
+        self.b = None
+
 class __UnaryTerm(_UnaryTerm):
     """
     Dummy subclass for tests
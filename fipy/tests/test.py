@@ -43,7 +43,7 @@ class test(_test):
     # name), and help string.
     user_options = _test.user_options + [
         ('inline', None, "run FiPy with inline compilation enabled"),
-        ('pythoncompiled=', None, "directory in which to put weave's work product"),
+        ('pythoncompiled=', None, "directory in which to put compiled inline kernels"),
         ('Trilinos', None, "run FiPy using Trilinos solvers"),
         ('Pysparse', None, "run FiPy using Pysparse solvers (default)"),
         ('trilinos', None, "run FiPy using Trilinos solvers"),
@@ -251,16 +251,19 @@ class test(_test):
                 print("!!! pyamgx package is not installed", file=sys.stederr)
                 return
 
+        import os
+
         if self.inline:
             try:
-                import weave
-            except ImportError as a:
-                print("!!! weave library is not installed", file=sys.stderr)
+                from shutil import which
+            except ImportError:
+                from distutils.spawn import find_executable as which
+            if which(os.environ.get('CC', 'cc')) is None:
+                print("!!! no C compiler was found (set $CC)", file=sys.stderr)
                 return
 
         if self.pythoncompiled is not None:
-            import os
-            os.environ['PYTHONCOMPILED'] = self.pythoncompiled
+            os.environ['FIPY_INLINE_CACHE'] = self.pythoncompiled
 
         self.printPackageInfo()
 
@@ -45,6 +45,7 @@ import fipy.tools.vector
 from .dimensions.physicalField import PhysicalField
 from fipy.tools.numerix import *
 from fipy.tools.vitals import Vitals
+from fipy.tools.instrumentation import Instrumentation
 from fipy.tools.sharedtempfile import SharedTemporaryFile
 
 __all__ = ["serialComm",
@@ -54,6 +55,7 @@ __all__ = ["serialComm",
            "vector",
            "PhysicalField",
            "Vitals",
+           "Instrumentation",
            "serial",
            "parallel",
            "SharedTemporaryFile"]
@@ -1,17 +1,44 @@
 from __future__ import unicode_literals
 from builtins import range
+from builtins import str
 __all__ = ["doInline"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
+import ctypes
+import hashlib
 import inspect
 import os
+import stat
+import subprocess
 import sys
+import tempfile
+import warnings
 
-if '--inline' in [s.lower() for s in sys.argv[1:]]:
-    doInline = True
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
+from fipy.tools import numerix
+from fipy.tests.doctestPlus import register_skipper
+
+_inlineRequested = (('--inline' in [s.lower() for s in sys.argv[1:]])
+                    or ('FIPY_INLINE' in os.environ))
+
+def _compiler():
+    return os.environ.get('CC', 'cc')
+
+if _inlineRequested and which(_compiler()) is None:
+    warnings.warn("--inline requires a C compiler (set $CC); calculating with NumPy instead",
+                  RuntimeWarning, stacklevel=2)
+    doInline = False
 else:
-    doInline = 'FIPY_INLINE' in os.environ
+    doInline = _inlineRequested
+
+register_skipper(flag="CC",
+                 test=lambda: which(_compiler()) is not None,
+                 why="no C compiler was found (set $CC)")
 
 _inlineFrameComment = 'FIPY_INLINE_COMMENT' in os.environ
 
@@ -99,20 +126,7 @@ def _runInline(code_in, converters=None, verbose=0, comment=None, **args):
 
     code = "\n" + comment + "\n" + code
 
-    import weave
-
-    for key in list(args.keys()):
-        if hasattr(args[key], 'dtype') and args[key].dtype.char == '?':
-            args[key] = args[key].astype('B')
-
-    weave.inline(code,
-                 list(args.keys()),
-                 local_dict=args,
-                 type_converters=None, #weave.converters.blitz,
-                 compiler = 'gcc',
-                 force=0,
-                 verbose = 0 or verbose,
-                 extra_compile_args =['-O3'])
+    _Kernel(code, args, verbose=verbose)(**args)
 
 def _runIterateElementInline(code_in, converters=None, verbose=0, comment=None, **args):
     loops = """
@@ -150,30 +164,16 @@ for(i=0; i < ni; i++) {
 
     code = "\n" + comment + "\n" + code
 
-    import weave
-
-    for key in list(args.keys()):
-        if hasattr(args[key], 'dtype') and args[key].dtype.char == '?':
-            args[key] = args[key].astype('B')
-
-    weave.inline(code,
-                 list(args.keys()),
-                 local_dict=args,
-                 type_converters=None, #weave.converters.blitz,
-                 compiler = 'gcc',
-                 force=0,
-                 verbose = 0 or verbose,
-                 extra_compile_args =['-O3'],
-                 support_code="""
+    _Kernel(code, args, verbose=verbose, describeArrays=True, support_code="""
 
 // returns the index (accounting for strides) of the tensor element vec
 // in position i of array
 //
 // array holds a tensor at each position i
 // vec identifies a particular element in that tensor
-static int arrayIndex(PyArrayObject* array, int i, int vec[])
+static long arrayIndex(const _fipy_array* array, long i, int vec[])
 {
-    int index = array->strides[array->nd-1] * i;
+    long index = array->strides[array->nd-1] * i;
 
     if (vec != NULL) {
         int j;
@@ -182,6 +182,217 @@ static int arrayIndex(PyArrayObject* array, int i, int vec[])
         }
     }
 
-    return index / array->descr->elsize;
+    return index / array->elsize;
+}
+                 """)(**args)
+
+class _CompileError(Exception):
+    pass
+
+_MAXDIMS = 32
+
+class _ArrayDescription(ctypes.Structure):
+    """The dimensions of an array, as :func:`_runIterateElementInline` code sees them
+    """
+    _fields_ = [("nd", ctypes.c_int),
+                ("elsize", ctypes.c_long),
+                ("strides", ctypes.c_long * _MAXDIMS)]
+
+    def __init__(self, array):
+        super(_ArrayDescription, self).__init__(array.ndim, array.itemsize,
+                                                (ctypes.c_long * _MAXDIMS)(*array.strides))
+
+_CTYPES = {
+    'f8': 'double', 'f4': 'float',
+    'i8': 'int64_t', 'i4': 'int32_t', 'i2': 'int16_t', 'i1': 'int8_t',
+    'u8': 'uint64_t', 'u4': 'uint32_t', 'u2': 'uint16_t', 'u1': 'uint8_t'
+}
+
+def _inlineCache():
+    """Directory where compiled kernels are kept between runs
+
+    Set by :envvar:`FIPY_INLINE_CACHE`, otherwise in the user's own cache
+    directory, so that no one else can put a library in it.
+    """
+    cache = os.environ.get('FIPY_INLINE_CACHE')
+    if cache is None:
+        cache = os.path.join(os.environ.get('XDG_CACHE_HOME',
+                                            os.path.join(os.path.expanduser("~"), ".cache")),
+                             "fipy", "inline")
+    return cache
+
+def _isTrusted(path):
+    """Whether only the current user could have written `path`
+
+        >>> import shutil
+        >>> directory = tempfile.mkdtemp()
+        >>> print(_isTrusted(directory))
+        True
+        >>> os.chmod(directory, 0o777)
+        >>> print(_isTrusted(directory) or not hasattr(os, "getuid"))
+        False
+        >>> shutil.rmtree(directory)
+    """
+    if not hasattr(os, "getuid"):
+        # no owners or permissions to check
+        return True
+    info = os.stat(path)
+    return (info.st_uid == os.getuid()
+            and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+class _Kernel(object):
+    """C `code` compiled into a shared library, to be called with `args`
+
+    Array arguments are seen by `code` as pointers to their (contiguous)
+    data and scalars are seen as `long` or `double`. Each library is
+    compiled once and then kept, keyed by its source, in
+    :func:`_inlineCache`.
+
+        >>> a = numerix.array((1., 2., 3.))
+        >>> b = numerix.zeros(3, dtype='i')
+        >>> kernel = _Kernel("int i; for (i = 0; i < ni; i++) b[i] = (int) (a[i] * c);",
+        ...                  dict(a=a, b=b, c=2.5, ni=3)) # doctest: +CC
+        >>> kernel(a=a, b=b, c=2.5, ni=3) # doctest: +CC
+        >>> print(b) # doctest: +CC
+        [2 5 7]
+    """
+    _loaded = {}
+
+    def __init__(self, code, args, verbose=0, describeArrays=False, support_code=""):
+        self.names = sorted(args.keys())
+        self.describeArrays = describeArrays
+
+        parameters = []
+        for name in self.names:
+            value = args[name]
+            if isinstance(value, numerix.ndarray):
+                dtype = self._asArray(value).dtype
+                try:
+                    ctype = _CTYPES[dtype.kind + str(dtype.itemsize)]
+                except KeyError:
+                    raise TypeError("Cannot inline %s arrays" % dtype)
+                parameters.append("%s* %s" % (ctype, name))
+                if describeArrays:
+                    parameters.append("const _fipy_array* %s_array" % name)
+            elif isinstance(value, (float, numerix.floating)):
+                parameters.append("double %s" % name)
+            else:
+                parameters.append("long %s" % name)
+
+        source = """
+#include <math.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+typedef struct {
+    int nd;
+    long elsize;
+    long strides[%(maxdims)d];
+} _fipy_array;
+
+%(support_code)s
+
+void fipy_kernel(%(parameters)s)
+{
+%(code)s
 }
-                 """)
+""" % dict(maxdims=_MAXDIMS,
+           support_code=support_code,
+           parameters=", ".join(parameters),
+           code=code)
+
+        self.function = self._load(source, verbose=verbose)
+
+    @staticmethod
+    def _asArray(value):
+        value = numerix.MA.getdata(value)
+        if value.dtype.char == '?':
+            value = value.astype('B')
+        return value
+
+    @classmethod
+    def _load(cls, source, verbose=0):
+        flags = os.environ.get('CFLAGS', '-O3').split()
+        digest = hashlib.sha1(" ".join([_compiler()] + flags + [source]).encode('utf-8')).hexdigest()
+
+        if digest not in cls._loaded:
+            cache = _inlineCache()
+            if not os.path.isdir(cache):
+                try:
+                    os.makedirs(cache, 0o700)
+                except OSError:
+                    # another process just made it
+                    pass
+            if not _isTrusted(cache):
+                raise EnvironmentError("Refusing to load C code from %s, "
+                                       "which can be written by another user "
+                                       "(see $FIPY_INLINE_CACHE)" % cache)
+            library = os.path.join(cache, "fipy_kernel_%s.so" % digest)
+            if not (os.path.exists(library) and _isTrusted(library)):
+                cls._compile(source, library, flags, verbose=verbose)
+            function = ctypes.CDLL(library).fipy_kernel
+            function.restype = None
+            cls._loaded[digest] = function
+
+        return cls._loaded[digest]
+
+    @staticmethod
+    def _compile(source, library, flags, verbose=0):
+        directory = os.path.dirname(library)
+
+        # build in scratch files, so that an interrupted or concurrent
+        # build never leaves a partial library in the cache
+        fd, scratch = tempfile.mkstemp(suffix=".c", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(source)
+            command = [_compiler()] + flags + ["-shared", "-fPIC",
+                                               "-o", scratch + ".so", scratch, "-lm"]
+            if verbose:
+                print(" ".join(command))
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            output = process.communicate()[0]
+            if process.returncode != 0:
+                raise _CompileError("%s\n%s" % (output.decode('utf-8', 'replace'), source))
+            # whatever the `umask`, only we may replace the library
+            os.chmod(scratch + ".so",
+                     os.stat(scratch + ".so").st_mode & ~(stat.S_IWGRP | stat.S_IWOTH))
+            os.rename(scratch + ".so", library)
+        finally:
+            for name in (scratch, scratch + ".so"):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def __call__(self, **args):
+        arguments = []
+        writeBacks = []
+        for name in self.names:
+            value = args[name]
+            if isinstance(value, numerix.ndarray):
+                array = self._asArray(value)
+                if not array.flags.c_contiguous:
+                    array = numerix.ascontiguousarray(array)
+                if array is not numerix.MA.getdata(value) and array.dtype == value.dtype:
+                    # the kernel may write to `value`
+                    writeBacks.append((value, array))
+                arguments.append(ctypes.c_void_p(array.ctypes.data))
+                if self.describeArrays:
+                    arguments.append(ctypes.byref(_ArrayDescription(array)))
+                # keep a reference until the kernel returns
+                args[name] = array
+            elif isinstance(value, (float, numerix.floating)):
+                arguments.append(ctypes.c_double(value))
+            else:
+                arguments.append(ctypes.c_long(value))
+
+        self.function(*arguments)
+
+        for value, array in writeBacks:
+            value[...] = array
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
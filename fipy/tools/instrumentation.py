@@ -0,0 +1,241 @@
+"""Structured timing of term assembly and linear solution
+
+Wrap any part of a simulation in an :class:`Instrumentation` to find out
+where the time goes, without attaching a profiler::
+
+    >>> from fipy import *
+    >>> from fipy.tools.instrumentation import Instrumentation
+    >>> mesh = Grid1D(nx=10)
+    >>> var = CellVariable(mesh=mesh, value=0.)
+    >>> var.constrain(1., where=mesh.facesLeft)
+    >>> eq = TransientTerm() == DiffusionTerm(coeff=1.)
+    >>> with Instrumentation() as timings:
+    ...     for step in range(3):
+    ...         res = eq.sweep(var=var, dt=1., solver=LinearLUSolver())
+
+Each record aggregates every call of one stage of one class of `Term`
+or `Solver`
+
+    >>> print(timings.record("LinearLUSolver", "solve")["calls"])
+    3
+    >>> print(timings.record("LinearLUSolver", "solve")["nnz"])
+    84
+    >>> print(timings.record("DiffusionTerm", "boundaryConditions")["calls"] > 0)
+    True
+    >>> print(sorted(set(stage for owner, stage in timings.records)))
+    ['assembly', 'boundaryConditions', 'geomCoeff', 'precondition', 'residual', 'solve']
+
+and can be exported for later analysis
+
+    >>> import json
+    >>> rows = json.loads(timings.toJSON())
+    >>> print(sorted(rows[0].keys()))
+    ['calls', 'owner', 'procID', 'stage', 'time']
+    >>> print(timings.toCSV().splitlines()[0])
+    owner,stage,calls,time,procID,iterations,nnz
+
+Nothing is recorded outside of the `with` block
+
+    >>> res = eq.sweep(var=var, dt=1., solver=LinearLUSolver())
+    >>> print(timings.record("LinearLUSolver", "solve")["calls"])
+    3
+
+"""
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+from collections import OrderedDict
+import csv
+import io
+import json
+import time
+
+__all__ = ["Instrumentation"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+# `Instrumentation` objects currently collecting
+_active = []
+
+# `_Timer` objects currently timing, innermost last
+_running = []
+
+class Instrumentation(object):
+    """Collects wall time and counters for `Term` and `Solver` stages
+
+    Stages of the `Term` classes are `"geomCoeff"` (construction of the
+    geometric coefficients), `"assembly"` (building the matrix and
+    right-hand side of each term) and `"boundaryConditions"` (applying
+    constraints and boundary conditions).  Stages of the `Solver` classes
+    are `"precondition"` (preconditioner setup, where the solver suite
+    exposes it), `"solve"` and `"residual"`.  Solvers add their
+    `"iterations"` and the `"nnz"` of the matrix to the `"solve"` stage.
+
+    Stages nest (`"assembly"` encloses `"geomCoeff"` and
+    `"boundaryConditions"`, and `"solve"` encloses `"precondition"` and
+    `"residual"`), but the `"time"` of each record is exclusive: a stage's
+    clock is paused while a stage nested inside it runs, so the times of
+    all records can be summed without counting anything twice.  The
+    `"time"` column of :meth:`toJSON` and :meth:`toCSV` has the same
+    meaning.
+
+    Instrumentation may be nested; each active `Instrumentation` receives
+    every record.
+    """
+
+    def __init__(self):
+        self.records = OrderedDict()
+
+    def __enter__(self):
+        _active.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active.remove(self)
+
+    def record(self, owner, stage):
+        """Aggregated counters of `stage` for the `owner` class name
+        """
+        return self.records[(owner, stage)]
+
+    def _record(self, owner, stage, elapsed=None, **counters):
+        record = self.records.setdefault((owner, stage),
+                                         OrderedDict((("calls", 0), ("time", 0.))))
+        if elapsed is not None:
+            record["calls"] += 1
+            record["time"] += elapsed
+        for key, value in counters.items():
+            record[key] = record.get(key, 0) + value
+
+    @property
+    def rows(self):
+        """Flat list of records, one `dict` per `owner` and `stage`
+        """
+        from fipy.tools import parallelComm
+
+        rows = []
+        for (owner, stage), record in self.records.items():
+            row = OrderedDict((("owner", owner), ("stage", stage)))
+            row.update(record)
+            row["procID"] = parallelComm.procID
+            rows.append(row)
+
+        return rows
+
+    def toJSON(self, filename=None):
+        """Export the records as a JSON list
+
+        Parameters
+        ----------
+        filename : str
+            Optional path to write to.
+
+        Returns
+        -------
+        str
+        """
+        text = json.dumps(self.rows, indent=1)
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(text)
+        return text
+
+    def toCSV(self, filename=None):
+        """Export the records as comma-separated values
+
+        Parameters
+        ----------
+        filename : str
+            Optional path to write to.
+
+        Returns
+        -------
+        str
+        """
+        rows = self.rows
+        fields = ["owner", "stage", "calls", "time", "procID"]
+        for row in rows:
+            fields += [key for key in row if key not in fields]
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields, restval=0, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        text = buffer.getvalue()
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(text)
+        return text
+
+    def __str__(self):
+        lines = ["%-40s %-20s %8s %12s" % ("owner", "stage", "calls", "time")]
+        for (owner, stage), record in self.records.items():
+            lines.append("%-40s %-20s %8d %12.6f" % (owner, stage, record["calls"], record["time"]))
+        return "\n".join(lines)
+
+class _Timer(object):
+    """Times its `with` block on behalf of `owner`, if anybody is listening
+
+    Time spent in a nested `_Timer` is not charged to the enclosing one
+
+        >>> class Owner(object):
+        ...     pass
+        >>> owner = Owner()
+        >>> with Instrumentation() as timings:
+        ...     with _Timer(owner, "outer"):
+        ...         time.sleep(0.01)
+        ...         with _Timer(owner, "inner"):
+        ...             time.sleep(0.1)
+        >>> print(timings.record("Owner", "inner")["time"] >= 0.1)
+        True
+        >>> print(timings.record("Owner", "outer")["time"] < 0.1)
+        True
+        >>> print(_running)
+        []
+    """
+    def __init__(self, owner, stage):
+        self.owner = owner
+        self.stage = stage
+        self.counters = {}
+
+    def __enter__(self):
+        if _active:
+            self.start = time.time()
+            self.elapsed = 0.
+            if _running:
+                _running[-1]._pause(self.start)
+            _running.append(self)
+        else:
+            self.start = None
+        return self
+
+    def _pause(self, now):
+        self.elapsed += now - self.start
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.start is not None:
+            now = time.time()
+            self._pause(now)
+            _running.remove(self)
+            if _running:
+                _running[-1].start = now
+            for instrumentation in _active:
+                instrumentation._record(self.owner.__class__.__name__,
+                                        self.stage, self.elapsed, **self.counters)
+
+def _count(owner, stage, **counters):
+    """Add `counters` to `stage` of `owner` without timing anything
+    """
+    for instrumentation in _active:
+        instrumentation._record(owner.__class__.__name__, stage, **counters)
+
+def _instrumenting():
+    return len(_active) > 0
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
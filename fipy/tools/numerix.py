@@ -62,6 +62,39 @@ elif arch == '64bit':
 else:
     raise Exception('Cannot set integer dtype because architecture is unknown.')
 
+import os
+
+def _indexDtype(count):
+    """Return the integer type used to index `count` mesh entities
+
+    Set :envvar:`FIPY_INDEX_DTYPE` to "``int32``" or "``int64``" to
+    choose the type for all meshes. Otherwise, indices are 32-bit unless
+    `count` is too large for them.
+
+        >>> saved = os.environ.pop("FIPY_INDEX_DTYPE", None)
+        >>> print(_indexDtype(10) is int32, _indexDtype(2**32) is INT_DTYPE)
+        True True
+        >>> os.environ["FIPY_INDEX_DTYPE"] = "int64"
+        >>> print(_indexDtype(10) is int64)
+        True
+        >>> if saved is None:
+        ...     del os.environ["FIPY_INDEX_DTYPE"]
+        ... else:
+        ...     os.environ["FIPY_INDEX_DTYPE"] = saved
+        >>> print(os.environ.get("FIPY_INDEX_DTYPE") == saved)
+        True
+    """
+    choice = os.environ.get("FIPY_INDEX_DTYPE", "auto").lower()
+    if choice == "auto":
+        if count < 2**31:
+            return NUMERIX.int32
+        else:
+            return INT_DTYPE
+    elif choice in ("int32", "int64"):
+        return NUMERIX.dtype(choice).type
+    else:
+        raise ValueError("FIPY_INDEX_DTYPE must be 'auto', 'int32', or 'int64', not %r" % choice)
+
 from numpy.core import umath
 from numpy import newaxis as NewAxis
 from numpy import *
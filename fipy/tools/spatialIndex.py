@@ -0,0 +1,230 @@
+"""Spatial indices for nearest-neighbor queries
+
+:func:`~fipy.tools.numerix.nearest` compares every point with every
+datum. A spatial index sorts the data once so that each subsequent
+query only examines the data near it.
+
+    >>> from fipy.tools import numerix
+    >>> data = numerix.array(((0., 1., 0., 1.),
+    ...                       (0., 0., 1., 1.)))
+    >>> points = numerix.array(((0.1, 0.9, 5., 0.5),
+    ...                         (0.2, 0.8, 0.4, 0.5)))
+    >>> print(_spatialIndex(data).nearest(points))
+    [0 3 1 0]
+    >>> print(_BucketIndex(data).nearest(points))
+    [0 3 1 0]
+
+Equidistant data are resolved in favor of the lowest index, just as
+:func:`~fipy.tools.numerix.nearest` does.
+
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import itertools
+
+from fipy.tools import numerix
+
+__all__ = []
+
+def _spatialIndex(data):
+    """Index the `(D, N)` array of `data`
+
+    Uses :class:`scipy.spatial.cKDTree`, if available, or a grid of
+    buckets, otherwise.
+    """
+    try:
+        return _KDTreeIndex(data)
+    except ImportError:
+        return _BucketIndex(data)
+
+class _SpatialIndex(object):
+    """Finds the indices of the data closest to sets of points
+    """
+    def __init__(self, data):
+        self.data = numerix.array(data, dtype=float)
+        self.dim, self.N = self.data.shape
+
+    def _nearest(self, points):
+        """Return the indices of the data that are closest to the `(D, M)` `points`
+        """
+        raise NotImplementedError
+
+    def nearest(self, points):
+        """Return the indices of the data that are closest to `points`
+
+        Parameters
+        ----------
+        points : array_like
+            `(D, M)` coordinates of the points, or `(D,)` coordinates of
+            a single point
+
+        Returns
+        -------
+        ndarray of int, or int
+        """
+        points = numerix.array(points, dtype=float)
+        single = (points.ndim == 1)
+        points = points.reshape((self.dim, -1))
+
+        if self.N == 0:
+            nearestIndices = numerix.zeros((0,), dtype=numerix.INT_DTYPE)
+        else:
+            nearestIndices = self._nearest(points)
+
+        if single:
+            return nearestIndices[0]
+        return nearestIndices
+
+    def _closest(self, points, candidates):
+        """Pick the closest of the `(M, K)` `candidates` for each of the points
+
+        Entries of `N` in `candidates` are placeholders.
+        """
+        # measure distances as `numerix.nearest` does, so that ties break
+        # the same way, in favor of the lowest index
+        valid = (candidates < self.N)
+        candidates = numerix.where(valid, candidates, 0)
+        delta = self.data[:, candidates] - points[..., numerix.newaxis]
+        distances = numerix.where(valid, (delta * delta).sum(axis=0), numerix.inf)
+        closest = (distances == distances.min(axis=-1)[..., numerix.newaxis])
+        return numerix.where(closest & valid, candidates, self.N).min(axis=-1).astype(numerix.INT_DTYPE)
+
+class _KDTreeIndex(_SpatialIndex):
+    """Nearest neighbors from a :class:`scipy.spatial.cKDTree`
+    """
+    def __init__(self, data):
+        from scipy.spatial import cKDTree
+
+        _SpatialIndex.__init__(self, data)
+        self.tree = cKDTree(self.data.swapaxes(0, 1))
+
+    def _nearest(self, points):
+        # enough neighbors to catch points equidistant from
+        # the cell centers at a vertex of a regular grid
+        k = min(2**self.dim, self.N)
+        _, candidates = self.tree.query(points.swapaxes(0, 1), k=k)
+        return self._closest(points, candidates.reshape((points.shape[-1], k)))
+
+class _BucketIndex(_SpatialIndex):
+    """Nearest neighbors from a uniform grid of buckets, each holding
+    about one datum
+
+    Each point searches successive shells of buckets around it until no
+    unsearched datum can be closer than the best found so far.
+
+        >>> from fipy.tools import numerix
+        >>> data = numerix.random.random((3, 1000))
+        >>> points = numerix.random.random((3, 100)) * 1.2 - 0.1
+        >>> print((_BucketIndex(data).nearest(points)
+        ...        == numerix.nearest(data, points)).all())
+        True
+    """
+    def __init__(self, data):
+        _SpatialIndex.__init__(self, data)
+
+        if self.N == 0:
+            return
+
+        self.lower = self.data.min(axis=-1)
+        self.upper = self.data.max(axis=-1)
+        extent = self.upper - self.lower
+        spanned = extent > 0
+        if spanned.any():
+            self.spacing = (extent[spanned].prod() / self.N)**(1. / spanned.sum())
+        else:
+            self.spacing = 1.
+        self.shape = (extent // self.spacing).astype(numerix.INT_DTYPE) + 1
+        while self.shape.prod() > 4 * self.N:
+            # very flat data
+            self.spacing *= 2
+            self.shape = (extent // self.spacing).astype(numerix.INT_DTYPE) + 1
+
+        keys = self._keys(self._buckets(self.data))
+        self.order = numerix.argsort(keys, kind='stable')
+        self.starts = numerix.searchsorted(keys[self.order],
+                                           numerix.arange(self.shape.prod() + 1))
+
+    def _buckets(self, coords):
+        buckets = ((coords - self.lower[..., numerix.newaxis]) // self.spacing).astype(numerix.INT_DTYPE)
+        return numerix.clip(buckets, 0, (self.shape - 1)[..., numerix.newaxis])
+
+    def _keys(self, buckets):
+        return numerix.ravel_multi_index(tuple(buckets), tuple(self.shape))
+
+    def _shell(self, radius):
+        """Offsets of the buckets `radius` buckets away, in the max norm
+        """
+        ranges = [range(-radius, radius + 1)] * self.dim
+        offsets = numerix.array(list(itertools.product(*ranges)), dtype=numerix.INT_DTYPE)
+        offsets = offsets[abs(offsets).max(axis=-1) == radius]
+        return offsets.swapaxes(0, 1).reshape((self.dim, -1))
+
+    def _nearest(self, points):
+        M = points.shape[-1]
+
+        # data lie in the bounding box, so no datum can be closer to a
+        # point than the box is
+        clamped = numerix.clip(points, self.lower[..., numerix.newaxis], self.upper[..., numerix.newaxis])
+        outside = ((points - clamped)**2).sum(axis=0)
+        buckets = self._buckets(clamped)
+
+        nearestIndices = numerix.empty((M,), dtype=numerix.INT_DTYPE)
+        best = numerix.empty((M,), dtype=float)
+        best[:] = numerix.inf
+        active = numerix.arange(M)
+
+        for radius in range(self.shape.max() + 1):
+            offsets = self._shell(radius)
+            K = offsets.shape[-1]
+
+            # (D, A, K) buckets surrounding each active point
+            shell = buckets[:, active, numerix.newaxis] + offsets[:, numerix.newaxis, :]
+            inside = ((shell >= 0) & (shell < self.shape[:, numerix.newaxis, numerix.newaxis])).all(axis=0)
+            keys = numerix.where(inside,
+                                 self._keys(numerix.where(inside, shell, 0)), 0)
+            counts = numerix.where(inside, self.starts[keys + 1] - self.starts[keys], 0).ravel()
+            starts = self.starts[keys].ravel()
+
+            # every datum in those buckets, paired with its point
+            total = counts.sum()
+            if total > 0:
+                owners = numerix.repeat(numerix.arange(len(active) * K) // K, counts)
+                within = numerix.arange(total) - numerix.repeat(numerix.cumsum(counts) - counts, counts)
+                found = self.order[numerix.repeat(starts, counts) + within]
+
+                delta = self.data[:, found] - points[:, active[owners]]
+                distances = (delta * delta).sum(axis=0)
+
+                # closest, then lowest, datum for each point, including
+                # the best of the previous shells
+                candidates = numerix.concatenate((numerix.arange(len(active)), owners))
+                found = numerix.concatenate((numerix.where(numerix.isfinite(best[active]),
+                                                           nearestIndices[active], self.N),
+                                             found))
+                distances = numerix.concatenate((best[active], distances))
+                order = numerix.lexsort((found, distances, candidates))
+                first = numerix.ones(len(order), dtype=bool)
+                first[1:] = candidates[order][1:] != candidates[order][:-1]
+                order = order[first]
+                nearestIndices[active[candidates[order]]] = found[order]
+                best[active[candidates[order]]] = distances[order]
+
+            # anything unsearched is at least `radius` buckets
+            # beyond the clamped point
+            reach = outside[active] + (radius * self.spacing)**2
+            active = active[best[active] >= reach]
+            if len(active) == 0:
+                break
+
+        return nearestIndices
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -10,7 +10,10 @@ def _suite():
             'numerix',
             'dump',
             'vector',
-            'sharedtempfile'
+            'sharedtempfile',
+            'instrumentation',
+            'spatialIndex',
+            'inline'
         ), base = __name__)
 
     return theSuite
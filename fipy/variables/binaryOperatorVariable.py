@@ -4,7 +4,9 @@ __docformat__ = 'restructuredtext'
 __all__ = []
 
 from fipy.tools import numerix
+from fipy.variables.operatorVariable import _declaredOnce
 
+@_declaredOnce
 def _BinaryOperatorVariable(operatorClass=None):
     """
     Test `binOp` pickling
@@ -1,7 +1,9 @@
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
+from fipy.variables.variable import Variable
 from fipy.variables.meshVariable import _MeshVariable
+from fipy.variables.operatorVariable import _declaredOnce
 from fipy.tools import numerix
 from fipy.tools.decorators import deprecate
 
@@ -81,25 +83,7 @@ class CellVariable(_MeshVariable):
         """
         baseClass = _MeshVariable._OperatorVariableClass(self,
                                                          baseClass=baseClass)
-
-        class _CellOperatorVariable(baseClass):
-            @property
-            def old(self):
-                if self._old is None:
-                    oldVar = []
-                    for v in self.var:
-                        if hasattr(v, "old"):
-                            oldVar.append(v.old)
-                        else:
-                            oldVar.append(v)
-
-                    self._old = self.__class__(op=self.op, var=oldVar,
-                                               opShape=self.opShape,
-                                               canInline=self.canInline)
-
-                return self._old
-
-        return _CellOperatorVariable
+        return _CellOperatorVariableClass(baseClass)
 
     def copy(self):
 
@@ -135,10 +119,13 @@ class CellVariable(_MeshVariable):
 
     def __call__(self, points=None, order=0, nearestCellIDs=None):
         r"""
-        Interpolates the `CellVariable` to a set of points using a
-        method that has a memory requirement on the order of `Ncells` by
-        `Npoints` in general, but uses only `Ncells` when the
-        `CellVariable`'s mesh is a `UniformGrid` object.
+        Interpolates the `CellVariable` to a set of points, locating them
+        with a spatial index of the cell centers that is built on first
+        use, or directly when the `CellVariable`'s mesh is a
+        `UniformGrid` object. First-order interpolation extrapolates from
+        the cell that contains each point. To interpolate repeatedly to
+        the same points, use a
+        :class:`~fipy.meshes.pointInterpolator.PointInterpolator`.
 
         Tests
 
@@ -168,12 +155,17 @@ class CellVariable(_MeshVariable):
             The order of interpolation, default is 0
         nearestCellIDs : array_like
             Optional argument if user can calculate own
-            nearest cell IDs array, shape should be same as points
+            nearest (or, for `order=1`, containing) cell IDs array,
+            shape should be same as points
         """
         if points is not None:
 
             if nearestCellIDs is None:
-                nearestCellIDs = self.mesh._getNearestCellID(points)
+                if order == 1:
+                    # the gradient only applies within the containing cell
+                    nearestCellIDs = self.mesh._locateCells(points)
+                else:
+                    nearestCellIDs = self.mesh._getNearestCellID(points)
 
             if order == 0:
                 return self.globalValue[..., nearestCellIDs]
@@ -583,7 +575,10 @@ class CellVariable(_MeshVariable):
                 self.faceConstraints = []
             self.faceConstraints.append(value)
             self._requires(value.value)
-            # self._requires(value.where) ???
+            if isinstance(value.where, Variable):
+                # the face value depends on where it is constrained
+                self._requires(value.where)
+            self._faceConstraintsChanged()
             self._markStale()
         else:
 ##            _MeshVariable.constrain(value, where)
@@ -607,6 +602,34 @@ class CellVariable(_MeshVariable):
             _MeshVariable.release(self, constraint=constraint)
         except ValueError:
             self.faceConstraints.remove(constraint)
+            self._faceConstraintsChanged()
+
+    def _faceConstraintsChanged(self):
+        """Update the constraint masks of the face values of `self`
+
+        A face value only looks for new face constraints when its
+        `constraintMask` is requested, but terms keep the mask itself.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m)
+        >>> v.constrain(1., where=m.facesLeft)
+        >>> mask = v.faceValue.constraintMask
+        >>> print(mask)
+        [ True False False False]
+        >>> c = Constraint(2., where=m.facesRight)
+        >>> v.constrain(c)
+        >>> print(mask)
+        [ True False False  True]
+        >>> v.release(constraint=c)
+        >>> print(mask)
+        [ True False False False]
+        """
+        for name in ('_arithmeticFaceValue', '_minmodFaceValue', '_harmonicFaceValue'):
+            faceValue = self.__dict__.get(name)
+            if faceValue is not None and hasattr(faceValue, '_constraintMask'):
+                # requesting the mask requires any new face constraints
+                faceValue.constraintMask._markStale()
 
     def _test(self):
         """
@@ -649,10 +672,41 @@ class CellVariable(_MeshVariable):
         """
 
 class _ReMeshedCellVariable(CellVariable):
-    def __init__(self, oldVar, newMesh):
-        newValues = oldVar.getValue(points = newMesh.cellCenters)
+    """
+    >>> from fipy import *
+    >>> oldMesh = Grid1D(nx=2)
+    >>> oldVar = CellVariable(mesh=oldMesh, value=oldMesh.x)
+    >>> print(_ReMeshedCellVariable(oldVar, Grid1D(nx=4, dx=.5)))
+    [ 0.375  0.625  1.375  1.625]
+    """
+    def __init__(self, oldVar, newMesh, interpolator=None):
+        if interpolator is None:
+            from fipy.meshes.meshInterpolator import MeshInterpolator
+            interpolator = MeshInterpolator(sourceMesh=oldVar.mesh, targetMesh=newMesh)
+        newValues = interpolator(oldVar).value
         CellVariable.__init__(self, newMesh, name = oldVar.name, value = newValues, unit = oldVar.unit)
 
+@_declaredOnce
+def _CellOperatorVariableClass(baseClass):
+    class _CellOperatorVariable(baseClass):
+        @property
+        def old(self):
+            if self._old is None:
+                oldVar = []
+                for v in self.var:
+                    if hasattr(v, "old"):
+                        oldVar.append(v.old)
+                    else:
+                        oldVar.append(v)
+
+                self._old = self.__class__(op=self.op, var=oldVar,
+                                           opShape=self.opShape,
+                                           canInline=self.canInline)
+
+            return self._old
+
+    return _CellOperatorVariable
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
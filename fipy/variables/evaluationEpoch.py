@@ -0,0 +1,199 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import os
+import weakref
+
+from fipy.tools import parser
+from fipy.tools.dimensions.physicalField import PhysicalField
+
+__all__ = ["cacheByEpoch", "newEpoch"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class _EvaluationEpoch(object):
+    """Book-keeping for operator variables cached during an evaluation epoch
+
+    Operator variables are normally not cached, so that every access to
+    the value of an expression recalculates every node of it. When
+    evaluation epochs are enabled, the outermost node of an expression
+    and any node shared by several expressions keep their value until one
+    of their inputs changes or until the next epoch begins. Nodes with a
+    single subscriber are only evaluated when that subscriber is, so they
+    still need not be cached, and `--inline` can still fuse them.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether operator variables are cached by epoch
+    maxBytes : int, optional
+        Cap on the memory held by cached operator variables. When it is
+        exceeded, the largest values are discarded first.
+    """
+    def __init__(self, enabled=False, maxBytes=None):
+        self.enabled = enabled
+        self.maxBytes = maxBytes
+        self.epoch = 0
+        # `id(var)` -> (weak reference to `var`, bytes held by its value)
+        #
+        # `Variable` overloads `==`, so cannot be a key of a `WeakKeyDictionary`.
+        # Entries of dead variables are purged lazily, as a callback could
+        # change the dictionary while it is being iterated over.
+        self._cache = {}
+        self._purgeAt = 64
+
+    @staticmethod
+    def _sizeof(value):
+        if isinstance(value, PhysicalField):
+            value = value.value
+        return getattr(value, "nbytes", 0)
+
+    @property
+    def nbytes(self):
+        """Memory held by the cached operator variables"""
+        return sum(size for ref, size in list(self._cache.values())
+                   if ref() is not None)
+
+    def _cached(self, var):
+        """Account for the value just stored (or cleared) by `var`
+        """
+        key = id(var)
+        if var._value is None:
+            self._cache.pop(key, None)
+        elif self.enabled:
+            self._cache[key] = (weakref.ref(var), self._sizeof(var._value))
+            if self.maxBytes is not None:
+                self._evict()
+            elif len(self._cache) > self._purgeAt:
+                self._purge()
+
+    def _purge(self):
+        for key, (ref, size) in list(self._cache.items()):
+            if ref() is None:
+                del self._cache[key]
+        self._purgeAt = max(64, 2 * len(self._cache))
+
+    def _discard(self, key):
+        ref, size = self._cache.pop(key)
+        var = ref()
+        if var is not None:
+            # the value will be recalculated the next time it is needed
+            var._value = None
+
+    def _evict(self):
+        self._purge()
+
+        nbytes = self.nbytes
+        for key, (ref, size) in sorted(list(self._cache.items()),
+                                       key=lambda item: item[1][1],
+                                       reverse=True):
+            if nbytes <= self.maxBytes:
+                break
+            self._discard(key)
+            nbytes -= size
+
+    def bump(self):
+        """Begin a new epoch, discarding every cached operator variable
+        """
+        self.epoch += 1
+        for key in list(self._cache.keys()):
+            self._discard(key)
+
+_enabled = (os.getenv("FIPY_CACHE_EPOCH") is not None) or False
+if parser.parse("--cache-epoch", action="store_true"):
+    _enabled = True
+_maxBytes = os.getenv("FIPY_CACHE_EPOCH_LIMIT")
+if _maxBytes is not None:
+    _maxBytes = int(float(_maxBytes))
+
+_evaluationEpoch = _EvaluationEpoch(enabled=_enabled, maxBytes=_maxBytes)
+
+def cacheByEpoch(enabled=True, maxBytes=None):
+    """Cache operator variables until their inputs change or a new epoch begins
+
+    Each solution of a :class:`~fipy.terms.term.Term` begins a new
+    epoch.  Evaluation epochs can also be enabled with the `--cache-epoch`
+    flag or the `FIPY_CACHE_EPOCH` environment variable, and their memory
+    capped with the `FIPY_CACHE_EPOCH_LIMIT` environment variable.
+
+        >>> from fipy import *
+        >>> mesh = Grid1D(nx=3)
+        >>> phi = CellVariable(mesh=mesh, value=(1., 2., 3.))
+        >>> mobility = phi**2 * (1 - phi)
+
+    Normally, every access recalculates the expression
+
+        >>> cacheByEpoch(enabled=False)
+        >>> mobility.value is mobility.value
+        False
+
+    but within an epoch, it is only evaluated once
+
+        >>> cacheByEpoch()
+        >>> mobility.value is mobility.value
+        True
+        >>> print(mobility)
+        [  0.  -4. -18.]
+
+    until one of its inputs changes
+
+        >>> phi.setValue((0., 0.5, 1.))
+        >>> print(mobility)
+        [ 0.     0.125  0.   ]
+
+    or a new epoch begins.
+
+        >>> value = mobility.value
+        >>> newEpoch()
+        >>> mobility.value is value
+        False
+
+    Only the outermost operation of the expression holds a value.
+
+        >>> print(_evaluationEpoch.nbytes)
+        24
+
+    A cap on memory evicts the largest values first
+
+        >>> total = (phi + 1).sum()
+        >>> print(total)
+        4.5
+        >>> print(mobility)
+        [ 0.     0.125  0.   ]
+        >>> cacheByEpoch(maxBytes=16)
+        >>> print(mobility)
+        [ 0.     0.125  0.   ]
+        >>> print(total)
+        4.5
+        >>> print(mobility._value is None, total._value is None)
+        True False
+
+        >>> cacheByEpoch(enabled=False)
+        >>> print(_evaluationEpoch.nbytes)
+        0
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to cache operator variables by epoch
+    maxBytes : int, optional
+        Cap on the memory, in bytes, held by cached operator variables.
+        When it is exceeded, the largest values are discarded first.
+    """
+    _evaluationEpoch.bump()
+    _evaluationEpoch.enabled = enabled
+    _evaluationEpoch.maxBytes = maxBytes
+
+def newEpoch():
+    """Discard the values cached by operator variables during this epoch
+    """
+    _evaluationEpoch.bump()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
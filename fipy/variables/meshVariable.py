@@ -9,6 +9,7 @@ __all__ = []
 
 from fipy.variables.variable import Variable
 from fipy.variables.constant import _Constant
+from fipy.variables.operatorVariable import _declaredOnce
 from fipy.tools import numerix
 from functools import reduce
 
@@ -195,6 +196,25 @@ class _MeshVariable(Variable):
         if hasattr(self, '_constraintMask'):
             self._constraintMask._requires(self._constraints[-1].where)
 
+    def release(self, constraint):
+        """Remove `constraint` from `self`
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m)
+        >>> c = Constraint(1., where=m.x < 1)
+        >>> v.constrain(c)
+        >>> mask = v.constraintMask
+        >>> print(mask)
+        [ True False False]
+        >>> v.release(constraint=c)
+        >>> print(mask)
+        [False False False]
+        """
+        super(_MeshVariable, self).release(constraint=constraint)
+        if hasattr(self, '_constraintMask'):
+            self._constraintMask._markStale()
+
     def _getShapeFromMesh(mesh):
         """
         Return the shape of this `MeshVariable` type, given a particular mesh.
@@ -539,34 +559,7 @@ class _MeshVariable(Variable):
 
     def _OperatorVariableClass(self, baseClass=None):
         baseClass = Variable._OperatorVariableClass(self, baseClass=baseClass)
-
-        class _MeshOperatorVariable(baseClass):
-            def __init__(self, op, var, opShape=None, canInline=True,
-                         *args, **kwargs):
-                mesh = reduce(lambda a, b: a or b,
-                              [getattr(v, "mesh", None) for v in var])
-                for shape in [opShape] + [getattr(v, "opShape", None) for v in var]:
-                    if shape is not None:
-                        opShape = shape
-                        break
-##                 opShape = reduce(lambda a, b: a or b,
-##                                  [opShape] + [getattr(v, "opShape", None) for v in var])
-                if opShape is not None:
-                    elementshape = opShape[:-1]
-                else:
-                    elementshape = reduce(lambda a, b: a or b,
-                                          [getattr(v, "elementshape", None) for v in var])
-
-                baseClass.__init__(self, mesh=mesh, op=op, var=var,
-                                   opShape=opShape, canInline=canInline,
-                                   elementshape=elementshape,
-                                   *args, **kwargs)
-
-            @property
-            def rank(self):
-                return len(self.opShape) - 1
-
-        return _MeshOperatorVariable
+        return _MeshOperatorVariableClass(baseClass)
 
     @property
     def rank(self):
@@ -701,6 +694,36 @@ def _testDot(self):
     """
     pass
 
+@_declaredOnce
+def _MeshOperatorVariableClass(baseClass):
+    class _MeshOperatorVariable(baseClass):
+        def __init__(self, op, var, opShape=None, canInline=True,
+                     *args, **kwargs):
+            mesh = reduce(lambda a, b: a or b,
+                          [getattr(v, "mesh", None) for v in var])
+            for shape in [opShape] + [getattr(v, "opShape", None) for v in var]:
+                if shape is not None:
+                    opShape = shape
+                    break
+##                 opShape = reduce(lambda a, b: a or b,
+##                                  [opShape] + [getattr(v, "opShape", None) for v in var])
+            if opShape is not None:
+                elementshape = opShape[:-1]
+            else:
+                elementshape = reduce(lambda a, b: a or b,
+                                      [getattr(v, "elementshape", None) for v in var])
+
+            baseClass.__init__(self, mesh=mesh, op=op, var=var,
+                               opShape=opShape, canInline=canInline,
+                               elementshape=elementshape,
+                               *args, **kwargs)
+
+        @property
+        def rank(self):
+            return len(self.opShape) - 1
+
+    return _MeshOperatorVariable
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
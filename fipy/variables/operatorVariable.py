@@ -7,11 +7,40 @@ __docformat__ = 'restructuredtext'
 __all__ = []
 
 import dis
+import functools
 import sys
 
 from fipy.variables.variable import Variable
+from fipy.variables.evaluationEpoch import _evaluationEpoch
 from fipy.tools import numerix
 
+def _declaredOnce(factory):
+    """Return a version of class `factory` that declares each class only once
+
+    Classes made by the same `factory` from the same arguments are
+    interchangeable, so there is no need for each operator variable to
+    have a class of its own. Attribute lookups are much slower on
+    thousands of distinct classes than on a few shared ones.
+
+        >>> from fipy import CellVariable, Grid1D
+        >>> a = CellVariable(mesh=Grid1D(nx=3))
+        >>> print(type(a + 1) is type(a + 2))
+        True
+        >>> print(type(a + 1) is type(-a))
+        False
+    """
+    classes = {}
+
+    @functools.wraps(factory)
+    def declare(*args, **kwargs):
+        key = args + tuple(sorted(kwargs.items()))
+        if key not in classes:
+            classes[key] = factory(*args, **kwargs)
+        return classes[key]
+
+    return declare
+
+@_declaredOnce
 def _OperatorVariableClass(baseClass=object):
     class _OperatorVariable(baseClass):
         def __init__(self, op, var, opShape=(), canInline=True, unit=None, inlineComment=None, valueMattersForUnit=None, *args, **kwargs):
@@ -44,8 +73,55 @@ def _OperatorVariableClass(baseClass=object):
         def setValue(self, value, unit=None, where=None):
             raise TypeError("The value of an `_OperatorVariable` cannot be assigned")
 
+        @property
+        def _sharedOperand(self):
+            if self._expression is None or len(self.constraints) > 0:
+                return self
+            else:
+                return self._expression
+
+        def _sharedVariable(self):
+            """The private operator variable of the expression of `self`
+
+            Made on demand, along with those of any operands that are
+            themselves shared expressions.
+            """
+            stack = [self]
+            while stack:
+                var = stack[-1]
+                expression = var._expression
+                if expression.shared is not None:
+                    stack.pop()
+                    continue
+                operands = [v._sharedOperand for v in var.var]
+                unmade = [v for v, operand in zip(var.var, operands)
+                          if operand is not v and operand.shared is None]
+                if unmade:
+                    stack.extend(unmade)
+                    continue
+                stack.pop()
+                expression.shared = var.__class__(op=var.op,
+                                                  var=[v if operand is v else operand.shared
+                                                       for v, operand in zip(var.var, operands)],
+                                                  opShape=var.opShape,
+                                                  canInline=var.canInline,
+                                                  unit=var._unit,
+                                                  inlineComment=var.comment,
+                                                  valueMattersForUnit=var.valueMattersForUnit)
+
+            return self._expression.shared
+
         def _calcValue(self):
-            if not self.canInline:
+            expression = self._expression
+            if expression is not None and expression.written > 1:
+                shared = self._sharedVariable()
+                if not any(v is shared for v in self.requiredVariables):
+                    # only count the expressions that are evaluated, so
+                    # the shared value is cached only if it is reused
+                    self.requiredVariables.append(shared)
+                    shared._requiredBy(self)
+                return shared.value
+            elif not self.canInline:
                 return self._calcValue_()
             else:
                 from fipy.tools import inline
@@ -58,8 +134,19 @@ def _OperatorVariableClass(baseClass=object):
             pass
 
         def _isCached(self):
-            return (Variable._isCached(self)
-                    or (len(self.subscribedVariables) > 1 and not self._cacheNever))
+            if Variable._isCached(self):
+                return True
+            elif self._cacheNever:
+                return False
+            subscribers = self._numberOfSubscriptions
+            # within an evaluation epoch, an expression with no subscribers
+            # is only evaluated once, which in turn evaluates each of its
+            # unshared operands once
+            return subscribers > 1 or (_evaluationEpoch.enabled and subscribers == 0)
+
+        def _setValueInternal(self, value, unit=None, array=None):
+            baseClass._setValueInternal(self, value=value, unit=unit, array=array)
+            _evaluationEpoch._cached(self)
 
         def _getCstring(self, argDict={}, id="", freshen=False):
             if self.canInline: # and not self._isCached():
@@ -195,9 +282,14 @@ def _OperatorVariableClass(baseClass=object):
 
         def _py3kInstructions(self, instructions, style, argDict, id, freshen):
             stack = []
-            
+            kwnames = ()
+
             for ins in instructions:
-                if ins.opname == 'UNARY_CONVERT':
+                if ins.opname in ('RESUME', 'NOP', 'CACHE', 'PUSH_NULL', 'PRECALL',
+                                  'COPY_FREE_VARS', 'MAKE_CELL'):
+                    # interpreter bookkeeping of Python 3.11 and later
+                    continue
+                elif ins.opname == 'UNARY_CONVERT':
                     stack.append("`" + stack.pop() + "`")
                 elif ins.opname == 'BINARY_SUBSCR':
                     stack.append(stack.pop(-2) + "[" + stack.pop() + "]")
@@ -209,10 +301,10 @@ def _OperatorVariableClass(baseClass=object):
                         return s
                 elif ins.opname == 'LOAD_CONST':
                     stack.append(ins.argval)
-                elif ins.opname == 'LOAD_ATTR':
+                elif ins.opname in ('LOAD_ATTR', 'LOAD_METHOD'):
                     stack.append(stack.pop() + "." + ins.argval)
                 elif ins.opname == 'COMPARE_OP':
-                    stack.append(stack.pop(-2) + " " + dis.cmp_op[ins.arg] + " " + stack.pop())
+                    stack.append(stack.pop(-2) + " " + ins.argrepr + " " + stack.pop())
                 elif ins.opname == 'LOAD_GLOBAL':
                     stack.append(ins.argval)
                 elif ins.opname == 'LOAD_FAST':
@@ -229,8 +321,23 @@ def _OperatorVariableClass(baseClass=object):
                     while kws:
                         kwargs.append(kws.pop() + "=" + args.pop())
                     stack.append(stack.pop() + "(" + ", ".join(args + kwargs) + ")")
+                elif ins.opname == 'KW_NAMES':
+                    kwnames = self.op.__code__.co_consts[ins.arg]
+                elif ins.opname == 'CALL':
+                    # args, the last of them named by `KW_NAMES`,
+                    # are last ins.arg items on stack
+                    split = len(stack) - ins.arg
+                    args, stack = stack[split:], stack[:split]
+                    kwargs = []
+                    for kw in reversed(kwnames):
+                        kwargs.insert(0, kw + "=" + str(args.pop()))
+                    kwnames = ()
+                    stack.append(stack.pop() + "(" + ", ".join(args + kwargs) + ")")
                 elif ins.opname == 'LOAD_DEREF':
                     stack.append(ins.argval)
+                elif ins.opname == 'BINARY_OP':
+                    # Python 3.11 and later
+                    stack.append(stack.pop(-2) + " " + ins.argrepr.rstrip("=") + " " + stack.pop())
                 elif ins.opcode in self._unop:
                     stack.append(self._unop[ins.opcode] + '(' + stack.pop() + ')')
                 elif ins.opcode in self._binop:
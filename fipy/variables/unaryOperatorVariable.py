@@ -3,6 +3,9 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+from fipy.variables.operatorVariable import _declaredOnce
+
+@_declaredOnce
 def _UnaryOperatorVariable(operatorClass=None):
     """
     Test `binOp` pickling
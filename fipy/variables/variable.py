@@ -5,7 +5,9 @@ from builtins import str
 from future.utils import string_types
 __docformat__ = 'restructuredtext'
 
+import numbers
 import os
+import weakref
 
 from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
@@ -78,7 +80,7 @@ class Variable(object):
         """
 
         self.requiredVariables = []
-        self.subscribedVariables = []
+        self._subscribers = {}
 
         if isinstance(value, Variable):
             value = value.value
@@ -489,6 +491,18 @@ class Variable(object):
 
         """
 
+        constraints = self.constraints
+        if len(constraints) > 0:
+            if self._isCached() and self._constraintsCanBeCached(constraints):
+                return self._getConstrainedValue(constraints)
+            else:
+                constraints = self._evaluateConstraints(constraints)
+                return self._applyConstraints(self._getUnconstrainedValue().copy(),
+                                              constraints)
+        else:
+            return self._getUnconstrainedValue()
+
+    def _getUnconstrainedValue(self):
         if self.stale or not self._isCached() or self._value is None:
             value = self._calcValue()
             if self._isCached():
@@ -499,21 +513,108 @@ class Variable(object):
         else:
             value = self._value
 
-        if len(self.constraints) > 0:
-            value = value.copy()
-            for constraint in self.constraints:
-                if constraint.where is None:
-                    value[:] = constraint.value
-                else:
-                    mask = constraint.where
-                    if not hasattr(mask, 'dtype') or mask.dtype != bool:
-                        mask = numerix.array(mask, dtype=numerix.NUMERIX.bool)
+        return value
+
+    def _getConstrainedValue(self, constraints):
+        """Return the cached copy of `value` with `constraints` applied
+
+        The copy is only made, and the constraints only applied to it in
+        place, when the value has been set or recalculated, or when the
+        constraints have changed since the last time.
 
-                    if 0 not in value.shape:
-                        try:
-                            value[..., mask] = constraint.value
-                        except:
-                            value[..., mask] = numerix.array(constraint.value)[..., mask]
+            >>> v = Variable((0., 1., 2., 3.))
+            >>> v.constrain(5., where=(True, False, False, False))
+            >>> v.value is v.value
+            True
+            >>> print(v)
+            [ 5.  1.  2.  3.]
+            >>> v[1] = 10.
+            >>> print(v)
+            [  5.  10.   2.   3.]
+            >>> c = Variable(7.)
+            >>> v.constrain(c, where=(False, False, False, True))
+            >>> print(v)
+            [  5.  10.   2.   7.]
+            >>> c.value = 8.
+            >>> print(v)
+            [  5.  10.   2.   8.]
+            >>> del v.constraints[0]
+            >>> print(v)
+            [  0.  10.   2.   8.]
+            >>> v.constraints[0].where = (True, False, False, False)
+            >>> print(v)
+            [  8.  10.   2.   3.]
+
+        Arrays can be changed without anyone knowing, so a constrained
+        value is not cached if a constraint holds one
+
+            >>> values = numerix.array((1., 2., 3., 4.))
+            >>> mask = numerix.array((False, True, False, False))
+            >>> v.constrain(values, where=mask)
+            >>> print(v)
+            [ 8.  2.  2.  3.]
+            >>> values[:] = 7.
+            >>> mask[-1] = True
+            >>> print(v)
+            [ 8.  7.  2.  7.]
+        """
+        key = [(constraint, constraint.value, constraint.where) for constraint in constraints]
+        cached = getattr(self, "_constrainedValue", None)
+        if (self.stale or self._value is None
+            or not (cached is not None
+                    and len(cached[0]) == len(key)
+                    and all(a is b
+                            for old, new in zip(cached[0], key)
+                            for a, b in zip(old, new)))):
+            # Evaluating an uncached constraint marks us stale, so it
+            # must happen before our own value is freshened
+            evaluated = self._evaluateConstraints(constraints)
+            value = self._getUnconstrainedValue().copy()
+            cached = (key, self._applyConstraints(value, evaluated))
+            self._constrainedValue = cached
+
+        return cached[1]
+
+    @staticmethod
+    def _constraintsCanBeCached(constraints):
+        """Whether any change to `constraints` would make us stale
+
+        Only a `Variable` knows when it changes. Anything else must never
+        change.
+        """
+        return all(isinstance(x, (Variable, numbers.Number, tuple) + string_types) or x is None
+                   for constraint in constraints
+                   for x in (constraint.value, constraint.where))
+
+    @staticmethod
+    def _evaluateConstraints(constraints):
+        """Return the `(value, where)` of each of `constraints`"""
+        evaluated = []
+        for constraint in constraints:
+            value, where = constraint.value, constraint.where
+            if isinstance(value, Variable):
+                value = value.value
+            if isinstance(where, Variable):
+                where = where.value
+            evaluated.append((value, where))
+        return evaluated
+
+    @staticmethod
+    def _applyConstraints(value, constraints):
+        """Apply the evaluated `constraints` to `value` in place"""
+        for constraintValue, where in constraints:
+            if where is None:
+                value[:] = constraintValue
+            else:
+                mask = where
+                if not hasattr(mask, 'dtype') or mask.dtype != bool:
+                    mask = numerix.array(mask, dtype=numerix.NUMERIX.bool)
+
+                if 0 not in value.shape:
+                    try:
+                        value[..., mask] = constraintValue
+                    except:
+                        value[..., mask] = numerix.array(constraintValue)[..., mask]
 
         return value
 
@@ -584,6 +685,9 @@ class Variable(object):
             self._constraints = []
         self._constraints.append(value)
         self._requires(value.value)
+        if isinstance(value.where, Variable):
+            self._requires(value.where)
+        self._diverge()
         self._markStale()
 
     def release(self, constraint):
@@ -799,30 +903,84 @@ class Variable(object):
     def _calcValueInline(self):
         raise NotImplementedError
 
-    def _getSubscribedVariables(self):
-        self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
+    def _liveSubscribers(self):
+        """Return the `(subscriber, count)` of each `Variable` that requires this one
 
-        return self._subscribedVariables
+        Subscribers are held by weak reference, keyed by `id()`, as
+        `Variable` overloads `==`. Entries of subscribers that have been
+        garbage collected are purged as they are encountered.
 
-    def _setSubscribedVariables(self, sVars):
-        self._subscribedVariables = sVars
+            >>> a = Variable(value=3)
+            >>> b = a * a
+            >>> c = a + 1
+            >>> print(sorted(count for sub, count in a._liveSubscribers()))
+            [1, 2]
+            >>> del c
+            >>> print([count for sub, count in a._liveSubscribers()])
+            [2]
+        """
+        live = []
+        for key, (ref, count) in list(self._subscribers.items()):
+            subscriber = ref()
+            if subscriber is None:
+                del self._subscribers[key]
+            else:
+                live.append((subscriber, count))
+        return live
 
-    subscribedVariables = property(_getSubscribedVariables,
-                                   _setSubscribedVariables)
+    @property
+    def subscribedVariables(self):
+        """Weak references to each `Variable` that requires this one
+        """
+        return [weakref.ref(subscriber)
+                for subscriber, count in self._liveSubscribers()
+                for i in range(count)]
+
+    @property
+    def _numberOfSubscriptions(self):
+        return sum(count for subscriber, count in self._liveSubscribers())
 
     def __markStale(self):
-        for subscriber in self.subscribedVariables:
-            if subscriber() is not None:
-                ## Even though getSubscribedVariables() strips out dead
-                ## references, subscriber() might still be dead due to the
-                ## vagaries of garbage collection and the possibility that
-                ## later subscribedVariables were removed, changing the
-                ## dependencies of this subscriber.
-                ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
-                subscriber()._markStale()
+        """Mark everything that depends on this `Variable` as stale
+
+        The graph is walked iteratively, rather than recursively, so that
+        arbitrarily deep expressions can be invalidated. A `Variable` that
+        is already stale has already invalidated its own subscribers, so
+        each `Variable` is visited at most once and the order of the walk
+        doesn't matter.
+
+            >>> a = Variable(value=1.)
+            >>> chain = [a]
+            >>> for i in range(100):
+            ...     chain.append(chain[-1] + 1)
+            >>> print(chain[-1])
+            101.0
+            >>> print(sum(var.stale for var in chain))
+            0
+            >>> a.value = 2.
+            >>> print(sum(var.stale for var in chain))
+            100
+            >>> print(chain[-1])
+            102.0
+        """
+        stack = [self]
+        while stack:
+            subscribers = stack.pop()._subscribers
+            dead = []
+            for key, (ref, count) in subscribers.items():
+                subscriber = ref()
+                if subscriber is None:
+                    dead.append(key)
+                elif not subscriber.stale:
+                    subscriber.stale = 1
+                    stack.append(subscriber)
+            for key in dead:
+                del subscribers[key]
 
     def _markFresh(self):
         self.stale = 0
+        # the value has been set or recalculated
+        self._constrainedValue = None
         self.__markStale()
 
     def _markStale(self):
@@ -846,8 +1004,11 @@ class Variable(object):
         # we retain a weak reference to avoid a memory leak
         # due to circular references between the subscriber
         # and the subscribee
-        import weakref
-        self.subscribedVariables.append(weakref.ref(var))
+        ref, count = self._subscribers.get(id(var), (None, 0))
+        if ref is None or ref() is not var:
+            # `id()` of a dead subscriber may have been reused
+            ref, count = weakref.ref(var), 0
+        self._subscribers[id(var)] = (ref, count + 1)
 
     @property
     def _variableClass(self):
@@ -1030,9 +1191,14 @@ class Variable(object):
         if not self.unit.isDimensionless():
             canInline = False
 
-        return unOp(op=op, var=[self], opShape=opShape, canInline=canInline, unit=unit,
-                    inlineComment=inline._operatorVariableComment(canInline=canInline),
-                    valueMattersForUnit=[valueMattersForUnit])
+        comment = inline._operatorVariableComment(canInline=canInline)
+        key = _operatorKey(op, [self._sharedOperand],
+                           type(self), _classKey(operatorClass), opShape, canInline, unit,
+                           valueMattersForUnit)
+        return self._internOperatorVariable(key,
+                                            lambda: unOp(op=op, var=[self], opShape=opShape, canInline=canInline, unit=unit,
+                                                         inlineComment=comment,
+                                                         valueMattersForUnit=[valueMattersForUnit]))
 
     def _shapeClassAndOther(self, opShape, operatorClass, other):
         """
@@ -1073,9 +1239,11 @@ class Variable(object):
             Whether value of `self` should be used when determining unit,
             e.g., `__pow__`
         """
+        scalar = other
         if not isinstance(other, Variable):
             from fipy.variables.constant import _Constant
             other = _Constant(value=other)
+        constant = other
 
         opShape, baseClass, other = self._shapeClassAndOther(opShape, operatorClass, other)
 
@@ -1091,9 +1259,119 @@ class Variable(object):
         from fipy.variables import binaryOperatorVariable
         binOp = binaryOperatorVariable._BinaryOperatorVariable(operatorClass)
 
-        return binOp(op=op, var=[self, other], opShape=opShape, canInline=canInline, unit=unit,
-                     inlineComment=inline._operatorVariableComment(canInline=canInline),
-                     valueMattersForUnit=[value0mattersForUnit, value1mattersForUnit])
+        comment = inline._operatorVariableComment(canInline=canInline)
+        if other is constant and not isinstance(scalar, Variable):
+            operand = scalar
+        else:
+            operand = other._sharedOperand
+        key = _operatorKey(op, [self._sharedOperand, operand],
+                           type(self), _classKey(operatorClass), _classKey(baseClass),
+                           opShape, canInline, unit,
+                           value0mattersForUnit, value1mattersForUnit)
+        return self._internOperatorVariable(key,
+                                            lambda: binOp(op=op, var=[self, other], opShape=opShape, canInline=canInline, unit=unit,
+                                                          inlineComment=comment,
+                                                          valueMattersForUnit=[value0mattersForUnit, value1mattersForUnit]))
+
+    # expressions that are still in use, by the structure of their
+    # calculation, so that identical expressions share one value
+    _operatorVariables = weakref.WeakValueDictionary()
+
+    def _internOperatorVariable(self, key, create):
+        """Return a new operator variable that shares the value of any identical expression
+
+        Operator variables are created afresh every time an expression
+        is written, but an expression written in several places need
+        only be calculated once. Each expression written gets an operator
+        variable of its own, so that changing one never changes another,
+        but once the expression identified by `key` has been written more
+        than once, they all take their value from a private operator
+        variable of the expression. Once several of them have been
+        evaluated, it caches its value.
+
+            >>> a = Variable(value=(1., 2.))
+            >>> mobility = a**2 * (1 - a)
+            >>> again = a**2 * (1 - a)
+            >>> print(mobility is again, mobility._expression is again._expression)
+            False True
+            >>> print(mobility._expression is (a**2 * (1. - a))._expression)
+            False
+            >>> print(a[0]._expression is a[0]._expression,
+            ...       a[0]._expression is a[1]._expression)
+            True False
+            >>> print(mobility, again)
+            [ 0. -4.] [ 0. -4.]
+            >>> print(mobility._expression.shared._isCached())
+            True
+            >>> a.value = (0.5, 0.25)
+            >>> print(mobility, again)
+            [ 0.125     0.046875] [ 0.125     0.046875]
+
+        An expression written once calculates its own value
+
+            >>> once = a / 3
+            >>> print(once, once._expression.shared)
+            [ 0.16666667  0.08333333] None
+
+        Changing the operator variable of one expression does not change
+        any other
+
+            >>> x = a * 2
+            >>> y = a * 2
+            >>> x.name = "x"
+            >>> x.constrain(0., where=numerix.array((True, False)))
+            >>> print(y.name == "x", x, y)
+            False [ 0.   0.5] [ 1.   0.5]
+            >>> print(x + 1, y + 1, a * 2 + 1)
+            [ 1.   1.5] [ 2.   1.5] [ 2.   1.5]
+
+        Parameters
+        ----------
+        key : tuple
+            Identifies the calculation, or `None` if it cannot be shared
+        create : func
+            Makes the operator variable
+        """
+        var = create()
+        if key is not None:
+            expression = self._operatorVariables.get(key)
+            if expression is None:
+                expression = _SharedExpression()
+                self._operatorVariables[key] = expression
+            expression.written += 1
+            var._expression = expression
+
+        return var
+
+    # the expression that an operator variable was written as, if its
+    # value may be shared (see `_internOperatorVariable`)
+    _expression = None
+
+    @property
+    def _sharedOperand(self):
+        """What identifies `self` as an operand of a shared expression
+        """
+        return self
+
+    def _diverge(self):
+        """Stop sharing the value of expressions that took `self` for its expression
+
+        Called when the value of `self` no longer matches the value of
+        its expression.
+        """
+        if self._expression is None:
+            return
+
+        diverged = [self]
+        while diverged:
+            var = diverged.pop()
+            for ref in var.subscribedVariables:
+                subscriber = ref()
+                if (subscriber._expression is not None
+                    and any(v is var for v in subscriber.var)):
+                    subscriber._expression = None
+                    subscriber._markStale()
+                    diverged.append(subscriber)
 
     def __add__(self, other):
         from fipy.terms.term import Term
@@ -1687,6 +1965,116 @@ class Variable(object):
         pass
 
 
+def _classKey(cls):
+    """Return a key shared by classes that are made alike
+
+    Operator variable classes are declared by factories, but those
+    declared by the same code, from the same base classes, behave the
+    same, even if a factory is called anew.
+
+        >>> from fipy.variables import operatorVariable
+        >>> declare = operatorVariable._OperatorVariableClass.__wrapped__
+        >>> print(declare(Variable) is declare(Variable))
+        False
+        >>> print(_classKey(declare(Variable)) == _classKey(declare(Variable)))
+        True
+    """
+    name = getattr(cls, "__qualname__", "")
+    if "<locals>" in name:
+        return (name,) + tuple(_classKey(base) for base in cls.__bases__)
+    else:
+        return cls
+
+class _SharedExpression(object):
+    """An expression that may have been written more than once
+
+    Identifies the operator variables of the expression in the keys of
+    other expressions, and holds the private operator variable that they
+    take their value from, once there is more than one of them.
+    """
+    def __init__(self):
+        self.written = 0
+        self.shared = None
+
+def _closureKey(value):
+    """Return a key for a value held by the closure of an operator
+
+    Raises `TypeError` if `value` may change.
+    """
+    if isinstance(value, Variable):
+        return id(value)
+    elif isinstance(value, tuple):
+        return (tuple, tuple(_closureKey(item) for item in value))
+    elif isinstance(value, slice):
+        return (slice, _closureKey(value.start), _closureKey(value.stop), _closureKey(value.step))
+    else:
+        # `1`, `1.`, and `True` are equal, but do not index alike
+        hash(value)
+        return (type(value), value)
+
+def _operatorKey(op, operands, *options):
+    """Return a key shared by operations that must have the same value
+
+    Operands are identified by identity, except for numbers. Returns
+    `None` if an operation cannot be identified, e.g., if its operands are
+    arrays that may change, or its closure holds unhashable indices.
+
+        >>> a = Variable(value=(1., 2.))
+        >>> def add():
+        ...     return lambda x, y: x + y
+        >>> print(_operatorKey(add(), [a, 1]) == _operatorKey(add(), [a, 1]))
+        True
+        >>> print(_operatorKey(add(), [a, 1]) == _operatorKey(add(), [a, 1.]))
+        False
+        >>> print(_operatorKey(add(), [a, numerix.array((1., 2.))]))
+        None
+
+    Values held by the closure of the operator are identified by type,
+    as well, so that `a[True]` is not taken for `a[1]`
+
+        >>> def index(i):
+        ...     return lambda x: x[i]
+        >>> print(_operatorKey(index(1), [a]) == _operatorKey(index(1), [a]))
+        True
+        >>> print(_operatorKey(index(1), [a]) == _operatorKey(index(True), [a]))
+        False
+        >>> print(_operatorKey(index((0, 1)), [a]) == _operatorKey(index((0, 1.)), [a]))
+        False
+        >>> print(_operatorKey(index([0, 1]), [a]))
+        None
+    """
+    if isinstance(op, numerix.ufunc):
+        opKey = op
+    else:
+        try:
+            opKey = (op.__code__, op.__defaults__,
+                     tuple(_closureKey(cell.cell_contents) for cell in (op.__closure__ or ())))
+        except (AttributeError, ValueError, TypeError):
+            return None
+
+    operandKeys = []
+    for operand in operands:
+        if isinstance(operand, (Variable, _SharedExpression)):
+            operandKeys.append(id(operand))
+        elif isinstance(operand, (int, float, complex, numerix.number)):
+            # `1` and `1.` must give different results
+            operandKeys.append((type(operand), operand))
+        else:
+            return None
+
+    # units are equal, but not hashable
+    options = tuple((option.factor, option.offset, tuple(option.powers))
+                    if isinstance(option, physicalField.PhysicalUnit) else option
+                    for option in options)
+
+    key = (opKey, tuple(operandKeys)) + options
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()